@@ -0,0 +1,208 @@
+"""Benchmark batch page fetching: the default requests path vs the shared HTTP/2 client.
+
+Usage: python benchmarks/bench_http2.py [--pages 500] [--workers 8] [--delay-ms 20] [--page-kb 40]
+
+Starts a local TLS server that speaks HTTP/2 (via ALPN, using the h2 package)
+and HTTP/1.1, serving gzip-compressed pages after a fixed server-side delay.
+Both paths fetch the same same-host URL list with the same number of worker
+threads; the report shows pages per second and how many connections each path
+opened. Needs httpx[http2] and the openssl command line tool for a throwaway
+certificate.
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import random
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import h2.config
+import h2.connection
+import h2.events
+
+from src.core.fetcher import download_page
+from src.core.http2_fetcher import Http2Fetcher
+
+
+def make_certificate(directory):
+    cert, key = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run([
+        'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+        '-keyout', key, '-out', cert, '-subj', '/CN=localhost',
+        '-addext', 'subjectAltName=DNS:localhost,IP:127.0.0.1'
+    ], check=True, capture_output=True)
+    return cert, key
+
+
+def make_page(kb):
+    # Random word order keeps the gzip ratio near that of real prose rather than a repeated string
+    rng = random.Random(0)
+    words = ('python seo guide optimize title meta description internal link search ranking content page '
+             'keyword crawl index speed image heading structure schema mobile').split()
+    paragraphs, size = [], 0
+    while size < kb * 1024:
+        paragraph = '<p>' + ' '.join(rng.choice(words) + rng.choice(('', 's', 'ing', 'ed')) for _ in range(40)) + '</p>'
+        paragraphs.append(paragraph)
+        size += len(paragraph)
+    body = '\n'.join(paragraphs)
+    return f'<html><head><title>Benchmark page</title></head><body><h1>Benchmark</h1>{body}</body></html>'.encode()
+
+
+class PageServer:
+    def __init__(self, cert, key, page, delay):
+        self.page = page
+        self.gzipped = gzip.compress(page)
+        self.delay = delay
+        self.connections = Counter()
+        self.context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self.context.load_cert_chain(cert, key)
+        self.context.set_alpn_protocols(['h2', 'http/1.1'])
+        self.loop = asyncio.new_event_loop()
+        self.port = None
+
+    def start(self):
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            server = self.loop.run_until_complete(
+                asyncio.start_server(self.handle, '127.0.0.1', 0, ssl=self.context, backlog=1024)
+            )
+            self.port = server.sockets[0].getsockname()[1]
+            ready.set()
+            self.loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        ready.wait()
+
+    def body_for(self, accept_encoding):
+        if 'gzip' in accept_encoding:
+            return self.gzipped, [('content-encoding', 'gzip')]
+        return self.page, []
+
+    async def handle(self, reader, writer):
+        protocol = writer.get_extra_info('ssl_object').selected_alpn_protocol() or 'http/1.1'
+        self.connections[protocol] += 1
+        try:
+            if protocol == 'h2':
+                await self.serve_h2(reader, writer)
+            else:
+                await self.serve_http11(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, ssl.SSLError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_http11(self, reader, writer):
+        while True:
+            head = await reader.readuntil(b'\r\n\r\n')
+            headers = dict(
+                line.split(': ', 1) for line in head.decode('latin-1').lower().split('\r\n')[1:] if ': ' in line
+            )
+            await asyncio.sleep(self.delay)
+            body, extra = self.body_for(headers.get('accept-encoding', ''))
+            lines = ['HTTP/1.1 200 OK', 'Content-Type: text/html; charset=utf-8', f'Content-Length: {len(body)}']
+            lines += [f'{name.title()}: {value}' for name, value in extra]
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+            await writer.drain()
+            if headers.get('connection') == 'close':
+                return
+
+    async def serve_h2(self, reader, writer):
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding='utf-8'))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+        window_opened = asyncio.Event()
+
+        async def respond(stream_id, headers):
+            await asyncio.sleep(self.delay)
+            body, extra = self.body_for(headers.get('accept-encoding', ''))
+            conn.send_headers(stream_id, [
+                (':status', '200'), ('content-type', 'text/html; charset=utf-8'),
+                ('content-length', str(len(body)))
+            ] + extra)
+            # Concurrent streams share the connection's flow-control window, so wait for WINDOW_UPDATEs
+            while body:
+                size = min(conn.local_flow_control_window(stream_id), conn.max_outbound_frame_size, len(body))
+                if size <= 0:
+                    window_opened.clear()
+                    await window_opened.wait()
+                    continue
+                conn.send_data(stream_id, body[:size], end_stream=size == len(body))
+                body = body[size:]
+                writer.write(conn.data_to_send())
+            await writer.drain()
+
+        tasks = set()
+        while True:
+            data = await reader.read(65535)
+            if not data:
+                break
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    task = asyncio.ensure_future(respond(event.stream_id, dict(event.headers)))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                elif isinstance(event, h2.events.WindowUpdated):
+                    window_opened.set()
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(conn.data_to_send())
+            await writer.drain()
+
+
+def run(label, fetch, urls, workers):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pages = list(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - started
+    versions = Counter(page.timing.http_version for page in pages)
+    transferred = sum(page.timing.transfer_bytes for page in pages)
+    print(f'{label:<24} {len(urls) / elapsed:8.1f} pages/s  {elapsed:6.2f}s  '
+          f'{transferred / len(urls) / 1024:6.1f} KB/page on the wire  {dict(versions)}')
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--delay-ms', type=float, default=20, help='Server-side delay per request')
+    parser.add_argument('--page-kb', type=int, default=40, help='Decoded page size')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = make_certificate(directory)
+        # Both clients trust the throwaway certificate through the standard environment variables
+        os.environ['REQUESTS_CA_BUNDLE'] = os.environ['SSL_CERT_FILE'] = cert
+
+        server = PageServer(cert, key, make_page(args.page_kb), args.delay_ms / 1000)
+        server.start()
+        urls = [f'https://localhost:{server.port}/page/{i}' for i in range(args.pages)]
+        print(f'{args.pages} pages of {args.page_kb} KB, {args.workers} workers, {args.delay_ms:g} ms server delay')
+
+        baseline = run('requests (HTTP/1.1)', download_page, urls, args.workers)
+        baseline_connections = sum(server.connections.values())
+
+        fetcher = Http2Fetcher()
+        try:
+            multiplexed = run('httpx shared (HTTP/2)', fetcher.download, urls, args.workers)
+        finally:
+            fetcher.close()
+
+        print(f'connections opened: requests {baseline_connections}, '
+              f'HTTP/2 {sum(server.connections.values()) - baseline_connections}')
+        assert [page.content for page in baseline] == [page.content for page in multiplexed]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+"""Benchmark every pipeline stage on a seeded synthetic corpus, and compare runs.
+
+Usage: python benchmarks/bench_pipeline.py [--pages 200] [--seed 0] [--repeat 3] [--json FILE]
+       python benchmarks/bench_pipeline.py --compare BASE.json HEAD.json [--threshold 0.10] [--min-delta-ms 0.05]
+
+Generates a reproducible corpus of pages that vary in size, link density,
+heading depth, image count and number of target keywords, and serves it from a
+local HTTP server. Each stage is timed on its own over the whole corpus: fetch,
+parse, extract, keyword processing, every analyzer, scoring, JSON export and
+report encoding. An end-to-end pass (analyze_page plus export) follows. Each
+stage is run --repeat times and the fastest pass is kept. --json writes the
+results with the commit they were measured on.
+
+Compare mode reads two such files. It flags every stage whose median per-page
+time grew by more than --threshold and by more than --min-delta-ms. The second
+floor keeps microsecond stages from tripping on timer noise. It exits with
+status 1 if any stage regressed, so it can gate a CI job.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from src.analyzers.content_analyzer import ContentAnalyzer
+from src.analyzers.link_analyzer import LinkAnalyzer
+from src.analyzers.performance_analyzer import PerformanceAnalyzer
+from src.analyzers.structure_analyzer import StructureAnalyzer
+from src.analyzers.technical_seo import TechnicalSEOAnalyzer
+from src.core.fetcher import WebContent, download_page
+from src.core.keyword_processor import process_keywords
+from src.core.orchestrator import analyze_page
+from src.core.scoring import calculate_overall_score
+from src.output.json_exporter import report_to_dict
+from src.output.report_codec import dumps_report
+from src.utils.text_utils import ensure_nltk_data
+
+RESULTS_VERSION = 1
+
+WORDS = ('guide optimize title meta description internal link search ranking content page crawl index speed '
+         'image heading structure schema mobile audit traffic backlink snippet canonical redirect sitemap '
+         'performance render query intent volume competitor authority anchor outbound domain').split()
+KEYWORD_POOL = ['python seo', 'meta description', 'internal links', 'page speed', 'image alt text',
+                'title tag', 'search ranking', 'crawl budget', 'canonical url', 'structured data',
+                'mobile first indexing', 'core web vitals', 'keyword research', 'anchor text', 'xml sitemap']
+# Paragraph counts (about 60 words each) for small, typical, long and very long pages
+PAGE_SIZES = (4, 15, 40, 120)
+PAGE_SIZE_WEIGHTS = (2, 5, 2, 1)
+# Links per 100 words of body text
+LINK_DENSITIES = (0.5, 2, 5, 12)
+
+ANALYZERS = {
+    'analyze.technical_seo': lambda content, keywords, timing: TechnicalSEOAnalyzer(content, keywords).analyze(),
+    'analyze.content': lambda content, keywords, timing: ContentAnalyzer(content, keywords).analyze(),
+    'analyze.structure': lambda content, keywords, timing: StructureAnalyzer(content, keywords).analyze(),
+    'analyze.links': lambda content, keywords, timing: LinkAnalyzer(content, keywords).analyze(),
+    'analyze.performance': lambda content, keywords, timing: PerformanceAnalyzer(content, keywords, timing).analyze()
+}
+
+
+def make_page(rng, index, pages):
+    # One page's HTML and target keywords; every choice comes from rng, so a seed fixes the corpus
+    keywords = rng.sample(KEYWORD_POOL, rng.randint(1, 8))
+    paragraphs = rng.choices(PAGE_SIZES, PAGE_SIZE_WEIGHTS)[0]
+    link_density = rng.choice(LINK_DENSITIES)
+    heading_depth = rng.randint(2, 6)
+
+    def sentence(words):
+        text = [rng.choice(WORDS) for _ in range(words)]
+        if rng.random() < 0.5:
+            text.insert(rng.randrange(len(text)), rng.choice(keywords))
+        return ' '.join(text)
+
+    def link():
+        if rng.random() < 0.75:
+            return f'<a href="/page/{rng.randrange(pages)}">{sentence(3)}</a>'
+        rel = ' rel="nofollow"' if rng.random() < 0.3 else ''
+        return f'<a href="https://example.org/{rng.choice(WORDS)}/{rng.randrange(1000)}"{rel}>{sentence(2)}</a>'
+
+    body = [f'<h1>{sentence(6)}</h1>']
+    for i in range(paragraphs):
+        if i % 3 == 0:
+            level = rng.randint(2, heading_depth)
+            body.append(f'<h{level}>{sentence(5)}</h{level}>')
+        words = sentence(60).split(' ')
+        for _ in range(round(len(words) * link_density / 100)):
+            words.insert(rng.randrange(len(words)), link())
+        body.append(f'<p>{" ".join(words)}</p>')
+        if rng.random() < 0.15:
+            alt = f' alt="{sentence(4)}"' if rng.random() < 0.7 else ''
+            body.append(f'<img src="/img/{index}-{i}.{rng.choice(("png", "jpg", "webp"))}"{alt}>')
+
+    meta = f'<meta name="description" content="{sentence(22)}">' if rng.random() < 0.8 else ''
+    head = (f'<title>{sentence(7)}</title>{meta}<meta name="viewport" content="width=device-width">'
+            f'<link rel="canonical" href="/page/{index}"><style>body {{ margin: 0 }}</style>')
+    nav = ''.join(link() for _ in range(8))
+    html = (f'<!DOCTYPE html><html lang="en"><head>{head}</head><body><nav>{nav}</nav><main>{"".join(body)}</main>'
+            f'<footer>{sentence(12)}</footer><script>window.analytics = {{}};</script></body></html>')
+    return html, keywords
+
+
+def make_corpus(pages, seed=0):
+    rng = random.Random(seed)
+    return {f'/page/{index}': make_page(rng, index, pages) for index in range(pages)}
+
+
+class CorpusServer:
+    # Serves the corpus over plain HTTP on a free local port
+    def __init__(self, corpus):
+        pages = {path: html.encode('utf-8') for path, (html, _) in corpus.items()}
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                body = pages.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f'http://127.0.0.1:{self.httpd.server_port}'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def time_stage(items, run, prepare=None, repeat=3):
+    # Times run() once per item, outside any prepare() step, and keeps the fastest of `repeat` passes
+    best = None
+    for _ in range(repeat):
+        times = []
+        for item in items:
+            argument = prepare(item) if prepare else item
+            started = time.perf_counter()
+            run(argument)
+            times.append((time.perf_counter() - started) * 1000)
+        if best is None or sum(times) < sum(best):
+            best = times
+    ordered = sorted(best)
+    return {
+        'pages': len(best),
+        'total_ms': round(sum(best), 3),
+        'mean_ms': round(statistics.fmean(best), 4),
+        'median_ms': round(statistics.median(best), 4),
+        'p90_ms': round(ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))], 4)
+    }
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def run_benchmarks(pages, seed, repeat):
+    corpus = make_corpus(pages, seed)
+    server = CorpusServer(corpus)
+    urls = [server.base_url + path for path in corpus]
+    try:
+        stages = {}
+        # Fetch once up front so later stages work on the same downloaded pages
+        raw = [download_page(url) for url in urls]
+        stages['fetch'] = time_stage(urls, download_page, repeat=repeat)
+        stages['parse'] = time_stage(raw, lambda page: BeautifulSoup(page.content, 'lxml'), repeat=repeat)
+        # WebContent strips script/nav/footer tags from the soup, so every pass needs a fresh parse
+        stages['extract'] = time_stage(raw, lambda args: WebContent(*args),
+                                       prepare=lambda page: (page.url, page.html, BeautifulSoup(page.content, 'lxml')),
+                                       repeat=repeat)
+        keyword_lists = [keywords for _, keywords in corpus.values()]
+        stages['keywords'] = time_stage(keyword_lists, process_keywords, repeat=repeat)
+
+        contents = [WebContent(page.url, page.html, BeautifulSoup(page.content, 'lxml')) for page in raw]
+        inputs = [(content, process_keywords(keywords), page.timing)
+                  for content, keywords, page in zip(contents, keyword_lists, raw)]
+        for name, analyzer in ANALYZERS.items():
+            stages[name] = time_stage(inputs, lambda args, analyzer=analyzer: analyzer(*args), repeat=repeat)
+
+        results = [{name: analyzer(*args) for name, analyzer in ANALYZERS.items()} for args in inputs]
+        stages['scoring'] = time_stage(results, lambda modules: calculate_overall_score(
+            keyword_score=modules['analyze.content'].details['keyword_cluster'].cluster_score,
+            technical_score=modules['analyze.technical_seo'].score,
+            content_score=modules['analyze.content'].score,
+            structure_score=modules['analyze.structure'].score,
+            link_score=modules['analyze.links'].score,
+            performance_score=modules['analyze.performance'].score
+        ), repeat=repeat)
+
+        variations = {url: process_keywords(keywords) for url, (_, keywords) in zip(urls, corpus.values())}
+        reports = [analyze_page(url, variations[url]).report for url in urls]
+        stages['export.json'] = time_stage(reports, lambda report: json.dumps(report_to_dict(report)), repeat=repeat)
+        stages['export.codec'] = time_stage(reports, dumps_report, repeat=repeat)
+
+        breakdown = {}
+
+        def end_to_end(url):
+            report = analyze_page(url, variations[url]).report
+            json.dumps(report_to_dict(report))
+            for name, ms in report.timings.items():
+                breakdown[name] = breakdown.get(name, 0.0) + ms
+
+        stages['end_to_end'] = time_stage(urls, end_to_end, repeat=repeat)
+        # Mean per page over all passes, from the timing spans analyze_page records
+        stages['end_to_end']['spans_mean_ms'] = {
+            name: round(ms / (pages * repeat), 4) for name, ms in sorted(breakdown.items(), key=lambda e: -e[1])
+        }
+    finally:
+        server.close()
+
+    sizes = sorted(len(html) for html, _ in corpus.values())
+    commit, dirty = git_commit()
+    return {
+        'version': RESULTS_VERSION,
+        'commit': commit,
+        'dirty': dirty,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {'pages': pages, 'seed': seed, 'repeat': repeat},
+        'corpus': {
+            'bytes': sum(sizes),
+            'min_kb': round(sizes[0] / 1024, 1),
+            'median_kb': round(statistics.median(sizes) / 1024, 1),
+            'max_kb': round(sizes[-1] / 1024, 1)
+        },
+        'stages': stages
+    }
+
+
+def print_results(results):
+    corpus = results['corpus']
+    params = results['params']
+    print(f'{params["pages"]} pages (seed {params["seed"]}), {corpus["bytes"] / 2 ** 20:.1f} MB: '
+          f'{corpus["min_kb"]}-{corpus["max_kb"]} KB, median {corpus["median_kb"]} KB; best of {params["repeat"]}')
+    print(f'{"stage":<24} {"median ms":>10} {"p90 ms":>10} {"total ms":>11}')
+    for name, stage in results['stages'].items():
+        print(f'{name:<24} {stage["median_ms"]:>10.3f} {stage["p90_ms"]:>10.3f} {stage["total_ms"]:>11.1f}')
+
+
+def compare(base, head, threshold, min_delta_ms):
+    # Returns the names of stages whose median per-page time grew by more than `threshold` and `min_delta_ms`
+    if base['params'] != head['params']:
+        print(f'warning: runs used different parameters ({base["params"]} vs {head["params"]})')
+    print(f'base {(base["commit"] or "unknown")[:10]}  head {(head["commit"] or "unknown")[:10]}  '
+          f'threshold +{threshold:.0%}')
+    print(f'{"stage":<24} {"base ms":>10} {"head ms":>10} {"change":>8}')
+    regressions = []
+    for name, stage in head['stages'].items():
+        if name not in base['stages']:
+            print(f'{name:<24} {"-":>10} {stage["median_ms"]:>10.3f} {"new":>8}')
+            continue
+        before, after = base['stages'][name]['median_ms'], stage['median_ms']
+        change = after / before - 1 if before > 0 else 0.0
+        flag = ''
+        if change > threshold and after - before > min_delta_ms:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f'{name:<24} {before:>10.3f} {after:>10.3f} {change:>+8.1%}{flag}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', metavar='FILE', help='write the results to FILE')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'), help='compare two result files')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative slowdown of a stage median that counts as a regression (default: 0.10)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.05,
+                        help='ignore slowdowns smaller than this many milliseconds per page (default: 0.05)')
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], encoding='utf-8') as f:
+            base = json.load(f)
+        with open(args.compare[1], encoding='utf-8') as f:
+            head = json.load(f)
+        regressions = compare(base, head, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f'{len(regressions)} stage(s) regressed: {", ".join(regressions)}')
+            sys.exit(1)
+        return
+
+    ensure_nltk_data()
+    results = run_benchmarks(args.pages, args.seed, args.repeat)
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f'Results saved to {args.json}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark memory per report: AnalysisReport dataclasses vs CompactReport.
+
+Usage: python benchmarks/bench_report_memory.py [--reports 20000] [--keywords 5]
+
+Analyzes one synthetic page, then loads it back N times through the report
+codec so every copy has its own objects, as reports from separate analyses
+would. Retained memory is measured with tracemalloc, once for N full reports
+and once for N compact reports sharing one string table.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from src.core.compact_report import StringTable, compact_report, expand_report
+from src.core.fetcher import WebContent
+from src.core.keyword_processor import process_keywords
+from src.core.orchestrator import build_report
+from src.output.report_codec import decode_report, encode_report
+
+KEYWORDS = ['python seo', 'meta description', 'internal links', 'page speed', 'image alt text',
+            'title tag', 'search ranking', 'crawl budget']
+
+
+def make_page(seed=0):
+    rng = random.Random(seed)
+    words = ('python seo guide optimize title meta description internal link search ranking content page '
+             'keyword crawl index speed image heading structure schema mobile').split()
+    paragraphs = ['<p>' + ' '.join(rng.choice(words) for _ in range(60)) + '</p>' for _ in range(20)]
+    links = ''.join(f'<a href="/page/{i}">Page {i}</a>' for i in range(15))
+    images = ''.join(f'<img src="/img/{i}.png" alt="Image {i}">' if i % 2 else f'<img src="/img/{i}.png">'
+                     for i in range(6))
+    return (f'<html><head><title>Python SEO guide</title><meta name="description" content="How to optimize pages">'
+            f'</head><body><h1>Python SEO</h1><h2>Meta description tips</h2>{"".join(paragraphs)}{links}{images}'
+            f'</body></html>')
+
+
+def retained(build, count):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    held = build(count)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reports', type=int, default=20000)
+    parser.add_argument('--keywords', type=int, default=5)
+    args = parser.parse_args()
+
+    html = make_page()
+    content = WebContent('https://example.com/', html, BeautifulSoup(html, 'lxml'))
+    report = build_report(content, process_keywords(KEYWORDS[:args.keywords]))
+    encoded = json.dumps(encode_report(report))
+
+    def load(i):
+        data = json.loads(encoded)
+        data['url'] = f'https://example.com/page/{i}'
+        return decode_report(data)
+
+    def full_reports(count):
+        return [load(i) for i in range(count)]
+
+    def compact_reports(count):
+        strings = StringTable()
+        return strings, [compact_report(load(i), strings) for i in range(count)]
+
+    full, full_bytes, full_time = retained(full_reports, args.reports)
+    del full
+    (strings, compact), compact_bytes, compact_time = retained(compact_reports, args.reports)
+
+    assert expand_report(compact[0], strings).keyword_cluster == report.keyword_cluster
+    print(f'{args.reports} reports, {args.keywords} keyword(s) each')
+    print(f'{"AnalysisReport":<16} {full_bytes / args.reports:10,.0f} bytes/report  '
+          f'{full_bytes / 2 ** 20:8.1f} MB  {full_time:6.2f}s')
+    print(f'{"CompactReport":<16} {compact_bytes / args.reports:10,.0f} bytes/report  '
+          f'{compact_bytes / 2 ** 20:8.1f} MB  {compact_time:6.2f}s  ({len(strings)} interned strings)')
+    print(f'{full_bytes / compact_bytes:.1f}x smaller; 1M reports: '
+          f'{full_bytes / args.reports * 1e6 / 2 ** 30:.1f} GB vs {compact_bytes / args.reports * 1e6 / 2 ** 30:.2f} GB')
+
+
+if __name__ == '__main__':
+    main()
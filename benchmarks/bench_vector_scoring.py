@@ -0,0 +1,88 @@
+"""Benchmark scalar vs vectorized keyword/overall scoring.
+
+Usage: python benchmarks/bench_vector_scoring.py [--pairs 10000000] [--scalar-sample 200000]
+
+The scalar path is timed on a sample and extrapolated, since running it over
+10M pairs takes minutes. The sample is also checked for identical results.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.core import vector_scoring
+from src.core.scoring import calculate_density_score, calculate_keyword_score, calculate_overall_score
+
+
+def make_features(pairs, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'in_title': rng.integers(0, 2, pairs, dtype=np.uint8),
+        'in_meta': rng.integers(0, 2, pairs, dtype=np.uint8),
+        'in_h1': rng.integers(0, 2, pairs, dtype=np.uint8),
+        'in_headings': rng.integers(0, 7, pairs, dtype=np.uint8),
+        'in_first_100_words': rng.integers(0, 2, pairs, dtype=np.uint8),
+        'density': rng.uniform(0, 8, pairs),
+        'distribution_score': np.full(pairs, 70, dtype=np.uint8),
+        'module_scores': [rng.integers(0, 101, pairs, dtype=np.uint8) for _ in range(4)],
+    }
+
+
+def score_vectorized(f):
+    keyword = vector_scoring.calculate_keyword_scores(
+        f['in_title'], f['in_meta'], f['in_h1'], f['in_headings'], f['in_first_100_words'],
+        vector_scoring.calculate_density_scores(f['density']), f['distribution_score']
+    )
+    overall = vector_scoring.calculate_overall_scores(keyword, *f['module_scores'])
+    return keyword, overall, vector_scoring.get_statuses(overall)
+
+
+def score_scalar(f, count):
+    columns = {name: f[name][:count].tolist() for name in
+               ('in_title', 'in_meta', 'in_h1', 'in_headings', 'in_first_100_words', 'density', 'distribution_score')}
+    modules = [m[:count].tolist() for m in f['module_scores']]
+    keyword, overall = [], []
+    for i in range(count):
+        score = calculate_keyword_score(
+            columns['in_title'][i], columns['in_meta'][i], columns['in_h1'][i], columns['in_headings'][i],
+            columns['in_first_100_words'][i], calculate_density_score(columns['density'][i]),
+            columns['distribution_score'][i]
+        )
+        keyword.append(score)
+        overall.append(calculate_overall_score(score, modules[0][i], modules[1][i], modules[2][i], modules[3][i]))
+    return keyword, overall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pairs', type=int, default=10_000_000)
+    parser.add_argument('--scalar-sample', type=int, default=200_000)
+    args = parser.parse_args()
+
+    features = make_features(args.pairs)
+    sample = min(args.scalar_sample, args.pairs)
+
+    started = time.perf_counter()
+    keyword, overall, _ = score_vectorized(features)
+    vector_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scalar_keyword, scalar_overall = score_scalar(features, sample)
+    scalar_seconds = (time.perf_counter() - started) * args.pairs / sample
+
+    identical = keyword[:sample].tolist() == scalar_keyword and overall[:sample].tolist() == scalar_overall
+
+    print(f'pairs:            {args.pairs:,}')
+    print(f'vectorized:       {vector_seconds:.2f}s ({args.pairs / vector_seconds / 1e6:.1f}M pairs/s)')
+    print(f'scalar (extrap.): {scalar_seconds:.2f}s ({args.pairs / scalar_seconds / 1e6:.2f}M pairs/s)')
+    print(f'speedup:          {scalar_seconds / vector_seconds:.0f}x')
+    print(f'identical on {sample:,} sampled pairs: {identical}')
+    return 0 if identical else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
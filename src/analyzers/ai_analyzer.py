@@ -1,44 +1,41 @@
-import os
 import json
+import time
 from typing import Dict, List, Optional
 from src.analyzers.base_analyzer import BaseAnalyzer
 from src.core.scoring import ModuleResult, get_status
+from src.core.llm_cache import LLMResponseCache
+from src.core.llm_scheduler import LLMScheduler
+from src.core.llm_providers import LLMProvider, create_provider
+from src.core.prompt_builder import PromptBuilder
+from src.config import AI_PROMPT_TOKEN_BUDGET
 
-# Note: the newest Gemini model series is "gemini-2.5-flash" or "gemini-2.5-pro"
-# Note: the newest OpenAI model is "gpt-5" which was released August 7, 2025
-# do not change these unless explicitly requested by the user
+CONTENT_QUALITY_FIELDS = ('readability', 'engagement', 'keyword_stuffing_risk', 'content_value', 'keyword_targeting')
+GRAMMAR_FIELDS = ('grammar_score', 'issues_found', 'grammar_suggestions', 'readability_tips', 'seo_preserved')
 
 class AIAnalyzer(BaseAnalyzer):
-    def __init__(self, content, keyword_variations, current_scores: Dict):
+    def __init__(self, content, keyword_variations, current_scores: Dict, consolidated: bool = False,
+                 cache: Optional[LLMResponseCache] = None, scheduler: Optional[LLMScheduler] = None,
+                 provider: Optional[LLMProvider] = None, keyword_cluster=None,
+                 token_budget: int = AI_PROMPT_TOKEN_BUDGET):
         super().__init__(content, keyword_variations)
         self.current_scores = current_scores
-        self.client = None
-        self.ai_type = None
-        self.model = None
-        
-        gemini_key = os.environ.get('GEMINI_API_KEY')
-        openai_key = os.environ.get('OPENAI_API_KEY')
-        
-        if gemini_key:
-            try:
-                from google import genai
-                self.client = genai.Client(api_key=gemini_key)
-                self.ai_type = 'gemini'
-                self.model = 'gemini-2.5-flash'
-            except ImportError:
-                pass
-        
-        if not self.client and openai_key:
-            try:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=openai_key)
-                self.ai_type = 'openai'
-                self.model = 'gpt-5'
-            except ImportError:
-                pass
+        self.consolidated = consolidated
+        self.cache = cache
+        self.scheduler = scheduler
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self.usage = {'calls': 0, 'input_tokens': 0, 'output_tokens': 0, 'latency_ms': 0.0}
+        self.prompts = PromptBuilder(content, keyword_variations, keyword_cluster, token_budget)
+        
+        if provider is None:
+            # Retries are left to the scheduler when one is in charge of the request budget
+            provider = create_provider(max_retries=0 if scheduler is not None else None)
+        
+        self.provider = provider
+        self.ai_type = provider.name if provider else None
+        self.model = provider.model if provider else None
     
     def analyze(self) -> ModuleResult:
-        if not self.client:
+        if not self.provider:
             return ModuleResult(
                 module_name='AI SEO Assistant',
                 score=0,
@@ -48,11 +45,25 @@ class AIAnalyzer(BaseAnalyzer):
             )
         
         try:
-            ai_recommendations = self._generate_ai_recommendations()
-            optimized_title = self._generate_optimized_title()
-            optimized_meta = self._generate_optimized_meta_description()
-            content_suggestions = self._analyze_content_quality()
-            grammar_analysis = self._analyze_grammar_seo_safe()
+            started = time.perf_counter()
+            fallback_fields = []
+            
+            if self.consolidated:
+                insights = self._generate_consolidated_insights()
+                fallback_fields = [field for field in (
+                    'ai_recommendations', 'optimized_title', 'optimized_meta_description',
+                    'content_quality_analysis', 'grammar_analysis'
+                ) if field not in insights]
+            else:
+                insights = {}
+            
+            ai_recommendations = insights['ai_recommendations'] if 'ai_recommendations' in insights else self._generate_ai_recommendations()
+            optimized_title = insights['optimized_title'] if 'optimized_title' in insights else self._generate_optimized_title()
+            optimized_meta = insights['optimized_meta_description'] if 'optimized_meta_description' in insights else self._generate_optimized_meta_description()
+            content_suggestions = insights['content_quality_analysis'] if 'content_quality_analysis' in insights else self._analyze_content_quality()
+            grammar_analysis = insights['grammar_analysis'] if 'grammar_analysis' in insights else self._analyze_grammar_seo_safe()
+            
+            total_ms = (time.perf_counter() - started) * 1000
             
             details = {
                 'ai_recommendations': ai_recommendations,
@@ -61,7 +72,24 @@ class AIAnalyzer(BaseAnalyzer):
                 'content_quality_analysis': content_suggestions,
                 'grammar_analysis': grammar_analysis,
                 'model_used': self.model,
-                'ai_provider': self.ai_type
+                'ai_provider': self.ai_type,
+                'usage': {
+                    'mode': 'consolidated' if self.consolidated else 'per_field',
+                    'calls': self.usage['calls'],
+                    'input_tokens': self.usage['input_tokens'],
+                    'output_tokens': self.usage['output_tokens'],
+                    'model_latency_ms': round(self.usage['latency_ms'], 1),
+                    'total_latency_ms': round(total_ms, 1),
+                    'overhead_ms': round(max(0.0, total_ms - self.usage['latency_ms']), 1),
+                    'fallback_fields': fallback_fields
+                },
+                'prompt_tokens': dict(self.prompts.prompt_tokens),
+                'token_budget': self.prompts.token_budget,
+                'cache': {
+                    'enabled': self.cache is not None,
+                    'hits': self.cache_stats['hits'],
+                    'misses': self.cache_stats['misses']
+                }
             }
             
             recommendations = ai_recommendations[:3] if ai_recommendations else []
@@ -83,10 +111,47 @@ class AIAnalyzer(BaseAnalyzer):
                 recommendations=[f'AI analysis failed: {str(e)}']
             )
     
-    def _generate_ai_recommendations(self) -> List[str]:
+    def _call_model(self, prompt: str, system_instruction: str, max_tokens: int, schema: Optional[str] = None) -> str:
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.ai_type, self.model, system_instruction, prompt,
+                                            max_tokens=max_tokens, schema=schema)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.cache_stats['hits'] += 1
+                return cached['text']
+            self.cache_stats['misses'] += 1
+        
+        request = lambda: self.provider.generate(prompt, system_instruction, max_tokens, schema)
+        
+        if self.scheduler is not None:
+            estimated_tokens = len(system_instruction + prompt) // 4 + max_tokens
+            response = self.scheduler.call(
+                request, estimated_tokens, usage=lambda r: r.input_tokens + r.output_tokens
+            )
+        else:
+            response = request()
+        
+        self.usage['calls'] += 1
+        self.usage['input_tokens'] += response.input_tokens
+        self.usage['output_tokens'] += response.output_tokens
+        self.usage['latency_ms'] += response.latency_ms
+        
+        if cache_key is not None:
+            self.cache.set(cache_key, {
+                'text': response.text,
+                'input_tokens': response.input_tokens,
+                'output_tokens': response.output_tokens
+            })
+        
+        return response.text
+    
+    def _generate_consolidated_insights(self) -> Dict:
         keywords = ', '.join([kw.original for kw in self.keyword_variations])
+        findings = self._keyword_findings_block()
         
-        prompt = f"""Analyze this webpage SEO and provide 5 specific, actionable recommendations focused on the target keywords: {keywords}
+        def template(excerpt: str) -> str:
+            return f"""Analyze this webpage for SEO focused on the target keywords: {keywords}
 
 URL: {self.content.url}
 Target Keywords: {keywords}
@@ -99,45 +164,105 @@ Current SEO Scores:
 - Content: {self.current_scores.get('content', 0)}/100
 - Structure: {self.current_scores.get('structure', 0)}/100
 - Links: {self.current_scores.get('links', 0)}/100
+{findings}
+Body Content Preview: {excerpt}...
+
+Complete all of the following tasks:
+1. recommendations: exactly 5 specific, actionable SEO recommendations for the keywords, focused on the biggest impact improvements.
+2. optimized_title: an SEO-optimized title tag, 50-60 characters, including the primary keyword, compelling and accurate to the page content.
+3. optimized_meta_description: an SEO-optimized meta description, 150-160 characters, including the primary keyword and a compelling call-to-action.
+4. content_quality: rate readability, engagement, keyword_stuffing_risk (higher = more risk), content_value and keyword_targeting from 1-10, plus a brief summary.
+5. grammar_analysis: grammar_score (1-10), issues_found, title_improvement, meta_improvement, 3 grammar_suggestions, 2 readability_tips and seo_preserved. DO NOT remove or change the keywords and keep keyword density intact.
+
+Respond in JSON format:
+{{
+  "recommendations": ["recommendation 1", "recommendation 2", ...],
+  "optimized_title": "title",
+  "optimized_meta_description": "meta description",
+  "content_quality": {{"readability": number, "engagement": number, "keyword_stuffing_risk": number, "content_value": number, "keyword_targeting": number, "summary": "brief summary"}},
+  "grammar_analysis": {{"grammar_score": number, "issues_found": number, "title_improvement": "text", "meta_improvement": "text", "grammar_suggestions": ["suggestion 1", ...], "readability_tips": ["tip 1", ...], "seo_preserved": true}}
+}}"""
+        
+        prompt = self.prompts.render('consolidated', template, excerpt_tokens=250)
+        
+        try:
+            text = self._call_model(
+                prompt,
+                "You are an SEO expert analyzing web pages for keyword optimization. Fix grammar WITHOUT removing keywords.",
+                max_tokens=2048,
+                schema='seo_insights'
+            )
+            result = json.loads(text)
+        except Exception:
+            return {}
+        
+        return self._validate_insights(result) if isinstance(result, dict) else {}
+    
+    def _keyword_findings_block(self) -> str:
+        findings = self.prompts.keyword_findings()
+        return f"Keyword Findings:\n{findings}\n" if findings else ''
+    
+    def _validate_insights(self, result: Dict) -> Dict:
+        valid = {}
+        
+        recommendations = result.get('recommendations')
+        if isinstance(recommendations, list) and recommendations and all(isinstance(r, str) for r in recommendations):
+            valid['ai_recommendations'] = recommendations[:5]
+        
+        title = result.get('optimized_title')
+        if isinstance(title, str) and 40 <= len(title.strip().strip('"\'')) <= 70:
+            valid['optimized_title'] = title.strip().strip('"\'')
+        
+        meta = result.get('optimized_meta_description')
+        if isinstance(meta, str) and 120 <= len(meta.strip().strip('"\'')) <= 180:
+            valid['optimized_meta_description'] = meta.strip().strip('"\'')
+        
+        quality = result.get('content_quality')
+        if isinstance(quality, dict) and all(isinstance(quality.get(f), (int, float)) for f in CONTENT_QUALITY_FIELDS):
+            valid['content_quality_analysis'] = quality
+        
+        grammar = result.get('grammar_analysis')
+        if isinstance(grammar, dict) and all(f in grammar for f in GRAMMAR_FIELDS) \
+                and isinstance(grammar['grammar_suggestions'], list) and isinstance(grammar['readability_tips'], list):
+            valid['grammar_analysis'] = grammar
+        
+        return valid
+    
+    def _generate_ai_recommendations(self) -> List[str]:
+        keywords = ', '.join([kw.original for kw in self.keyword_variations])
+        findings = self._keyword_findings_block()
+        
+        def template(excerpt: str) -> str:
+            return f"""Analyze this webpage SEO and provide 5 specific, actionable recommendations focused on the target keywords: {keywords}
 
-Body Text Preview: {self.content.body_text[:500]}...
+URL: {self.content.url}
+Target Keywords: {keywords}
+Title: {self.content.title or 'Missing'}
+Meta Description: {self.content.meta_description or 'Missing'}
+H1: {self.content.h1 or 'Missing'}
+Word Count: {self.content.word_count}
+Current SEO Scores:
+- Technical SEO: {self.current_scores.get('technical', 0)}/100
+- Content: {self.current_scores.get('content', 0)}/100
+- Structure: {self.current_scores.get('structure', 0)}/100
+- Links: {self.current_scores.get('links', 0)}/100
+{findings}
+Body Text Preview: {excerpt}...
 
 Provide exactly 5 specific, actionable SEO recommendations specifically for the keywords: {keywords}
 Focus on the biggest impact improvements based on the scores and keyword optimization.
 Respond with JSON in this format: {{"recommendations": ["recommendation 1", "recommendation 2", ...]}}"""
         
+        prompt = self.prompts.render('recommendations', template, excerpt_tokens=125)
+        
         try:
-            if self.ai_type == 'gemini':
-                from google.genai import types
-                from pydantic import BaseModel
-                
-                class Recommendations(BaseModel):
-                    recommendations: List[str]
-                
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        system_instruction="You are an SEO expert analyzing web pages for keyword optimization.",
-                        response_mime_type="application/json",
-                        response_schema=Recommendations,
-                    )
-                )
-                
-                result = json.loads(response.text)
-                
-            else:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are an SEO expert analyzing web pages for keyword optimization."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    response_format={"type": "json_object"},
-                    max_completion_tokens=1024
-                )
-                
-                result = json.loads(response.choices[0].message.content)
+            text = self._call_model(
+                prompt,
+                "You are an SEO expert analyzing web pages for keyword optimization.",
+                max_tokens=1024,
+                schema='recommendations'
+            )
+            result = json.loads(text)
             
             if 'recommendations' in result and isinstance(result['recommendations'], list):
                 return result['recommendations'][:5]
@@ -150,11 +275,12 @@ Respond with JSON in this format: {{"recommendations": ["recommendation 1", "rec
         keywords = ', '.join([kw.original for kw in self.keyword_variations])
         current_title = self.content.title or ''
         
-        prompt = f"""Generate an SEO-optimized title tag for this webpage that focuses on these keywords: {keywords}
+        def template(excerpt: str) -> str:
+            return f"""Generate an SEO-optimized title tag for this webpage that focuses on these keywords: {keywords}
 
 Target Keywords: {keywords}
 Current Title: {current_title}
-Page Content: {self.content.body_text[:300]}...
+Page Content: {excerpt}...
 
 Requirements:
 - 50-60 characters long
@@ -164,24 +290,15 @@ Requirements:
 
 Provide ONLY the optimized title, nothing else."""
         
+        prompt = self.prompts.render('title', template, excerpt_tokens=75)
+        
         try:
-            if self.ai_type == 'gemini':
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt,
-                    config={'system_instruction': "You are an SEO expert. Generate only the title tag text, nothing else."}
-                )
-                title = response.text.strip().strip('"\'')
-            else:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are an SEO expert. Generate only the title tag text, nothing else."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_completion_tokens=100
-                )
-                title = response.choices[0].message.content.strip().strip('"\'')
+            text = self._call_model(
+                prompt,
+                "You are an SEO expert. Generate only the title tag text, nothing else.",
+                max_tokens=100
+            )
+            title = text.strip().strip('"\'')
             
             return title if 40 <= len(title) <= 70 else None
         except:
@@ -191,11 +308,12 @@ Provide ONLY the optimized title, nothing else."""
         keywords = ', '.join([kw.original for kw in self.keyword_variations])
         current_meta = self.content.meta_description or ''
         
-        prompt = f"""Generate an SEO-optimized meta description for this webpage that focuses on these keywords: {keywords}
+        def template(excerpt: str) -> str:
+            return f"""Generate an SEO-optimized meta description for this webpage that focuses on these keywords: {keywords}
 
 Target Keywords: {keywords}
 Current Meta: {current_meta}
-Page Content: {self.content.body_text[:400]}...
+Page Content: {excerpt}...
 
 Requirements:
 - 150-160 characters long
@@ -205,24 +323,15 @@ Requirements:
 
 Provide ONLY the optimized meta description, nothing else."""
         
+        prompt = self.prompts.render('meta_description', template, excerpt_tokens=100)
+        
         try:
-            if self.ai_type == 'gemini':
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt,
-                    config={'system_instruction': "You are an SEO expert. Generate only the meta description text, nothing else."}
-                )
-                meta = response.text.strip().strip('"\'')
-            else:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are an SEO expert. Generate only the meta description text, nothing else."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_completion_tokens=150
-                )
-                meta = response.choices[0].message.content.strip().strip('"\'')
+            text = self._call_model(
+                prompt,
+                "You are an SEO expert. Generate only the meta description text, nothing else.",
+                max_tokens=150
+            )
+            meta = text.strip().strip('"\'')
             
             return meta if 120 <= len(meta) <= 180 else None
         except:
@@ -231,9 +340,10 @@ Provide ONLY the optimized meta description, nothing else."""
     def _analyze_content_quality(self) -> Dict:
         keywords = ', '.join([kw.original for kw in self.keyword_variations])
         
-        prompt = f"""Analyze the SEO content quality of this text for the keywords: {keywords}
+        def template(excerpt: str) -> str:
+            return f"""Analyze the SEO content quality of this text for the keywords: {keywords}
 
-Content: {self.content.body_text[:800]}...
+Content: {excerpt}...
 
 Evaluate:
 1. Readability level (1-10)
@@ -245,42 +355,17 @@ Evaluate:
 Respond in JSON format:
 {{"readability": number, "engagement": number, "keyword_stuffing_risk": number, "content_value": number, "keyword_targeting": number, "summary": "brief summary"}}"""
         
+        prompt = self.prompts.render('content_quality', template, excerpt_tokens=200)
+        
         try:
-            if self.ai_type == 'gemini':
-                from google.genai import types
-                from pydantic import BaseModel
-                
-                class ContentQuality(BaseModel):
-                    readability: int
-                    engagement: int
-                    keyword_stuffing_risk: int
-                    content_value: int
-                    keyword_targeting: int
-                    summary: str
-                
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        system_instruction="You are an SEO content quality expert.",
-                        response_mime_type="application/json",
-                        response_schema=ContentQuality,
-                    )
-                )
-                
-                return json.loads(response.text)
-            else:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are an SEO content quality expert."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    response_format={"type": "json_object"},
-                    max_completion_tokens=300
-                )
-                
-                return json.loads(response.choices[0].message.content.strip())
+            text = self._call_model(
+                prompt,
+                "You are an SEO content quality expert.",
+                max_tokens=300,
+                schema='content_quality'
+            )
+            
+            return json.loads(text.strip())
         except:
             return {'summary': 'Analysis failed'}
     
@@ -290,9 +375,9 @@ Respond in JSON format:
         title_text = self.content.title or ''
         meta_text = self.content.meta_description or ''
         h1_text = self.content.h1 or ''
-        body_preview = self.content.body_text[:1000]
         
-        prompt = f"""Analyze the grammar and readability of this SEO content. Identify grammar issues and suggest improvements WITHOUT changing or removing the target keywords: {keywords}
+        def template(excerpt: str) -> str:
+            return f"""Analyze the grammar and readability of this SEO content. Identify grammar issues and suggest improvements WITHOUT changing or removing the target keywords: {keywords}
 
 CRITICAL RULES:
 - DO NOT remove or change the keywords: {keywords}
@@ -303,7 +388,7 @@ CRITICAL RULES:
 Title: {title_text}
 Meta Description: {meta_text}
 H1: {h1_text}
-Body Content Preview: {body_preview}
+Body Content Preview: {excerpt}
 
 Target Keywords to PRESERVE: {keywords}
 
@@ -324,43 +409,17 @@ Respond in JSON format:
   "seo_preserved": true
 }}"""
         
+        prompt = self.prompts.render('grammar', template, excerpt_tokens=250)
+        
         try:
-            if self.ai_type == 'gemini':
-                from google.genai import types
-                from pydantic import BaseModel
-                
-                class GrammarAnalysis(BaseModel):
-                    grammar_score: int
-                    issues_found: int
-                    title_improvement: str
-                    meta_improvement: str
-                    grammar_suggestions: List[str]
-                    readability_tips: List[str]
-                    seo_preserved: bool
-                
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        system_instruction="You are a grammar expert who understands SEO. Fix grammar WITHOUT removing keywords.",
-                        response_mime_type="application/json",
-                        response_schema=GrammarAnalysis,
-                    )
-                )
-                
-                return json.loads(response.text)
-            else:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a grammar expert who understands SEO. Fix grammar WITHOUT removing keywords."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    response_format={"type": "json_object"},
-                    max_completion_tokens=500
-                )
-                
-                return json.loads(response.choices[0].message.content.strip())
+            text = self._call_model(
+                prompt,
+                "You are a grammar expert who understands SEO. Fix grammar WITHOUT removing keywords.",
+                max_tokens=500,
+                schema='grammar_analysis'
+            )
+            
+            return json.loads(text.strip())
         except:
             return {
                 'grammar_score': 0,
@@ -1,9 +1,10 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 from src.analyzers.base_analyzer import BaseAnalyzer
-from src.core.keyword_processor import match_keyword_in_text, KeywordVariation
-from src.core.scoring import calculate_keyword_score, get_status, ModuleResult
-from src.utils.text_utils import calculate_density, get_first_n_words
+from src.core.keyword_processor import match_keyword_in_text, KeywordVariation, PreparedText
+from src.core.scoring import calculate_keyword_score, calculate_density_score, calculate_content_score, get_status, ModuleResult
+from src.utils.text_utils import calculate_density, get_first_n_words, tokenize
+from src.utils.spans import span
 from src.config import OPTIMAL_KEYWORD_DENSITY_MIN, OPTIMAL_KEYWORD_DENSITY_MAX, MIN_WORD_COUNT
 
 @dataclass
@@ -25,46 +26,31 @@ class ClusterScore:
     keywords: List[str]
     cluster_score: int
     individual_scores: List[KeywordScore]
+    name: Optional[str] = None
 
 class ContentAnalyzer(BaseAnalyzer):
+    def __init__(self, content, keyword_variations):
+        super().__init__(content, keyword_variations)
+        self._fields = None
+    
     def analyze(self) -> ModuleResult:
-        individual_scores = []
-        
-        for kw_var in self.keyword_variations:
-            kw_score = self._analyze_keyword(kw_var)
-            individual_scores.append(kw_score)
-        
-        avg_score = sum(ks.score for ks in individual_scores) / len(individual_scores) if individual_scores else 0
-        
-        cluster = ClusterScore(
-            keywords=[kw.original for kw in self.keyword_variations],
-            cluster_score=int(avg_score),
-            individual_scores=individual_scores
-        )
+        cluster = self.score_cluster(self.keyword_variations)
+        individual_scores = cluster.individual_scores
         
         word_count_adequate = self.content.word_count >= MIN_WORD_COUNT
         
-        word_count_score = 0
         recommendations = []
         
-        if word_count_adequate:
-            word_count_score = 50
-        else:
-            word_count_score = (self.content.word_count / MIN_WORD_COUNT) * 50
+        if not word_count_adequate:
             recommendations.append(f'Increase content length to at least {MIN_WORD_COUNT} words (currently {self.content.word_count})')
         
         avg_density = sum(ks.density for ks in individual_scores) / len(individual_scores) if individual_scores else 0
-        density_health_score = 0
-        if OPTIMAL_KEYWORD_DENSITY_MIN <= avg_density <= OPTIMAL_KEYWORD_DENSITY_MAX:
-            density_health_score = 50
-        elif avg_density < OPTIMAL_KEYWORD_DENSITY_MIN:
-            density_health_score = (avg_density / OPTIMAL_KEYWORD_DENSITY_MIN) * 50
+        if avg_density < OPTIMAL_KEYWORD_DENSITY_MIN:
             recommendations.append(f'Improve keyword density (currently {avg_density:.1f}%)')
-        else:
-            density_health_score = max(0, 50 - (avg_density - OPTIMAL_KEYWORD_DENSITY_MAX) * 10)
+        elif avg_density > OPTIMAL_KEYWORD_DENSITY_MAX:
             recommendations.append(f'Reduce keyword density to avoid keyword stuffing (currently {avg_density:.1f}%)')
         
-        content_score = int(word_count_score + density_health_score)
+        content_score = calculate_content_score(self.content.word_count, avg_density)
         
         details = {
             'word_count': self.content.word_count,
@@ -81,29 +67,56 @@ class ContentAnalyzer(BaseAnalyzer):
             recommendations=recommendations
         )
     
+    def score_cluster(self, keyword_variations: List[KeywordVariation], name: Optional[str] = None) -> ClusterScore:
+        individual_scores = [self._analyze_keyword(kw_var) for kw_var in keyword_variations]
+        
+        avg_score = sum(ks.score for ks in individual_scores) / len(individual_scores) if individual_scores else 0
+        
+        return ClusterScore(
+            keywords=[kw.original for kw in keyword_variations],
+            cluster_score=int(avg_score),
+            individual_scores=individual_scores,
+            name=name
+        )
+    
+    def _prepared_fields(self) -> Dict:
+        # Page text is normalized once and shared by every keyword in every cluster
+        if self._fields is None:
+            with span('analyze.content.prepare_text'):
+                body_text = self.content.body_text
+                self._fields = {
+                    'title': PreparedText(self.content.title),
+                    'meta': PreparedText(self.content.meta_description),
+                    'h1': PreparedText(self.content.h1),
+                    'headings': {
+                        tag: [PreparedText(heading) for heading in headings]
+                        for tag, headings in self.content.headings.items()
+                    },
+                    'first_100': PreparedText(get_first_n_words(body_text, 100)),
+                    'body_lower': body_text.lower(),
+                    'body_words': len(tokenize(body_text))
+                }
+        return self._fields
+    
     def _analyze_keyword(self, kw_var: KeywordVariation) -> KeywordScore:
-        in_title = match_keyword_in_text(kw_var, self.content.title or '')
-        in_meta = match_keyword_in_text(kw_var, self.content.meta_description or '')
-        in_h1 = match_keyword_in_text(kw_var, self.content.h1 or '')
+        fields = self._prepared_fields()
+        in_title = match_keyword_in_text(kw_var, fields['title'])
+        in_meta = match_keyword_in_text(kw_var, fields['meta'])
+        in_h1 = match_keyword_in_text(kw_var, fields['h1'])
         
         in_headings = []
-        for tag, headings in self.content.headings.items():
+        for tag, headings in fields['headings'].items():
             for heading in headings:
                 if match_keyword_in_text(kw_var, heading):
                     in_headings.append(tag)
                     break
         
-        first_100 = get_first_n_words(self.content.body_text, 100)
-        in_first_100_words = match_keyword_in_text(kw_var, first_100)
+        in_first_100_words = match_keyword_in_text(kw_var, fields['first_100'])
         
-        density = calculate_density(kw_var.original, self.content.body_text)
+        density = calculate_density(kw_var.original, self.content.body_text,
+                                    total_words=fields['body_words'], text_lower=fields['body_lower'])
         
-        if OPTIMAL_KEYWORD_DENSITY_MIN <= density <= OPTIMAL_KEYWORD_DENSITY_MAX:
-            density_score = 100
-        elif density < OPTIMAL_KEYWORD_DENSITY_MIN:
-            density_score = (density / OPTIMAL_KEYWORD_DENSITY_MIN) * 100
-        else:
-            density_score = max(0, 100 - (density - OPTIMAL_KEYWORD_DENSITY_MAX) * 20)
+        density_score = calculate_density_score(density)
         
         distribution_score = 70
         
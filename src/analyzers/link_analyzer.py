@@ -1,9 +1,13 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from src.analyzers.base_analyzer import BaseAnalyzer
-from src.core.scoring import ModuleResult, get_status
+from src.core.scoring import ModuleResult, get_status, calculate_internal_link_score, calculate_link_health_score
 from src.config import RECOMMENDED_INTERNAL_LINKS_MIN, RECOMMENDED_INTERNAL_LINKS_MAX
 
 class LinkAnalyzer(BaseAnalyzer):
+    def __init__(self, content, keyword_variations, link_health: Optional[Dict] = None):
+        super().__init__(content, keyword_variations)
+        self.link_health = link_health
+    
     def analyze(self) -> ModuleResult:
         score = 0
         details = {}
@@ -15,26 +19,17 @@ class LinkAnalyzer(BaseAnalyzer):
         internal_count = len(internal_links)
         external_count = len(external_links)
         
-        if RECOMMENDED_INTERNAL_LINKS_MIN <= internal_count <= RECOMMENDED_INTERNAL_LINKS_MAX:
-            internal_score = 35
-        elif internal_count < RECOMMENDED_INTERNAL_LINKS_MIN:
-            internal_score = (internal_count / RECOMMENDED_INTERNAL_LINKS_MIN) * 35
+        if internal_count < RECOMMENDED_INTERNAL_LINKS_MIN:
             needed = RECOMMENDED_INTERNAL_LINKS_MIN - internal_count
             recommendations.append(f'Add {needed} more internal link(s)')
-        else:
-            internal_score = 35
         
-        score += int(internal_score)
+        score += calculate_internal_link_score(internal_count)
         
         if external_count > 0:
             score += 25
         else:
             recommendations.append('Add some external links to authoritative sources')
         
-        score += 25
-        
-        score += 15
-        
         details['internal_links'] = {
             'count': internal_count,
             'recommended_min': RECOMMENDED_INTERNAL_LINKS_MIN
@@ -43,6 +38,16 @@ class LinkAnalyzer(BaseAnalyzer):
             'count': external_count
         }
         
+        if self.link_health is None:
+            score += calculate_link_health_score()
+        else:
+            health_details, health_recs = self._analyze_health()
+            score += calculate_link_health_score(
+                health_details['checked'], len(health_details['broken']), len(health_details['redirects'])
+            )
+            details['health'] = health_details
+            recommendations.extend(health_recs)
+        
         return ModuleResult(
             module_name='Links',
             score=min(100, score),
@@ -50,3 +55,24 @@ class LinkAnalyzer(BaseAnalyzer):
             details=details,
             recommendations=recommendations
         )
+    
+    def _analyze_health(self):
+        urls = list(dict.fromkeys(link['url'] for link in self.content.links if link.get('url')))
+        statuses = [self.link_health[url] for url in urls if url in self.link_health]
+        
+        broken = [
+            {'url': s.url, 'status': s.status_code, 'error': s.error}
+            for s in statuses if not s.ok
+        ]
+        redirects = [
+            {'url': s.url, 'chain': [hop['status'] for hop in s.redirects], 'final_url': s.final_url}
+            for s in statuses if s.ok and s.redirects
+        ]
+        
+        recs = []
+        if broken:
+            recs.append(f'Fix {len(broken)} broken link(s)')
+        if redirects:
+            recs.append(f'Point {len(redirects)} redirected link(s) straight at their final URL')
+        
+        return {'checked': len(statuses), 'broken': broken, 'redirects': redirects}, recs
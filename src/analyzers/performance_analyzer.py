@@ -0,0 +1,58 @@
+from src.analyzers.base_analyzer import BaseAnalyzer
+from src.core.fetch_timing import FetchTiming
+from src.core.scoring import ModuleResult, get_status, calculate_performance_score, DEFAULT_THRESHOLDS
+
+class PerformanceAnalyzer(BaseAnalyzer):
+    def __init__(self, content, keyword_variations, timing: FetchTiming):
+        super().__init__(content, keyword_variations)
+        self.timing = timing
+    
+    def analyze(self) -> ModuleResult:
+        timing = self.timing
+        # Whole milliseconds, so rescoring from stored features reproduces the score exactly
+        details = {
+            'status_code': timing.status_code,
+            'http_version': timing.http_version,
+            'final_url': timing.final_url,
+            'dns_ms': round(timing.dns_ms),
+            'connect_ms': round(timing.connect_ms),
+            'tls_ms': round(timing.tls_ms),
+            'ttfb_ms': round(timing.ttfb_ms),
+            'download_ms': round(timing.download_ms),
+            'total_ms': round(timing.total_ms),
+            'transfer_bytes': timing.transfer_bytes,
+            'decoded_bytes': timing.decoded_bytes,
+            'compression': timing.compression,
+            'redirects': timing.redirects
+        }
+        
+        score = calculate_performance_score(
+            details['ttfb_ms'], details['total_ms'], details['decoded_bytes'],
+            bool(details['compression']), len(details['redirects'])
+        )
+        
+        return ModuleResult(
+            module_name='Performance',
+            score=score,
+            status=get_status(score),
+            details=details,
+            recommendations=self._recommendations(details)
+        )
+    
+    def _recommendations(self, details):
+        t = DEFAULT_THRESHOLDS
+        recs = []
+        
+        if details['ttfb_ms'] > t['ttfb_good_ms']:
+            recs.append(f"Reduce server response time (time to first byte {details['ttfb_ms']} ms, "
+                        f"aim for under {t['ttfb_good_ms']} ms)")
+        if details['total_ms'] > t['load_good_ms']:
+            recs.append(f"Speed up the HTML download ({details['total_ms']} ms in total, "
+                        f"aim for under {t['load_good_ms']} ms)")
+        if not details['compression'] and details['decoded_bytes'] >= t['compress_min_bytes']:
+            recs.append(f"Enable gzip or Brotli compression ({details['decoded_bytes'] // 1024} KB of HTML "
+                        f"sent uncompressed)")
+        if details['redirects']:
+            recs.append(f"Link straight to {details['final_url']} to skip {len(details['redirects'])} redirect(s)")
+        
+        return recs
@@ -1,8 +1,13 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from src.analyzers.base_analyzer import BaseAnalyzer
-from src.core.scoring import ModuleResult, get_status
+from src.core.scoring import ModuleResult, get_status, calculate_h1_score, calculate_image_alt_score
+from src.config import IMAGE_MAX_BYTES, IMAGE_MAX_DIMENSION, MODERN_IMAGE_FORMATS
 
 class StructureAnalyzer(BaseAnalyzer):
+    def __init__(self, content, keyword_variations, image_info: Optional[Dict] = None):
+        super().__init__(content, keyword_variations)
+        self.image_info = image_info
+    
     def analyze(self) -> ModuleResult:
         score = 0
         details = {}
@@ -22,6 +27,11 @@ class StructureAnalyzer(BaseAnalyzer):
         details['images'] = img_details
         recommendations.extend(img_recs)
         
+        if self.image_info is not None:
+            weight_details, weight_recs = self._analyze_image_weight()
+            details['images']['weight'] = weight_details
+            recommendations.extend(weight_recs)
+        
         score += 35
         
         return ModuleResult(
@@ -43,14 +53,10 @@ class StructureAnalyzer(BaseAnalyzer):
         recs = []
         if h1_count == 0:
             recs.append('Add an H1 heading to the page')
-            score = 0
-        elif h1_count == 1:
-            score = 30
-        else:
+        elif h1_count > 1:
             recs.append(f'Use only one H1 heading (found {h1_count})')
-            score = 15
         
-        return score, details, recs
+        return calculate_h1_score(h1_count), details, recs
     
     def _analyze_heading_hierarchy(self):
         structure = []
@@ -82,8 +88,40 @@ class StructureAnalyzer(BaseAnalyzer):
         recs = []
         if without_alt > 0:
             recs.append(f'Add alt text to {without_alt} image(s)')
-            score = max(0, 15 - (without_alt * 3))
-        else:
-            score = 15
         
-        return score, details, recs
+        return calculate_image_alt_score(without_alt), details, recs
+    
+    def _analyze_image_weight(self):
+        urls = list(dict.fromkeys(img['url'] for img in self.content.images if img.get('url')))
+        probed = [self.image_info[url] for url in urls if url in self.image_info]
+        loaded = [info for info in probed if info.ok]
+        
+        oversized = [
+            {'url': info.url, 'bytes': info.bytes, 'width': info.width, 'height': info.height}
+            for info in loaded
+            if (info.bytes or 0) > IMAGE_MAX_BYTES or max(info.width or 0, info.height or 0) > IMAGE_MAX_DIMENSION
+        ]
+        legacy_format = [
+            {'url': info.url, 'format': info.format, 'bytes': info.bytes}
+            for info in loaded if info.format and info.format not in MODERN_IMAGE_FORMATS
+        ]
+        failed = [{'url': info.url, 'status': info.status_code, 'error': info.error} for info in probed if not info.ok]
+        
+        details = {
+            'probed': len(probed),
+            'total_bytes': sum(info.bytes or 0 for info in loaded),
+            'oversized': oversized,
+            'legacy_format': legacy_format,
+            'failed': failed
+        }
+        
+        recs = []
+        if oversized:
+            recs.append(f'Compress or resize {len(oversized)} oversized image(s) '
+                        f'(over {IMAGE_MAX_BYTES // 1024} KB or {IMAGE_MAX_DIMENSION}px)')
+        if legacy_format:
+            recs.append(f'Serve {len(legacy_format)} image(s) as WebP or AVIF')
+        if failed:
+            recs.append(f'Fix {len(failed)} image(s) that failed to load')
+        
+        return details, recs
@@ -1,9 +1,15 @@
 from typing import Dict, List
 from src.analyzers.base_analyzer import BaseAnalyzer
-from src.core.scoring import ModuleResult, get_status
+from src.core.scoring import (
+    ModuleResult, get_status, calculate_title_score, calculate_meta_description_score, calculate_open_graph_score
+)
 from src.config import OPTIMAL_TITLE_LENGTH_MIN, OPTIMAL_TITLE_LENGTH_MAX, OPTIMAL_META_DESC_LENGTH_MIN, OPTIMAL_META_DESC_LENGTH_MAX
 
 class TechnicalSEOAnalyzer(BaseAnalyzer):
+    def __init__(self, content, keyword_variations, http_status: int = 200):
+        super().__init__(content, keyword_variations)
+        self.http_status = http_status
+    
     def analyze(self) -> ModuleResult:
         score = 0
         details = {}
@@ -27,7 +33,8 @@ class TechnicalSEOAnalyzer(BaseAnalyzer):
         score += og_score
         details['open_graph'] = og_details
         
-        details['http_status'] = 200
+        details['http_status'] = self.http_status
+        # Both fetchers reject 4xx and 5xx responses, so every analyzed page earns these; the rescorers assume so too
         score += 10
         
         return ModuleResult(
@@ -39,7 +46,6 @@ class TechnicalSEOAnalyzer(BaseAnalyzer):
         )
     
     def _analyze_title(self):
-        score = 0
         recs = []
         
         if not self.content.title:
@@ -55,20 +61,16 @@ class TechnicalSEOAnalyzer(BaseAnalyzer):
             'content': self.content.title
         }
         
-        if self.content.title:
-            score += 15
-            if optimal:
-                score += 15
+        score = calculate_title_score(True, title_len)
+        if not optimal:
+            if title_len < OPTIMAL_TITLE_LENGTH_MIN:
+                recs.append(f'Title is too short ({title_len} chars), aim for {OPTIMAL_TITLE_LENGTH_MIN}-{OPTIMAL_TITLE_LENGTH_MAX}')
             else:
-                if title_len < OPTIMAL_TITLE_LENGTH_MIN:
-                    recs.append(f'Title is too short ({title_len} chars), aim for {OPTIMAL_TITLE_LENGTH_MIN}-{OPTIMAL_TITLE_LENGTH_MAX}')
-                else:
-                    recs.append(f'Title is too long ({title_len} chars), aim for {OPTIMAL_TITLE_LENGTH_MIN}-{OPTIMAL_TITLE_LENGTH_MAX}')
+                recs.append(f'Title is too long ({title_len} chars), aim for {OPTIMAL_TITLE_LENGTH_MIN}-{OPTIMAL_TITLE_LENGTH_MAX}')
         
         return score, details, recs
     
     def _analyze_meta_description(self):
-        score = 0
         recs = []
         
         if not self.content.meta_description:
@@ -84,42 +86,39 @@ class TechnicalSEOAnalyzer(BaseAnalyzer):
             'content': self.content.meta_description
         }
         
-        if self.content.meta_description:
-            score += 12
-            if optimal:
-                score += 13
+        score = calculate_meta_description_score(True, meta_len)
+        if not optimal:
+            if meta_len < OPTIMAL_META_DESC_LENGTH_MIN:
+                recs.append(f'Meta description too short ({meta_len} chars), aim for {OPTIMAL_META_DESC_LENGTH_MIN}-{OPTIMAL_META_DESC_LENGTH_MAX}')
             else:
-                if meta_len < OPTIMAL_META_DESC_LENGTH_MIN:
-                    recs.append(f'Meta description too short ({meta_len} chars), aim for {OPTIMAL_META_DESC_LENGTH_MIN}-{OPTIMAL_META_DESC_LENGTH_MAX}')
-                else:
-                    recs.append(f'Meta description too long ({meta_len} chars), aim for {OPTIMAL_META_DESC_LENGTH_MIN}-{OPTIMAL_META_DESC_LENGTH_MAX}')
+                recs.append(f'Meta description too long ({meta_len} chars), aim for {OPTIMAL_META_DESC_LENGTH_MIN}-{OPTIMAL_META_DESC_LENGTH_MAX}')
         
         return score, details, recs
     
     def _analyze_canonical(self):
-        canonical = self.content.soup.find('link', rel='canonical')
+        canonical = self.content.canonical
         
         details = {
-            'present': bool(canonical),
-            'url': canonical.get('href', '') if canonical else None
+            'present': canonical is not None,
+            'url': canonical
         }
         
-        score = 10 if canonical else 0
+        score = 10 if canonical is not None else 0
         
         return score, details
     
     def _analyze_open_graph(self):
-        og_title = self.content.soup.find('meta', property='og:title')
-        og_desc = self.content.soup.find('meta', property='og:description')
+        og_title = self.content.og_title is not None
+        og_desc = self.content.og_description is not None
         
-        present = bool(og_title or og_desc)
-        complete = bool(og_title and og_desc)
+        present = og_title or og_desc
+        complete = og_title and og_desc
         
         details = {
             'present': present,
             'complete': complete
         }
         
-        score = 15 if complete else (7 if present else 0)
+        score = calculate_open_graph_score(present, complete)
         
         return score, details
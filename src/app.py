@@ -1,11 +1,43 @@
 import argparse
 import sys
+import time
+from contextlib import contextmanager, nullcontext
 from rich.console import Console
-from src.utils.validation import is_valid_url, validate_keywords
+from src.utils.validation import is_valid_url, validate_keywords, read_urls_file, read_clusters_file
 from src.core.orchestrator import run_analysis
-from src.output.cli_renderer import render_report, show_progress
-from src.output.json_exporter import export_to_json
+from src.core.batch import run_batch, BatchTotals
+from src.core.batch_progress import BatchProgress
+from src.core.batch_metrics import BatchMetrics
+from src.core.llm_cache import LLMResponseCache
+from src.core.llm_scheduler import LLMScheduler
+from src.core.llm_providers import PROVIDER_NAMES, create_provider
+from src.output.cli_renderer import (
+    render_report, render_batch_result, render_batch_summary, render_rescore_summary, render_link_graph_summary,
+    BatchDashboard, render_span_totals, render_memory_profile
+)
+from src.output.json_exporter import (
+    export_to_json, export_batch_to_json, export_rescore_to_json, export_link_graph_to_json, batch_result_to_dict,
+    export_batch_stats_to_json
+)
+from src.output.jsonl_writer import JsonLinesWriter
+from src.output.history_store import ResultsStore
+from src.output.feature_table import FeatureTableWriter, load_feature_table
+from src.output import table_exporter
+from src.output.table_exporter import TableExporter
+from src.core.features import rescore, load_weights_profile
+from src.core.link_graph import LinkGraph
+from src.core.link_checker import LinkChecker
+from src.core.image_probe import ImageProber
+from src.core import http2_fetcher
+from src.config import (
+    BATCH_WORKERS, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, AI_PROMPT_TOKEN_BUDGET, METRICS_HOST,
+    METRICS_TEXTFILE_INTERVAL, MEMPROFILE_TOP_ALLOCATORS
+)
 from src.utils.text_utils import ensure_nltk_data
+from src.utils.spans import SpanTotals, collect_spans, track_span_memory
+from src.utils.memory import MemoryProfiler
+from src.utils.profiling import RunProfiler
+from src.utils.metrics import MetricsServer, TextfileWriter
 
 __version__ = "2.2.0"
 
@@ -20,23 +52,40 @@ def app():
             "Docs & issues: https://github.com/cleven12/seo_optimizer"
         ),
     )
-
+    
     parser.add_argument(
         '--version',
         action='version',
         version=f'SEO Analyzer {__version__}',
     )
     
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    
+    target.add_argument(
         '-u', '--url',
-        required=True,
         help='Target URL to analyze'
     )
     
+    target.add_argument(
+        '--urls-file',
+        help='File with one URL per line to analyze as a batch'
+    )
+    
+    target.add_argument(
+        '--rescore',
+        metavar='DIR',
+        help='Recompute scores from a feature table written with --features (no fetching)'
+    )
+    
     parser.add_argument(
         '-k', '--keywords',
-        required=True,
-        help='Comma-separated focus keywords'
+        help='Comma-separated focus keywords (required unless --rescore or --clusters-file is used)'
+    )
+    
+    parser.add_argument(
+        '--clusters-file',
+        metavar='FILE',
+        help='Score each page against several keyword clusters, one "name: kw1, kw2" per line'
     )
     
     parser.add_argument(
@@ -44,6 +93,108 @@ def app():
         help='JSON output file path (optional)'
     )
     
+    parser.add_argument(
+        '--jsonl',
+        metavar='FILE',
+        help='Batch mode: write one JSON line per page as each page finishes (gzip-compressed if FILE ends in .gz)'
+    )
+    
+    parser.add_argument(
+        '--jsonl-max-mb',
+        type=float,
+        metavar='MB',
+        help='Start a new --jsonl part file (FILE.1.jsonl, ...) once the current one reaches MB megabytes'
+    )
+    
+    parser.add_argument(
+        '--summary',
+        metavar='FILE',
+        help='Batch mode: save the site-level summary (score percentiles, keyword coverage, frequent recommendations, worst pages) to FILE'
+    )
+    
+    parser.add_argument(
+        '--store',
+        metavar='DB',
+        help='Append results to a SQLite history database (created if missing)'
+    )
+    
+    parser.add_argument(
+        '--features',
+        metavar='DIR',
+        help='Write the raw measurements behind each score to a columnar feature table in DIR'
+    )
+    
+    parser.add_argument(
+        '--table',
+        metavar='DIR',
+        help='Write flat tables for warehouse loading to DIR: pages (one row per page) and keywords (one row per page and keyword)'
+    )
+    
+    parser.add_argument(
+        '--table-format',
+        choices=table_exporter.FORMATS,
+        default='csv',
+        help='File format for --table (parquet needs pyarrow)'
+    )
+    
+    parser.add_argument(
+        '--check-links',
+        action='store_true',
+        help='Request every link on the page (HEAD, falling back to GET) and report broken links and redirects'
+    )
+    
+    parser.add_argument(
+        '--audit-images',
+        action='store_true',
+        help='Probe every image for byte size, format and dimensions and flag heavy or legacy-format images'
+    )
+    
+    parser.add_argument(
+        '--http2',
+        action='store_true',
+        help='Fetch batch pages over HTTP/2, sharing one connection per site (needs httpx[http2])'
+    )
+    
+    parser.add_argument(
+        '--link-graph',
+        metavar='FILE',
+        help='Batch mode: build the internal link graph (orphans, click depth, PageRank) and save it to FILE'
+    )
+    
+    parser.add_argument(
+        '--weights',
+        metavar='FILE',
+        help='JSON weights profile (score_weights, keyword_score_weights, thresholds) used with --rescore'
+    )
+    
+    parser.add_argument(
+        '--no-dashboard',
+        action='store_true',
+        help='Batch mode: do not show the live progress dashboard (it is always off when output is not a terminal)'
+    )
+    
+    parser.add_argument(
+        '--max-rss-mb',
+        type=int,
+        metavar='MB',
+        help='Batch mode: soft memory ceiling; while the process RSS is above it, no new pages are taken '
+             'until the ones in progress finish'
+    )
+    
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        metavar='PORT',
+        help=f'Batch mode: serve Prometheus metrics on http://{METRICS_HOST}:PORT/metrics while the run lasts'
+    )
+    
+    parser.add_argument(
+        '--metrics-file',
+        metavar='FILE',
+        help=f'Batch mode: write Prometheus metrics to FILE every {METRICS_TEXTFILE_INTERVAL}s '
+             '(for the node_exporter textfile collector)'
+    )
+    
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -56,15 +207,131 @@ def app():
         help='Enable AI-powered SEO recommendations (uses Gemini or OpenAI)'
     )
     
+    parser.add_argument(
+        '--ai-consolidated',
+        action='store_true',
+        help='Request all AI insights in a single structured call (falls back to per-field calls)'
+    )
+    
+    parser.add_argument(
+        '--no-ai-cache',
+        action='store_true',
+        help='Always call the AI provider instead of reusing cached responses'
+    )
+    
+    parser.add_argument(
+        '--ai-provider',
+        choices=PROVIDER_NAMES,
+        help='AI provider to use (default: Gemini if GEMINI_API_KEY is set, otherwise OpenAI)'
+    )
+    
+    parser.add_argument(
+        '--ai-model',
+        help='Override the model name sent to the AI provider'
+    )
+    
+    parser.add_argument(
+        '--ai-base-url',
+        help='Base URL of an OpenAI-compatible server (used with --ai-provider local or openai)'
+    )
+    
+    parser.add_argument(
+        '--ai-record',
+        metavar='FILE',
+        help='Append every AI response to FILE for later replay (combine with --no-ai-cache to capture all prompts)'
+    )
+    
+    parser.add_argument(
+        '--ai-replay',
+        metavar='FILE',
+        help='Serve AI responses from a recording instead of calling a provider'
+    )
+    
+    parser.add_argument(
+        '--ai-token-budget',
+        type=int,
+        default=AI_PROMPT_TOKEN_BUDGET,
+        help=f'Maximum estimated tokens per AI prompt (default: {AI_PROMPT_TOKEN_BUDGET})'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=BATCH_WORKERS,
+        help=f'Concurrent page fetches in batch mode (default: {BATCH_WORKERS})'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        metavar='PREFIX',
+        help='Profile the run: write PREFIX.pstats (cProfile, all threads) and PREFIX.collapsed '
+             '(flame graph stacks) and print per-stage timings'
+    )
+    
+    parser.add_argument(
+        '--memprofile',
+        action='store_true',
+        help='Trace memory allocations: print the peak memory of each stage and the top allocating lines'
+    )
+    
+    parser.add_argument(
+        '--ai-rpm',
+        type=int,
+        default=LLM_REQUESTS_PER_MINUTE,
+        help=f'AI requests per minute budget in batch mode (default: {LLM_REQUESTS_PER_MINUTE})'
+    )
+    
+    parser.add_argument(
+        '--ai-tpm',
+        type=int,
+        default=LLM_TOKENS_PER_MINUTE,
+        help=f'AI tokens per minute budget in batch mode (default: {LLM_TOKENS_PER_MINUTE})'
+    )
+    
     args = parser.parse_args()
     
-    if not is_valid_url(args.url):
+    if args.rescore:
+        run_rescore_cli(args)
+        return
+    
+    if not args.keywords and not args.clusters_file:
+        parser.error('the following arguments are required: -k/--keywords')
+    
+    if args.link_graph and not args.urls_file:
+        parser.error('--link-graph requires --urls-file')
+    
+    if args.jsonl and not args.urls_file:
+        parser.error('--jsonl requires --urls-file')
+    
+    if args.summary and not args.urls_file:
+        parser.error('--summary requires --urls-file')
+    
+    if (args.metrics_port is not None or args.metrics_file) and not args.urls_file:
+        parser.error('--metrics-port and --metrics-file require --urls-file')
+    
+    if args.max_rss_mb and not args.urls_file:
+        parser.error('--max-rss-mb requires --urls-file')
+    
+    if args.http2 and not args.urls_file:
+        parser.error('--http2 requires --urls-file')
+    
+    if args.http2 and not http2_fetcher.is_available():
+        console.print("[red]Error: --http2 needs httpx with HTTP/2 support (pip install 'httpx[http2]')[/red]")
+        sys.exit(1)
+    
+    if args.table and not table_exporter.is_available(args.table_format):
+        console.print("[red]Error: --table-format parquet needs pyarrow (pip install pyarrow)[/red]")
+        sys.exit(1)
+    
+    if args.url and not is_valid_url(args.url):
         console.print("[red]Error: Invalid URL format[/red]")
         sys.exit(1)
     
     try:
-        keywords = validate_keywords(args.keywords)
-    except ValueError as e:
+        clusters = read_clusters_file(args.clusters_file) if args.clusters_file else None
+        # Without -k the first cluster drives the overall score
+        keywords = validate_keywords(args.keywords) if args.keywords else clusters[0][1]
+    except (OSError, ValueError) as e:
         console.print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
     
@@ -72,18 +339,216 @@ def app():
         console.print("[cyan]Downloading NLTK data...[/cyan]")
         ensure_nltk_data()
         
-        console.print(f"[cyan]Fetching content from {args.url}...[/cyan]")
-        report = run_analysis(args.url, keywords, args.verbose, args.ai)
-        
-        render_report(report, args.verbose)
-        
-        if args.output:
-            export_to_json(report, args.output)
-            console.print(f"[green]✅ Report saved to: {args.output}[/green]")
-        
+        with run_profile(args.profile), run_memprofile(args.memprofile):
+            if args.urls_file:
+                run_batch_cli(args, keywords, clusters)
+            else:
+                run_single_cli(args, keywords, clusters)
+    
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
         sys.exit(1)
 
+@contextmanager
+def run_profile(prefix):
+    # --profile: cProfile every thread, sample stacks and total the timing spans for the whole run
+    if not prefix:
+        yield
+        return
+    totals = SpanTotals()
+    with collect_spans(totals), RunProfiler() as profiler:
+        yield
+    pstats_path, collapsed_path = profiler.write(prefix)
+    render_span_totals(totals, profiler.elapsed)
+    console.print(f"[green]✅ Profile saved to: {pstats_path} (pstats), {collapsed_path} (collapsed stacks)[/green]")
+
+@contextmanager
+def run_memprofile(enabled: bool):
+    # --memprofile: tracemalloc for the whole run, with the peak memory each timing span added
+    if not enabled:
+        yield
+        return
+    with MemoryProfiler() as profiler, track_span_memory(profiler):
+        yield
+    render_memory_profile(profiler.peak, profiler.stage_peaks(), profiler.top_allocators(MEMPROFILE_TOP_ALLOCATORS))
+
+def run_single_cli(args, keywords, clusters=None):
+    provider = build_provider(args, batch=False) if args.ai else None
+    store = ResultsStore(args.store) if args.store else None
+    
+    console.print(f"[cyan]Fetching content from {args.url}...[/cyan]")
+    try:
+        report = run_analysis(args.url, keywords, args.verbose, args.ai, args.ai_consolidated,
+                              not args.no_ai_cache, provider, args.ai_token_budget, store=store,
+                              clusters=clusters, check_links=args.check_links,
+                              audit_images=args.audit_images)
+    finally:
+        if store:
+            store.close()
+    
+    render_report(report, args.verbose)
+    
+    if args.output:
+        export_to_json(report, args.output)
+        console.print(f"[green]✅ Report saved to: {args.output}[/green]")
+    
+    if args.features:
+        with FeatureTableWriter(args.features) as features:
+            features.add_report(report)
+        console.print(f"[green]✅ Features saved to: {args.features}[/green]")
+    
+    if args.table:
+        with TableExporter(args.table, args.table_format) as table:
+            table.add_report(report)
+        console.print(f"[green]✅ Tables saved to: {', '.join(table.paths)}[/green]")
+    
+    if store:
+        if store.stats['reused']:
+            console.print(f"[cyan]♻️  Page unchanged since the last run, reused stored results "
+                          f"({store.stats['saved_ms']:.0f} ms saved)[/cyan]")
+        console.print(f"[green]✅ Results stored in: {args.store}[/green]")
+
+def build_provider(args, batch: bool):
+    return create_provider(
+        name=args.ai_provider,
+        model=args.ai_model,
+        base_url=args.ai_base_url,
+        record_path=args.ai_record,
+        replay_path=args.ai_replay,
+        max_retries=0 if batch else None
+    )
+
+def run_batch_cli(args, keywords, clusters=None):
+    urls = read_urls_file(args.urls_file)
+    console.print(f"[cyan]Analyzing {len(urls)} page(s) with {args.workers} worker(s)...[/cyan]")
+    
+    scheduler = None
+    provider = None
+    if args.ai:
+        scheduler = LLMScheduler(requests_per_minute=args.ai_rpm, tokens_per_minute=args.ai_tpm)
+        provider = build_provider(args, batch=True)
+    
+    store = ResultsStore(args.store) if args.store else None
+    run_id = store.start_run(args.urls_file) if store else None
+    features = FeatureTableWriter(args.features) if args.features else None
+    table = TableExporter(args.table, args.table_format) if args.table else None
+    link_graph = LinkGraph() if args.link_graph else None
+    # One checker for the whole batch so links repeated across pages are requested once
+    link_checker = LinkChecker() if args.check_links else None
+    image_prober = ImageProber() if args.audit_images else None
+    page_fetcher = http2_fetcher.Http2Fetcher() if args.http2 else None
+    max_bytes = int(args.jsonl_max_mb * 1024 * 1024) if args.jsonl_max_mb else None
+    jsonl = JsonLinesWriter(args.jsonl, max_bytes=max_bytes) if args.jsonl else None
+    
+    llm_cache = LLMResponseCache() if args.ai and not args.no_ai_cache else None
+    
+    totals = BatchTotals()
+    progress = BatchProgress(total=len(urls), scheduler=scheduler)
+    metrics, metrics_server, metrics_file = None, None, None
+    if args.metrics_port is not None or args.metrics_file:
+        caches = {}
+        if llm_cache:
+            caches['llm'] = llm_cache.stats
+        if link_checker:
+            caches['link_check'] = link_checker.cache.stats
+        if image_prober:
+            caches['image_probe'] = image_prober.cache.stats
+        metrics = BatchMetrics(progress, scheduler, store, caches)
+        if args.metrics_port is not None:
+            metrics_server = MetricsServer(metrics.registry, args.metrics_port, METRICS_HOST)
+            console.print(f"[cyan]Serving metrics on {metrics_server.address}[/cyan]")
+        if args.metrics_file:
+            metrics_file = TextfileWriter(metrics.registry, args.metrics_file, METRICS_TEXTFILE_INTERVAL)
+    # Results are only held in memory when --output needs them all at the end
+    results = [] if args.output else None
+    try:
+        with BatchDashboard(progress, enabled=False if args.no_dashboard else None), \
+                collect_spans(metrics.stages) if metrics else nullcontext():
+            for result in run_batch(urls, keywords, args.ai, args.ai_consolidated, not args.no_ai_cache,
+                                    workers=args.workers, scheduler=scheduler, provider=provider,
+                                    ai_token_budget=args.ai_token_budget, store=store, run_id=run_id,
+                                    clusters=clusters, link_graph=link_graph, link_checker=link_checker,
+                                    image_prober=image_prober, page_fetcher=page_fetcher, progress=progress,
+                                    llm_cache=llm_cache,
+                                    max_rss_bytes=args.max_rss_mb * 1024 * 1024 if args.max_rss_mb else None):
+                render_batch_result(result)
+                totals.add(result)
+                if jsonl:
+                    jsonl.write(batch_result_to_dict(result))
+                if results is not None:
+                    results.append(result)
+                if features and result.report:
+                    features.add_report(result.report)
+                if table and result.report:
+                    table.add_report(result.report)
+    finally:
+        if scheduler:
+            scheduler.shutdown()
+        if store:
+            store.close()
+        if features:
+            features.close()
+        if table:
+            table.close()
+        if link_checker:
+            link_checker.close()
+        if image_prober:
+            image_prober.close()
+        if page_fetcher:
+            page_fetcher.close()
+        if jsonl:
+            jsonl.close()
+        if metrics_server:
+            metrics_server.close()
+        if metrics_file:
+            metrics_file.close()
+    
+    render_batch_summary(totals)
+    
+    if args.output:
+        export_batch_to_json([r.report for r in results if r.report], args.output)
+        console.print(f"[green]✅ Reports saved to: {args.output}[/green]")
+    
+    if args.summary:
+        export_batch_stats_to_json(totals.stats, args.summary)
+        console.print(f"[green]✅ Summary saved to: {args.summary}[/green]")
+    
+    if jsonl:
+        console.print(f"[green]✅ {jsonl.records} result line(s) saved to: {', '.join(jsonl.paths)}[/green]")
+    
+    if store:
+        console.print(f"[green]✅ Results stored in: {args.store} (run {run_id})[/green]")
+    
+    if features:
+        console.print(f"[green]✅ Features saved to: {args.features}[/green]")
+    
+    if table:
+        console.print(f"[green]✅ {table.page_rows} page row(s) and {table.keyword_rows} keyword row(s) saved to: "
+                      f"{', '.join(table.paths)}[/green]")
+    
+    if link_graph:
+        stats = link_graph.page_stats()
+        render_link_graph_summary(link_graph, stats)
+        export_link_graph_to_json(link_graph, stats, args.link_graph)
+        console.print(f"[green]✅ Link graph saved to: {args.link_graph}[/green]")
+
+def run_rescore_cli(args):
+    try:
+        pages, keywords, urls = load_feature_table(args.rescore)
+        weights, keyword_weights, thresholds = load_weights_profile(args.weights) if args.weights else (None, None, None)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error: {str(e)}[/red]")
+        sys.exit(1)
+    
+    started = time.perf_counter()
+    scores = rescore(pages, keywords, weights, keyword_weights, thresholds)
+    elapsed = time.perf_counter() - started
+    
+    render_rescore_summary(urls, pages['overall_score'], scores, elapsed)
+    
+    if args.output:
+        export_rescore_to_json(urls, pages['overall_score'], scores, args.output)
+        console.print(f"[green]✅ Scores saved to: {args.output}[/green]")
+
 if __name__ == '__main__':
     app()
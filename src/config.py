@@ -20,7 +20,9 @@ SCORE_WEIGHTS = {
     'technical_seo': 0.20,
     'content_analysis': 0.20,
     'structure': 0.10,
-    'links': 0.10
+    'links': 0.10,
+    # Share of the overall score given to page performance when fetch timings are available
+    'performance': 0.10
 }
 
 KEYWORD_SCORE_WEIGHTS = {
@@ -32,3 +34,54 @@ KEYWORD_SCORE_WEIGHTS = {
     'density_score': 0.15,
     'distribution_score': 0.15
 }
+
+LLM_CACHE_DIR = '.seo_cache/llm'
+LLM_CACHE_TTL = 7 * 24 * 3600
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+BATCH_WORKERS = 8
+# Pages queued, in flight or awaiting AI analysis per worker; later URLs are only taken as earlier pages finish
+BATCH_QUEUE_PER_WORKER = 4
+BATCH_STATS_TOP_RECOMMENDATIONS = 10
+BATCH_STATS_WORST_PAGES = 10
+DASHBOARD_REFRESH_PER_SECOND = 4
+
+MEMPROFILE_TOP_ALLOCATORS = 15
+
+METRICS_HOST = '127.0.0.1'
+METRICS_TEXTFILE_INTERVAL = 15
+# Histogram bucket upper bounds in seconds, for the per-stage latency metrics
+METRICS_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+LLM_REQUESTS_PER_MINUTE = 60
+LLM_TOKENS_PER_MINUTE = 200000
+LLM_MAX_RETRIES = 5
+LLM_WORKERS = 4
+
+AI_PROMPT_TOKEN_BUDGET = 1500
+
+STORE_BATCH_SIZE = 500
+
+LINK_CHECK_WORKERS = 16
+LINK_CHECK_TIMEOUT = 5
+LINK_CHECK_CACHE_TTL = 3600
+LINK_CHECK_PER_HOST = 2
+LINK_CHECK_HOST_INTERVAL = 0.25
+LINK_CHECK_MAX_REDIRECTS = 10
+
+IMAGE_PROBE_WORKERS = 16
+IMAGE_PROBE_TIMEOUT = 5
+IMAGE_PROBE_BYTES = 32 * 1024
+IMAGE_PROBE_CACHE_TTL = 3600
+IMAGE_PROBE_PER_HOST = 4
+IMAGE_MAX_BYTES = 200 * 1024
+IMAGE_MAX_DIMENSION = 2560
+MODERN_IMAGE_FORMATS = ('webp', 'avif', 'svg')
+
+PERFORMANCE_TTFB_GOOD_MS = 800
+PERFORMANCE_TTFB_POOR_MS = 1800
+PERFORMANCE_LOAD_GOOD_MS = 1500
+PERFORMANCE_LOAD_POOR_MS = 4000
+PERFORMANCE_COMPRESS_MIN_BYTES = 1024
+
+HTTP2_MAX_CONNECTIONS = 20
@@ -0,0 +1,188 @@
+import time
+import queue
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+from src.core.keyword_processor import process_keywords
+from src.core.fingerprint import analysis_signature
+from src.core.llm_cache import LLMResponseCache
+from src.core.llm_scheduler import LLMScheduler
+from src.core.llm_providers import LLMProvider, create_provider
+from src.core.link_graph import LinkGraph
+from src.core.link_checker import LinkChecker
+from src.core.image_probe import ImageProber
+from src.core.http2_fetcher import Http2Fetcher
+from src.core.orchestrator import AnalysisReport, PageAnalysis, analyze_page, process_clusters, run_ai_analysis
+from src.core.batch_stats import BatchStats
+from src.core.batch_progress import BatchProgress
+from src.utils.spans import record_spans
+from src.utils.memory import process_rss_bytes
+from src.config import BATCH_WORKERS, BATCH_QUEUE_PER_WORKER, AI_PROMPT_TOKEN_BUDGET
+
+@dataclass
+class BatchResult:
+    url: str
+    report: Optional[AnalysisReport] = None
+    error: Optional[str] = None
+    reused: bool = False
+    saved_ms: float = 0.0
+
+@dataclass
+class BatchTotals:
+    # Running counts for the batch summary, so results need not be kept once they are written out
+    analyzed: int = 0
+    failed: int = 0
+    reused: int = 0
+    saved_ms: float = 0.0
+    score_total: int = 0
+    stats: BatchStats = field(default_factory=BatchStats)
+    
+    def add(self, result: BatchResult):
+        if result.report is None:
+            self.failed += 1
+            return
+        self.analyzed += 1
+        self.score_total += result.report.overall_score
+        self.stats.add(result.report)
+        if result.reused:
+            self.reused += 1
+            self.saved_ms += result.saved_ms
+
+def run_batch(
+    urls: Iterable[str],
+    keywords: List[str],
+    use_ai: bool = False,
+    ai_consolidated: bool = False,
+    ai_cache: bool = True,
+    workers: int = BATCH_WORKERS,
+    scheduler: Optional[LLMScheduler] = None,
+    provider: Optional[LLMProvider] = None,
+    ai_token_budget: int = AI_PROMPT_TOKEN_BUDGET,
+    store=None,
+    run_id: Optional[int] = None,
+    clusters: Optional[List[Tuple[str, List[str]]]] = None,
+    link_graph: Optional[LinkGraph] = None,
+    link_checker: Optional[LinkChecker] = None,
+    image_prober: Optional[ImageProber] = None,
+    page_fetcher: Optional[Http2Fetcher] = None,
+    progress: Optional[BatchProgress] = None,
+    llm_cache: Optional[LLMResponseCache] = None,
+    max_rss_bytes: Optional[int] = None
+) -> Iterator[BatchResult]:
+    keyword_variations = process_keywords(keywords)
+    cluster_variations = process_clusters(clusters)
+    signature = analysis_signature(keywords, clusters) if store is not None else None
+    if store is not None and run_id is None:
+        run_id = store.start_run()
+    cache = (llm_cache or LLMResponseCache()) if use_ai and ai_cache else None
+    owns_scheduler = use_ai and scheduler is None
+    if owns_scheduler:
+        scheduler = LLMScheduler()
+    if use_ai and provider is None:
+        provider = create_provider(max_retries=0)
+    
+    def analyze(url: str) -> PageAnalysis:
+        if progress is not None:
+            progress.page_started()
+        try:
+            analysis = analyze_page(url, keyword_variations, store, signature, cluster_variations,
+                                    link_checker, image_prober, page_fetcher)
+            if use_ai or link_graph is not None:
+                # Reused pages are parsed here, on a page worker, so none waits for AI analysis holding its raw body
+                content = analysis.parsed_content()
+                if link_graph is not None:
+                    link_graph.add_page(url, content.links)
+        except Exception:
+            if progress is not None:
+                progress.page_failed()
+            raise
+        if progress is not None:
+            timing = analysis.page.timing
+            progress.page_analyzed(timing.total_ms if timing else None, analysis.analysis_ms - analysis.saved_ms,
+                                   analysis.reused)
+        return analysis
+    
+    def finish(analysis: PageAnalysis, error: Optional[str] = None) -> BatchResult:
+        if store is not None:
+            store.record(run_id, analysis, signature)
+        if progress is not None:
+            progress.page_finished(analysis.report.overall_score)
+        return BatchResult(url=analysis.report.url, report=analysis.report, error=error,
+                           reused=analysis.reused, saved_ms=analysis.saved_ms)
+    
+    def analyze_with_ai(analysis: PageAnalysis) -> PageAnalysis:
+        report = analysis.report
+        if progress is not None:
+            progress.ai_started()
+        started = time.perf_counter()
+        try:
+            with record_spans(report.timings):
+                report.ai_analysis = run_ai_analysis(
+                    analysis.parsed_content(), keyword_variations, report,
+                    consolidated=ai_consolidated,
+                    cache=cache,
+                    scheduler=scheduler,
+                    provider=provider,
+                    token_budget=ai_token_budget
+                )
+        finally:
+            if progress is not None:
+                progress.ai_finished((time.perf_counter() - started) * 1000)
+        return analysis
+    
+    remaining = iter(urls)
+    window = max(1, workers * BATCH_QUEUE_PER_WORKER)
+    # Page and AI futures land here as they finish, whichever pool ran them
+    completed = queue.Queue()
+    
+    def take_more(pool: ThreadPoolExecutor, futures: dict, ai_futures: dict):
+        # Only a window of pages is held at a time, whether fetching, analyzing or waiting for AI
+        # analysis, and finished futures are dropped once handled, so memory follows the window rather
+        # than the number of URLs. Over the RSS ceiling no new pages are taken until everything already
+        # taken has been handed out.
+        pending = len(futures) + len(ai_futures)
+        while pending < window:
+            if pending and max_rss_bytes and (process_rss_bytes() or 0) > max_rss_bytes:
+                return
+            url = next(remaining, None)
+            if url is None:
+                return
+            if progress is not None:
+                progress.page_queued()
+            future = pool.submit(analyze, url)
+            futures[future] = url
+            future.add_done_callback(completed.put)
+            pending += 1
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+            ai_futures = {}
+            take_more(pool, futures, ai_futures)
+            while futures or ai_futures:
+                future = completed.get()
+                if future in ai_futures:
+                    analysis = ai_futures.pop(future)
+                    try:
+                        yield finish(future.result())
+                    except Exception as e:
+                        yield finish(analysis, error=str(e))
+                elif future.exception() is not None:
+                    yield BatchResult(url=futures.pop(future), error=str(future.exception()))
+                elif use_ai:
+                    del futures[future]
+                    analysis = future.result()
+                    # Pages furthest from a perfect score get their AI suggestions first
+                    deficit = 100 - analysis.report.overall_score
+                    if progress is not None:
+                        progress.ai_submitted()
+                    ai_future = scheduler.submit(deficit, lambda a=analysis: analyze_with_ai(a))
+                    ai_futures[ai_future] = analysis
+                    ai_future.add_done_callback(completed.put)
+                else:
+                    del futures[future]
+                    yield finish(future.result())
+                take_more(pool, futures, ai_futures)
+    finally:
+        if owns_scheduler:
+            scheduler.shutdown()
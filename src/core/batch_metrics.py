@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional
+from src.core.batch_progress import BatchProgress
+from src.utils.metrics import LabeledHistogram, MetricFamily, MetricsRegistry
+from src.utils.memory import process_rss_bytes
+from src.config import METRICS_LATENCY_BUCKETS
+
+PREFIX = 'seo_analyzer'
+
+# Scheduler stats key -> (metric name, help)
+LLM_COUNTERS = {
+    'requests': ('llm_requests_total', 'AI requests sent'),
+    'tokens': ('llm_tokens_total', 'Estimated AI prompt tokens sent'),
+    'rate_limited': ('llm_rate_limited_total', 'AI requests rejected by the provider rate limit'),
+    'retries': ('llm_retries_total', 'AI request retries'),
+    'failed': ('llm_failed_total', 'AI requests that gave up after retrying')
+}
+
+class BatchMetrics:
+    # Prometheus metrics for a batch run. Page counts, queue depths and cache hit counts are read at
+    # scrape time from the counters BatchProgress, the caches and the LLM scheduler already keep;
+    # the only hot-path work is the stage histogram, fed by the timing spans.
+    def __init__(self, progress: BatchProgress, scheduler=None, store=None,
+                 caches: Optional[Dict[str, Dict[str, int]]] = None,
+                 buckets=METRICS_LATENCY_BUCKETS):
+        self.progress = progress
+        self.scheduler = scheduler
+        self.store = store
+        # Cache name -> its stats dict with 'hits' and 'misses'
+        self.caches = caches or {}
+        self.stages = LabeledHistogram(f'{PREFIX}_stage_duration_seconds',
+                                       'Time spent per page in each stage (fetch, parse, extract, analyze.*)',
+                                       'stage', buckets)
+        self.registry = MetricsRegistry()
+        self.registry.register(self.collect)
+    
+    def collect(self) -> List[MetricFamily]:
+        progress = self.progress
+        families = [
+            MetricFamily(f'{PREFIX}_pages_total', 'counter', 'Pages finished, by result')
+            .add(progress.completed, result='analyzed')
+            .add(progress.failed, result='failed'),
+            MetricFamily(f'{PREFIX}_pages_reused_total', 'counter',
+                         'Pages whose stored results were reused because they had not changed')
+            .add(progress.reused),
+            MetricFamily(f'{PREFIX}_pages_queued', 'gauge', 'Pages waiting for a worker').add(progress.queued),
+            MetricFamily(f'{PREFIX}_fetches_in_flight', 'gauge', 'Pages being fetched or analyzed')
+            .add(progress.in_flight),
+            MetricFamily(f'{PREFIX}_ai_in_flight', 'gauge', 'Pages waiting for or running AI analysis')
+            .add(progress.ai_queued + progress.ai_in_flight),
+            self.stages.family()
+        ]
+        
+        caches = dict(self.caches)
+        if self.store is not None:
+            # Reusing an unchanged page is a hit on the stored-results cache
+            caches['page'] = {'hits': self.store.stats['reused'], 'misses': self.store.stats['analyzed']}
+        if caches:
+            lookups = MetricFamily(f'{PREFIX}_cache_requests_total', 'counter', 'Cache lookups, by cache and result')
+            for name, stats in sorted(caches.items()):
+                lookups.add(stats['hits'], cache=name, result='hit')
+                lookups.add(stats['misses'], cache=name, result='miss')
+            families.append(lookups)
+        
+        if self.scheduler is not None:
+            stats = self.scheduler.stats
+            for key, (name, help_text) in LLM_COUNTERS.items():
+                families.append(MetricFamily(f'{PREFIX}_{name}', 'counter', help_text).add(stats.get(key, 0)))
+        
+        rss = process_rss_bytes()
+        if rss is not None:
+            families.append(MetricFamily('process_resident_memory_bytes', 'gauge', 'Resident memory size in bytes')
+                            .add(rss))
+        return families
@@ -0,0 +1,108 @@
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional
+from src.utils.sketches import ScoreHistogram, LogHistogram
+
+STAGES = ('fetch', 'analyze', 'ai')
+
+# Snapshots kept for the recent pages-per-second rate
+RATE_WINDOW = 20
+
+class BatchProgress:
+    # Counters the batch workers update and a dashboard samples. Each update is a few integer
+    # operations under a short lock; all formatting happens on the sampling side, so a slow or
+    # missing display never holds the workers up.
+    def __init__(self, total: Optional[int] = None, scheduler=None, clock=time.monotonic):
+        self.total = total
+        self.scheduler = scheduler
+        self.clock = clock
+        self.started_at = clock()
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.reused = 0
+        self.ai_queued = 0
+        self.ai_in_flight = 0
+        self.latency = {stage: LogHistogram() for stage in STAGES}
+        self.scores = ScoreHistogram()
+        self._samples = deque(maxlen=RATE_WINDOW)
+        self._lock = threading.Lock()
+    
+    def page_queued(self):
+        with self._lock:
+            self.queued += 1
+    
+    def page_started(self):
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+    
+    def page_analyzed(self, fetch_ms: Optional[float], analyze_ms: float, reused: bool = False):
+        with self._lock:
+            self.in_flight -= 1
+            if fetch_ms is not None:
+                self.latency['fetch'].add(fetch_ms)
+            self.latency['analyze'].add(analyze_ms)
+            self.reused += reused
+    
+    def page_failed(self):
+        with self._lock:
+            self.in_flight -= 1
+            self.failed += 1
+    
+    def ai_submitted(self):
+        with self._lock:
+            self.ai_queued += 1
+    
+    def ai_started(self):
+        with self._lock:
+            self.ai_queued -= 1
+            self.ai_in_flight += 1
+    
+    def ai_finished(self, ai_ms: float):
+        with self._lock:
+            self.ai_in_flight -= 1
+            self.latency['ai'].add(ai_ms)
+    
+    def page_finished(self, score: Optional[int]):
+        # Called once per page as its result is handed out (after AI analysis, when enabled)
+        with self._lock:
+            self.completed += 1
+            if score is not None:
+                self.scores.add(score)
+    
+    def snapshot(self) -> Dict:
+        now = self.clock()
+        with self._lock:
+            self._samples.append((now, self.completed + self.failed))
+            snapshot = {
+                'total': self.total,
+                'elapsed': now - self.started_at,
+                'completed': self.completed,
+                'failed': self.failed,
+                'reused': self.reused,
+                'queued': self.queued,
+                'in_flight': self.in_flight,
+                'ai_queued': self.ai_queued,
+                'ai_in_flight': self.ai_in_flight,
+                'latency': {
+                    stage: {f'p{p}': sketch.quantile(p / 100) for p in (50, 90, 99)}
+                    for stage, sketch in self.latency.items() if sketch.count
+                },
+                'score_counts': list(self.scores.counts)
+            }
+            (first_time, first_done), (last_time, last_done) = self._samples[0], self._samples[-1]
+        
+        done = snapshot['completed'] + snapshot['failed']
+        snapshot['pages_per_second'] = done / snapshot['elapsed'] if snapshot['elapsed'] > 0 else 0.0
+        if last_time > first_time:
+            snapshot['recent_pages_per_second'] = (last_done - first_done) / (last_time - first_time)
+        else:
+            snapshot['recent_pages_per_second'] = snapshot['pages_per_second']
+        
+        stats = self.scheduler.stats if self.scheduler is not None else {}
+        snapshot['retries'] = stats.get('retries', 0)
+        snapshot['rate_limited'] = stats.get('rate_limited', 0)
+        return snapshot
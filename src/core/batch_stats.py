@@ -0,0 +1,120 @@
+import re
+from typing import Dict, List, Optional
+from src.core.orchestrator import AnalysisReport
+from src.utils.sketches import ScoreHistogram, LogHistogram, HeavyHitters, BottomK
+from src.config import BATCH_STATS_TOP_RECOMMENDATIONS, BATCH_STATS_WORST_PAGES
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Summary name -> AnalysisReport attribute for module scores; keyword analysis and overall are handled separately
+MODULE_RESULTS = {
+    'technical_seo': 'technical_seo',
+    'content_analysis': 'content_analysis',
+    'structure': 'structure_analysis',
+    'links': 'link_analysis',
+    'performance': 'performance'
+}
+
+# Keyword checks counted for coverage, by KeywordScore attribute
+COVERAGE_CHECKS = ('in_title', 'in_meta', 'in_h1', 'in_headings', 'in_first_100_words')
+
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+def recommendation_key(text: str) -> str:
+    # "Increase content length to at least 300 words (currently 212)" and "... (currently 87)" are
+    # the same advice; counting them together is what makes the frequent-item counts useful
+    return _NUMBER.sub('#', text)
+
+class BatchStats:
+    # Site-level rollup built one report at a time. Every part is a fixed-size or mergeable sketch,
+    # so memory does not depend on the number of pages and stats from separate processes combine
+    # with merge().
+    def __init__(self, top_recommendations: int = BATCH_STATS_TOP_RECOMMENDATIONS,
+                 worst_pages: int = BATCH_STATS_WORST_PAGES):
+        self.pages = 0
+        self.scores: Dict[str, ScoreHistogram] = {
+            name: ScoreHistogram() for name in ('overall', 'keyword_analysis', *MODULE_RESULTS)
+        }
+        self.ttfb_ms = LogHistogram()
+        self.total_ms = LogHistogram()
+        self.recommendations = HeavyHitters(top_recommendations * 10)
+        self.keywords: Dict[str, Dict[str, int]] = {}
+        self.worst_pages = BottomK(worst_pages)
+        self.top_recommendations = top_recommendations
+    
+    def add(self, report: AnalysisReport):
+        self.pages += 1
+        self.scores['overall'].add(report.overall_score)
+        self.scores['keyword_analysis'].add(report.keyword_cluster.cluster_score)
+        for name, attribute in MODULE_RESULTS.items():
+            result = getattr(report, attribute)
+            if result is not None:
+                self.scores[name].add(result.score)
+        
+        if report.performance is not None:
+            self.ttfb_ms.add(report.performance.details.get('ttfb_ms', 0))
+            self.total_ms.add(report.performance.details.get('total_ms', 0))
+        
+        for recommendation in report.top_recommendations:
+            self.recommendations.add(recommendation_key(recommendation))
+        
+        for ks in report.keyword_cluster.individual_scores:
+            coverage = self.keywords.setdefault(ks.keyword, dict.fromkeys(('pages',) + COVERAGE_CHECKS, 0))
+            coverage['pages'] += 1
+            for check in COVERAGE_CHECKS:
+                coverage[check] += bool(getattr(ks, check))
+        
+        self.worst_pages.add(report.overall_score, report.url)
+    
+    def merge(self, other: 'BatchStats'):
+        self.pages += other.pages
+        for name, histogram in other.scores.items():
+            self.scores[name].merge(histogram)
+        self.ttfb_ms.merge(other.ttfb_ms)
+        self.total_ms.merge(other.total_ms)
+        self.recommendations.merge(other.recommendations)
+        for keyword, counts in other.keywords.items():
+            coverage = self.keywords.setdefault(keyword, dict.fromkeys(counts, 0))
+            for check, count in counts.items():
+                coverage[check] += count
+        self.worst_pages.merge(other.worst_pages)
+    
+    def module_quantiles(self) -> Dict[str, Dict[str, Optional[float]]]:
+        summary = {}
+        for name, histogram in self.scores.items():
+            if histogram.count:
+                summary[name] = {
+                    'pages': histogram.count,
+                    'mean': round(histogram.mean(), 1),
+                    **{f'p{round(q * 100)}': histogram.quantile(q) for q in QUANTILES}
+                }
+        return summary
+    
+    def timing_quantiles(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: {f'p{round(q * 100)}': round(sketch.quantile(q)) for q in QUANTILES}
+            for name, sketch in (('ttfb_ms', self.ttfb_ms), ('total_ms', self.total_ms)) if sketch.count
+        }
+    
+    def keyword_coverage(self) -> Dict[str, Dict[str, float]]:
+        # Share of pages (0-1) where each keyword passes each check
+        return {
+            keyword: {check: round(counts[check] / counts['pages'], 3) for check in COVERAGE_CHECKS}
+            for keyword, counts in self.keywords.items()
+        }
+    
+    def frequent_recommendations(self) -> List[Dict]:
+        return [
+            {'recommendation': text, 'count': count}
+            for text, count in self.recommendations.top(self.top_recommendations)
+        ]
+    
+    def to_dict(self) -> Dict:
+        return {
+            'pages': self.pages,
+            'scores': self.module_quantiles(),
+            'timings': self.timing_quantiles(),
+            'keyword_coverage': self.keyword_coverage(),
+            'top_recommendations': self.frequent_recommendations(),
+            'worst_pages': [{'url': url, 'overall_score': score} for score, url in self.worst_pages.items()]
+        }
@@ -0,0 +1,201 @@
+from array import array
+from dataclasses import replace
+from typing import Dict, List, Optional
+from src.analyzers.content_analyzer import ClusterScore, KeywordScore
+from src.core.features import PAGE_FEATURES, extract_features
+from src.core.orchestrator import AnalysisReport, is_primary_copy
+from src.core.scoring import ModuleResult
+
+# AnalysisReport module attributes, in the order their scores are stored
+MODULES = ('technical_seo', 'content_analysis', 'structure_analysis', 'link_analysis', 'performance', 'ai_analysis')
+
+# Per-page measurements kept from the details dicts (the rest of details is dropped)
+FEATURES = tuple(name for name in PAGE_FEATURES if name not in ('overall_score', 'keyword_start', 'keyword_count'))
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+# Bits of the per-keyword flags byte
+IN_TITLE, IN_META, IN_H1, IN_FIRST_100_WORDS = 1, 2, 4, 8
+
+# Bytes per keyword in CompactCluster.stats: score, flags, heading mask, distribution score
+STATS_WIDTH = 4
+
+class StringTable:
+    # Interns repeated strings (recommendations, statuses, module and keyword names) into integer
+    # IDs. One table is shared by every compact report in an aggregation; ID 0 is None.
+    __slots__ = ('_ids', '_strings')
+    
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._strings: List[Optional[str]] = [None]
+    
+    def __len__(self):
+        return len(self._strings)
+    
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+    
+    def get(self, string_id: int) -> Optional[str]:
+        return self._strings[string_id]
+    
+    def intern_all(self, values: List[str]) -> array:
+        return array('I', [self.intern(value) for value in values])
+    
+    def get_all(self, ids) -> List[str]:
+        strings = self._strings
+        return [strings[i] for i in ids]
+
+class CompactCluster:
+    __slots__ = ('name_id', 'cluster_score', 'keyword_ids', 'stats', 'density', 'recommendation_ids',
+                 'recommendation_offsets')
+    
+    def __init__(self, cluster: ClusterScore, strings: StringTable):
+        self.name_id = strings.intern(cluster.name)
+        self.cluster_score = cluster.cluster_score
+        # cluster.keywords[i] is the keyword of individual_scores[i]
+        self.keyword_ids = strings.intern_all(cluster.keywords)
+        self.stats = array('B')
+        self.density = array('d')
+        self.recommendation_ids = array('I')
+        self.recommendation_offsets = array('H', [0])
+        
+        for ks in cluster.individual_scores:
+            flags = (IN_TITLE * ks.in_title | IN_META * ks.in_meta | IN_H1 * ks.in_h1
+                     | IN_FIRST_100_WORDS * ks.in_first_100_words)
+            headings = sum(1 << HEADING_TAGS.index(tag) for tag in ks.in_headings if tag in HEADING_TAGS)
+            self.stats.extend((ks.score, flags, headings, ks.distribution_score))
+            self.density.append(ks.density)
+            self.recommendation_ids.extend(strings.intern(rec) for rec in ks.recommendations)
+            self.recommendation_offsets.append(len(self.recommendation_ids))
+    
+    def __len__(self):
+        return len(self.density)
+    
+    def keyword_scores(self) -> array:
+        return self.stats[::STATS_WIDTH]
+    
+    def to_cluster(self, strings: StringTable) -> ClusterScore:
+        keywords = strings.get_all(self.keyword_ids)
+        individual_scores = []
+        for i, keyword in enumerate(keywords):
+            score, flags, headings, distribution = self.stats[i * STATS_WIDTH:(i + 1) * STATS_WIDTH]
+            in_title, in_meta, in_h1 = bool(flags & IN_TITLE), bool(flags & IN_META), bool(flags & IN_H1)
+            in_first_100_words = bool(flags & IN_FIRST_100_WORDS)
+            in_headings = [tag for bit, tag in enumerate(HEADING_TAGS) if headings >> bit & 1]
+            density = self.density[i]
+            recommendations = self.recommendation_ids[self.recommendation_offsets[i]:self.recommendation_offsets[i + 1]]
+            individual_scores.append(KeywordScore(
+                keyword=keyword,
+                score=score,
+                in_title=in_title,
+                in_meta=in_meta,
+                in_h1=in_h1,
+                in_headings=in_headings,
+                in_first_100_words=in_first_100_words,
+                density=density,
+                distribution_score=distribution,
+                findings={
+                    'in_title': in_title,
+                    'in_meta': in_meta,
+                    'in_h1': in_h1,
+                    'in_headings': in_headings,
+                    'in_first_100_words': in_first_100_words,
+                    'density': density
+                },
+                recommendations=strings.get_all(recommendations)
+            ))
+        return ClusterScore(keywords, self.cluster_score, individual_scores, strings.get(self.name_id))
+
+class CompactReport:
+    # Scores, statuses, recommendations and the numeric page measurements of one AnalysisReport in a
+    # few typed arrays. Free-form details are not kept (report_codec is the lossless format).
+    __slots__ = ('url', 'analyzed_at', 'overall_score', 'module_scores', 'module_strings', 'recommendation_ids',
+                 'recommendation_offsets', 'features', 'clusters', 'primary_copies')
+    
+    def __init__(self, report: AnalysisReport, strings: StringTable):
+        self.url = report.url
+        self.analyzed_at = report.analyzed_at
+        self.overall_score = report.overall_score
+        # -1 marks a module that did not run
+        self.module_scores = array('b')
+        # Name and status ID pairs, per module
+        self.module_strings = array('I')
+        self.recommendation_ids = array('I')
+        # One segment per module, then the report's top recommendations
+        self.recommendation_offsets = array('H', [0])
+        
+        for name in MODULES:
+            result = getattr(report, name)
+            self.module_scores.append(result.score if result else -1)
+            self.module_strings.extend((strings.intern(result.module_name), strings.intern(result.status))
+                                       if result else (0, 0))
+            self.recommendation_ids.extend(strings.intern(rec) for rec in (result.recommendations if result else ()))
+            self.recommendation_offsets.append(len(self.recommendation_ids))
+        self.recommendation_ids.extend(strings.intern(rec) for rec in report.top_recommendations)
+        self.recommendation_offsets.append(len(self.recommendation_ids))
+        
+        page, _ = extract_features(report)
+        self.features = array('I', [page[name] for name in FEATURES])
+        # The primary cluster, then the named clusters that are not just a renamed copy of it
+        clusters = [report.keyword_cluster]
+        # Position in keyword_clusters and name ID of each renamed copy
+        self.primary_copies = array('I')
+        for index, cluster in enumerate(report.keyword_clusters):
+            if is_primary_copy(cluster, report.keyword_cluster):
+                self.primary_copies.extend((index, strings.intern(cluster.name)))
+            else:
+                clusters.append(cluster)
+        self.clusters = tuple(CompactCluster(cluster, strings) for cluster in clusters)
+    
+    def module_score(self, name: str) -> Optional[int]:
+        score = self.module_scores[MODULES.index(name)]
+        return None if score < 0 else score
+    
+    def feature(self, name: str) -> int:
+        return self.features[FEATURES.index(name)]
+    
+    def _recommendations(self, segment: int, strings: StringTable) -> List[str]:
+        offsets = self.recommendation_offsets
+        return strings.get_all(self.recommendation_ids[offsets[segment]:offsets[segment + 1]])
+    
+    def top_recommendations(self, strings: StringTable) -> List[str]:
+        return self._recommendations(len(MODULES), strings)
+    
+    def to_report(self, strings: StringTable) -> AnalysisReport:
+        clusters = [cluster.to_cluster(strings) for cluster in self.clusters]
+        keyword_clusters = clusters[1:]
+        for index, name_id in zip(self.primary_copies[::2], self.primary_copies[1::2]):
+            keyword_clusters.insert(index, replace(clusters[0], name=strings.get(name_id)))
+        modules = {}
+        for index, name in enumerate(MODULES):
+            score = self.module_scores[index]
+            if score < 0:
+                modules[name] = None
+                continue
+            name_id, status_id = self.module_strings[index * 2:index * 2 + 2]
+            modules[name] = ModuleResult(strings.get(name_id), score, strings.get(status_id), {},
+                                         self._recommendations(index, strings))
+        modules['content_analysis'].details['keyword_cluster'] = clusters[0]
+        
+        return AnalysisReport(
+            url=self.url,
+            analyzed_at=self.analyzed_at,
+            overall_score=self.overall_score,
+            keyword_cluster=clusters[0],
+            top_recommendations=self.top_recommendations(strings),
+            keyword_clusters=keyword_clusters,
+            **modules
+        )
+
+def compact_report(report: AnalysisReport, strings: StringTable) -> CompactReport:
+    return CompactReport(report, strings)
+
+def expand_report(compact: CompactReport, strings: StringTable) -> AnalysisReport:
+    # Details dicts come back empty apart from the content analyzer's keyword cluster
+    return compact.to_report(strings)
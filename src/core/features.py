@@ -0,0 +1,198 @@
+import json
+from array import array
+from typing import Dict, List, Optional, Tuple
+from src.config import SCORE_WEIGHTS, KEYWORD_SCORE_WEIGHTS
+from src.core import vector_scoring
+from src.core.scoring import (
+    DEFAULT_THRESHOLDS,
+    calculate_overall_score, calculate_keyword_score, calculate_density_score, calculate_technical_score,
+    calculate_content_score, calculate_structure_score, calculate_link_score, calculate_performance_score
+)
+
+# Column name -> array typecode. These are the raw measurements the scoring functions consume.
+PAGE_FEATURES = {
+    'title_present': 'B',
+    'title_length': 'I',
+    'meta_present': 'B',
+    'meta_length': 'I',
+    'has_canonical': 'B',
+    'og_present': 'B',
+    'og_complete': 'B',
+    'word_count': 'I',
+    'h1_count': 'H',
+    'image_count': 'I',
+    'images_without_alt': 'I',
+    'internal_links': 'I',
+    'external_links': 'I',
+    'links_checked': 'I',
+    'links_broken': 'I',
+    'links_redirected': 'I',
+    'has_timing': 'B',
+    'ttfb_ms': 'I',
+    'total_ms': 'I',
+    'decoded_bytes': 'I',
+    'compressed': 'B',
+    'redirect_count': 'H',
+    'overall_score': 'B',
+    'keyword_start': 'Q',
+    'keyword_count': 'H'
+}
+
+KEYWORD_FEATURES = {
+    'in_title': 'B',
+    'in_meta': 'B',
+    'in_h1': 'B',
+    'headings_matched': 'B',
+    'in_first_100_words': 'B',
+    'density': 'd',
+    'distribution_score': 'B'
+}
+
+MODULE_SCORES = ('keyword_analysis', 'technical_seo', 'content_analysis', 'structure', 'links', 'performance', 'overall')
+
+def extract_features(report) -> Tuple[Dict, List[Dict]]:
+    technical = report.technical_seo.details
+    structure = report.structure_analysis.details
+    links = report.link_analysis.details
+    health = links.get('health', {})
+    timing = report.performance.details if report.performance else {}
+    
+    page = {
+        'title_present': int(technical['title']['present']),
+        'title_length': technical['title'].get('length', 0),
+        'meta_present': int(technical['meta_description']['present']),
+        'meta_length': technical['meta_description'].get('length', 0),
+        'has_canonical': int(technical['canonical']['present']),
+        'og_present': int(technical['open_graph']['present']),
+        'og_complete': int(technical['open_graph']['complete']),
+        'word_count': report.content_analysis.details['word_count'],
+        'h1_count': structure['h1']['count'],
+        'image_count': structure['images']['total'],
+        'images_without_alt': structure['images']['without_alt'],
+        'internal_links': links['internal_links']['count'],
+        'external_links': links['external_links']['count'],
+        'links_checked': health.get('checked', 0),
+        'links_broken': len(health.get('broken', [])),
+        'links_redirected': len(health.get('redirects', [])),
+        'has_timing': int(bool(timing)),
+        'ttfb_ms': timing.get('ttfb_ms', 0),
+        'total_ms': timing.get('total_ms', 0),
+        'decoded_bytes': timing.get('decoded_bytes', 0),
+        'compressed': int(bool(timing.get('compression'))),
+        'redirect_count': len(timing.get('redirects', [])),
+        'overall_score': report.overall_score
+    }
+    
+    keywords = [{
+        'in_title': int(ks.in_title),
+        'in_meta': int(ks.in_meta),
+        'in_h1': int(ks.in_h1),
+        'headings_matched': len(ks.in_headings),
+        'in_first_100_words': int(ks.in_first_100_words),
+        'density': ks.density,
+        'distribution_score': ks.distribution_score
+    } for ks in report.keyword_cluster.individual_scores]
+    
+    return page, keywords
+
+def load_weights_profile(path: str) -> Tuple[Dict, Dict, Dict]:
+    # Profiles only need to list the values they change, everything else keeps the config defaults
+    with open(path, 'r', encoding='utf-8') as f:
+        profile = json.load(f)
+    
+    merged = []
+    for section, defaults in (('score_weights', SCORE_WEIGHTS), ('keyword_score_weights', KEYWORD_SCORE_WEIGHTS),
+                              ('thresholds', DEFAULT_THRESHOLDS)):
+        values = profile.get(section, {})
+        unknown = set(values) - set(defaults)
+        if unknown:
+            raise ValueError(f"Unknown {section} in {path}: {', '.join(sorted(unknown))}")
+        merged.append({**defaults, **values})
+    
+    unknown_sections = set(profile) - {'score_weights', 'keyword_score_weights', 'thresholds'}
+    if unknown_sections:
+        raise ValueError(f"Unknown sections in {path}: {', '.join(sorted(unknown_sections))}")
+    
+    return tuple(merged)
+
+def rescore(
+    pages: Dict[str, array],
+    keywords: Dict[str, array],
+    weights: Optional[Dict[str, float]] = None,
+    keyword_weights: Optional[Dict[str, float]] = None,
+    thresholds: Optional[Dict] = None,
+    vectorized: Optional[bool] = None
+) -> Dict[str, array]:
+    if vectorized is None:
+        vectorized = vector_scoring.is_available()
+    
+    if vectorized:
+        scores = vector_scoring.rescore_arrays(pages, keywords, weights, keyword_weights, thresholds)
+        return {name: array('B', values.astype('uint8').tobytes()) for name, values in scores.items()}
+    
+    return rescore_scalar(pages, keywords, weights, keyword_weights, thresholds)
+
+def rescore_scalar(
+    pages: Dict[str, array],
+    keywords: Dict[str, array],
+    weights: Optional[Dict[str, float]] = None,
+    keyword_weights: Optional[Dict[str, float]] = None,
+    thresholds: Optional[Dict] = None
+) -> Dict[str, array]:
+    rows = len(pages['overall_score'])
+    scores = {name: array('B', bytes(rows)) for name in MODULE_SCORES}
+    
+    kw_title, kw_meta, kw_h1 = keywords['in_title'], keywords['in_meta'], keywords['in_h1']
+    kw_headings, kw_first, kw_density = keywords['headings_matched'], keywords['in_first_100_words'], keywords['density']
+    kw_distribution = keywords['distribution_score']
+    
+    for i in range(rows):
+        start = pages['keyword_start'][i]
+        count = pages['keyword_count'][i]
+        
+        keyword_total = 0
+        density_total = 0.0
+        for k in range(start, start + count):
+            density = kw_density[k]
+            keyword_total += calculate_keyword_score(
+                in_title=kw_title[k],
+                in_meta=kw_meta[k],
+                in_h1=kw_h1[k],
+                in_headings=kw_headings[k],
+                in_first_100_words=kw_first[k],
+                density_score=calculate_density_score(density, thresholds),
+                distribution_score=kw_distribution[k],
+                weights=keyword_weights
+            )
+            density_total += density
+        
+        keyword_score = int(keyword_total / count) if count else 0
+        technical_score = calculate_technical_score(
+            pages['title_present'][i], pages['title_length'][i],
+            pages['meta_present'][i], pages['meta_length'][i],
+            pages['has_canonical'][i], pages['og_present'][i], pages['og_complete'][i],
+            thresholds
+        )
+        content_score = calculate_content_score(pages['word_count'][i], density_total / count if count else 0, thresholds)
+        structure_score = calculate_structure_score(pages['h1_count'][i], pages['images_without_alt'][i])
+        link_score = calculate_link_score(
+            pages['internal_links'][i], pages['external_links'][i], thresholds,
+            pages['links_checked'][i], pages['links_broken'][i], pages['links_redirected'][i]
+        )
+        
+        performance_score = calculate_performance_score(
+            pages['ttfb_ms'][i], pages['total_ms'][i], pages['decoded_bytes'][i], pages['compressed'][i],
+            pages['redirect_count'][i], thresholds
+        ) if pages['has_timing'][i] else None
+        
+        scores['keyword_analysis'][i] = keyword_score
+        scores['technical_seo'][i] = technical_score
+        scores['content_analysis'][i] = content_score
+        scores['structure'][i] = structure_score
+        scores['links'][i] = link_score
+        scores['performance'][i] = performance_score or 0
+        scores['overall'][i] = calculate_overall_score(
+            keyword_score, technical_score, content_score, structure_score, link_score, weights, performance_score
+        )
+    
+    return scores
@@ -0,0 +1,135 @@
+import time
+import socket
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+try:
+    from urllib3.exceptions import NameResolutionError
+except ImportError:
+    # urllib3 1.x, where the timed connections are not used
+    NameResolutionError = None
+
+HTTP_VERSIONS = {10: 'HTTP/1.0', 11: 'HTTP/1.1', 20: 'HTTP/2'}
+
+# The timed connections replace urllib3 2.x's HTTPConnection._new_conn, which reads private
+# attributes (_dns_host, socket_options, source_address). On another major version the plain
+# pools are used and DNS, connect and TLS times stay at zero.
+TIMED_CONNECTIONS = urllib3.__version__.split('.')[0] == '2'
+
+@dataclass
+class FetchTiming:
+    status_code: int = 0
+    final_url: str = ''
+    http_version: Optional[str] = None
+    dns_ms: float = 0.0
+    connect_ms: float = 0.0
+    tls_ms: float = 0.0
+    ttfb_ms: float = 0.0
+    download_ms: float = 0.0
+    total_ms: float = 0.0
+    transfer_bytes: int = 0
+    decoded_bytes: int = 0
+    compression: Optional[str] = None
+    redirects: List[Dict] = field(default_factory=list)
+
+_local = threading.local()
+
+def current_timing() -> Optional[FetchTiming]:
+    return getattr(_local, 'timing', None)
+
+@contextmanager
+def record_timing(timing: FetchTiming):
+    # Connections are opened on the requesting thread, so they find the timing to fill in here
+    previous = current_timing()
+    _local.timing = timing
+    try:
+        yield timing
+    finally:
+        _local.timing = previous
+
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        timing = current_timing()
+        if timing is None:
+            return super()._new_conn()
+        
+        # Same exceptions as urllib3's own _new_conn, so a failed connect is reported once and at the same layer
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host.strip('[]'), self.port, allowed_gai_family(),
+                                           socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        resolved = time.perf_counter()
+        
+        try:
+            sock = self._connect_any(addresses)
+        except socket.timeout as e:
+            raise ConnectTimeoutError(
+                self, f'Connection to {self.host} timed out. (connect timeout={self.timeout})'
+            ) from e
+        except OSError as e:
+            raise NewConnectionError(self, f'Failed to establish a new connection: {e}') from e
+        
+        timing.dns_ms += (resolved - started) * 1000
+        timing.connect_ms += (time.perf_counter() - resolved) * 1000
+        return sock
+    
+    def _connect_any(self, addresses) -> socket.socket:
+        # Tries each resolved address in turn and raises the last error if none connects
+        error: OSError = OSError('getaddrinfo returned no addresses')
+        for family, socktype, proto, _, address in addresses:
+            sock = socket.socket(family, socktype, proto)
+            try:
+                for option in self.socket_options or []:
+                    sock.setsockopt(*option)
+                if isinstance(self.timeout, (int, float)):
+                    sock.settimeout(self.timeout)
+                if self.source_address:
+                    sock.bind(self.source_address)
+                sock.connect(address)
+                return sock
+            except OSError as e:
+                error = e
+                sock.close()
+        raise error
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        timing = current_timing()
+        if timing is None:
+            return super().connect()
+        
+        started = time.perf_counter()
+        before = timing.dns_ms + timing.connect_ms
+        super().connect()
+        # Whatever the handshake took beyond DNS and TCP connect was spent on TLS
+        elapsed = (time.perf_counter() - started) * 1000
+        timing.tls_ms += max(0.0, elapsed - (timing.dns_ms + timing.connect_ms - before))
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        if not TIMED_CONNECTIONS:
+            return
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool
+        }
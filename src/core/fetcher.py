@@ -1,21 +1,41 @@
+import time
 import requests
+from dataclasses import dataclass
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 from src.config import REQUEST_TIMEOUT, USER_AGENT
+from src.utils.url_utils import resolve_url, site_host
+from src.core.fetch_timing import FetchTiming, TimedHTTPAdapter, record_timing, HTTP_VERSIONS
+from src.utils.spans import span
 
 class WebContent:
-    def __init__(self, url: str, html: str, soup: BeautifulSoup):
+    # Everything the analyzers need is extracted up front. Neither the HTML nor the parse tree is
+    # kept, so a page's soup can be freed as soon as the caller drops it instead of living as long
+    # as the content (through AI analysis and the batch queues).
+    def __init__(self, url: str, html: str, soup: BeautifulSoup, final_url: Optional[str] = None):
         self.url = url
-        self.html = html
+        # Where the page was served from after redirects; links are classified against its host
+        self.final_url = final_url or url
         self.soup = soup
-        self.title = self._extract_title()
-        self.meta_description = self._extract_meta_description()
-        self.h1 = self._extract_h1()
-        self.headings = self._extract_headings()
-        self.body_text = self._extract_body_text()
-        self.images = self._extract_images()
-        self.links = self._extract_links()
+        with span('extract.meta'):
+            self.base_url = self._extract_base_url()
+            self.title = self._extract_title()
+            self.meta_description = self._extract_meta_description()
+            self.h1 = self._extract_h1()
+            self.canonical = self._extract_canonical()
+            self.og_title = self._extract_meta_property('og:title')
+            self.og_description = self._extract_meta_property('og:description')
+        with span('extract.headings'):
+            self.headings = self._extract_headings()
+        # Links and images come first: extracting the body text removes nav, header and footer
+        with span('extract.images'):
+            self.images = self._extract_images()
+        with span('extract.links'):
+            self.links = self._extract_links()
+        with span('extract.body_text'):
+            self.body_text = self._extract_body_text()
         self.word_count = len(self.body_text.split())
+        self.soup = None
     
     def _extract_title(self) -> Optional[str]:
         title_tag = self.soup.find('title')
@@ -29,6 +49,21 @@ class WebContent:
         h1_tag = self.soup.find('h1')
         return h1_tag.get_text().strip() if h1_tag else None
     
+    def _extract_canonical(self) -> Optional[str]:
+        # The canonical href ('' when the tag has none), or None without a canonical tag
+        canonical = self.soup.find('link', rel='canonical')
+        return canonical.get('href', '') if canonical else None
+    
+    def _extract_base_url(self) -> str:
+        # Relative URLs resolve against <base href> when the page has one, itself relative to the final URL
+        base = self.soup.find('base', href=True)
+        resolved = resolve_url(self.final_url, base['href']) if base is not None else None
+        return resolved or self.final_url
+    
+    def _extract_meta_property(self, name: str) -> Optional[str]:
+        meta = self.soup.find('meta', property=name)
+        return meta.get('content', '') if meta else None
+    
     def _extract_headings(self) -> Dict[str, List[str]]:
         headings = {}
         for i in range(1, 7):
@@ -49,6 +84,8 @@ class WebContent:
         for img in self.soup.find_all('img'):
             images.append({
                 'src': img.get('src', ''),
+                # None for inline data: URIs, which have nothing to fetch
+                'url': resolve_url(self.base_url, img.get('src', '')),
                 'alt': img.get('alt', ''),
                 'has_alt': bool(img.get('alt', '').strip())
             })
@@ -56,28 +93,85 @@ class WebContent:
     
     def _extract_links(self) -> List[Dict]:
         links = []
+        page_host = site_host(self.final_url)
         for link in self.soup.find_all('a', href=True):
             href = link['href']
-            is_internal = not href.startswith(('http://', 'https://')) or self.url in href
+            url = resolve_url(self.base_url, href)
+            # Non-web links (mailto:, tel:, javascript:) are neither internal nor external
+            is_internal = url is not None and site_host(url) == page_host
             links.append({
                 'href': href,
+                'url': url,
                 'text': link.get_text().strip(),
                 'is_internal': is_internal,
-                'is_external': not is_internal,
+                'is_external': url is not None and not is_internal,
                 'nofollow': 'nofollow' in link.get('rel', [])
             })
         return links
 
-def fetch_content(url: str) -> WebContent:
+@dataclass
+class RawPage:
+    url: str
+    # Both None once released
+    html: Optional[str]
+    content: Optional[bytes]
+    timing: Optional[FetchTiming] = None
+    
+    def release(self):
+        # Drops the decoded and raw body once the page has been parsed and fingerprinted, so a page
+        # waiting in the batch queues holds neither copy
+        self.html = None
+        self.content = None
+
+def create_session(pool_size: int) -> requests.Session:
+    # Pooled keep-alive connections for helpers that make many small requests from worker threads
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+@span('fetch')
+def download_page(url: str) -> RawPage:
     headers = {'User-Agent': USER_AGENT}
+    timing = FetchTiming()
     
     try:
-        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
+        # A fresh session per page, like requests.get, so every page pays (and reports) its own connection setup
+        with requests.Session() as session, record_timing(timing):
+            adapter = TimedHTTPAdapter()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            
+            started = time.perf_counter()
+            response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True)
+            timing.ttfb_ms = (time.perf_counter() - started) * 1000
+            response.raise_for_status()
+            content = response.content
+            timing.total_ms = (time.perf_counter() - started) * 1000
         
-        soup = BeautifulSoup(response.content, 'lxml')
+        timing.download_ms = timing.total_ms - timing.ttfb_ms
+        timing.status_code = response.status_code
+        timing.final_url = response.url
+        timing.http_version = HTTP_VERSIONS.get(getattr(response.raw, 'version', None))
+        timing.transfer_bytes = response.raw.tell()
+        timing.decoded_bytes = len(content)
+        timing.compression = response.headers.get('Content-Encoding', '').lower() or None
+        timing.redirects = [{'url': hop.url, 'status': hop.status_code} for hop in response.history]
         
-        return WebContent(url, response.text, soup)
+        return RawPage(url, response.text, content, timing)
     
     except requests.exceptions.RequestException as e:
         raise Exception(f"Failed to fetch URL: {str(e)}")
+
+def parse_page(page: RawPage) -> WebContent:
+    if page.content is None:
+        raise ValueError(f'{page.url} was already released and cannot be parsed again')
+    with span('parse'):
+        soup = BeautifulSoup(page.content, 'lxml')
+    with span('extract'):
+        return WebContent(page.url, page.html, soup, page.timing.final_url if page.timing else None)
+
+def fetch_content(url: str) -> WebContent:
+    return parse_page(download_page(url))
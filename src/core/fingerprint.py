@@ -0,0 +1,83 @@
+import os
+import re
+import json
+import hashlib
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import src.config as config
+
+SRC_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules whose code decides the non-AI ModuleResults, relative to src/. core/fetcher.py holds the
+# WebContent extraction, utils/url_utils.py the link resolution and internal/external split.
+ANALYSIS_SOURCES = (
+    'analyzers',
+    'core/fetcher.py',
+    'core/keyword_processor.py',
+    'core/orchestrator.py',
+    'core/scoring.py',
+    'utils/text_utils.py',
+    'utils/url_utils.py',
+)
+
+# Settings that only affect how a run is executed, not what it scores
+RUNTIME_CONFIG_PREFIXES = ('LLM_', 'BATCH_', 'STORE_', 'REQUEST_', 'USER_AGENT', 'AI_', 'LINK_CHECK_', 'IMAGE_PROBE_',
+                           'HTTP2_', 'DASHBOARD_', 'METRICS_', 'MEMPROFILE_')
+
+VOLATILE_PATTERNS = [
+    # Hidden form fields and meta tags carrying CSRF or session tokens
+    (re.compile(r'<input\b[^>]*\bname\s*=\s*["\']?[^"\'>\s]*(csrf|token|nonce|authenticity|__viewstate|__eventvalidation)[^>]*>',
+                re.IGNORECASE), ''),
+    (re.compile(r'<meta\b[^>]*\bname\s*=\s*["\']?[^"\'>\s]*(csrf|token|nonce)[^>]*>', re.IGNORECASE), ''),
+    # CSP nonces and integrity hashes rotate per response or per deploy
+    (re.compile(r'\s(nonce|integrity)\s*=\s*("[^"]*"|\'[^\']*\'|[^\s>]+)', re.IGNORECASE), ''),
+    # Comments often hold build ids, render times or cache hints
+    (re.compile(r'<!--.*?-->', re.DOTALL), ''),
+    # ISO 8601 timestamps and HTTP style dates
+    (re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?'), 'TIMESTAMP'),
+    (re.compile(r'\b(Mon|Tue|Wed|Thu|Fri|Sat|Sun), \d{2} \w{3} \d{4} \d{2}:\d{2}:\d{2} GMT\b'), 'TIMESTAMP'),
+    # Cache busting query parameters on assets
+    (re.compile(r'([?&])(v|ver|version|t|ts|_|cb|cachebust)=[\w.-]*', re.IGNORECASE), r'\1'),
+]
+
+def normalize_html(html: str) -> str:
+    for pattern, replacement in VOLATILE_PATTERNS:
+        html = pattern.sub(replacement, html)
+    return ' '.join(html.split())
+
+def page_fingerprint(html: str) -> str:
+    return hashlib.sha256(normalize_html(html).encode('utf-8')).hexdigest()
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    digest = hashlib.sha256()
+    for relative in ANALYSIS_SOURCES:
+        path = os.path.join(SRC_ROOT, relative)
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.py'))
+        else:
+            files = [path]
+        
+        for file_path in files:
+            digest.update(os.path.relpath(file_path, SRC_ROOT).encode('utf-8'))
+            with open(file_path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+def config_version() -> str:
+    settings = {
+        name: value for name, value in vars(config).items()
+        if name.isupper() and not name.startswith(RUNTIME_CONFIG_PREFIXES)
+    }
+    payload = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def analysis_signature(keywords: List[str], clusters: Optional[List[Tuple[str, List[str]]]] = None) -> str:
+    # Stored results are only reusable when the code, thresholds and keywords all match
+    payload = json.dumps({
+        'code': code_version(),
+        'config': config_version(),
+        'keywords': [keyword.strip().lower() for keyword in keywords],
+        'clusters': [[name, [keyword.strip().lower() for keyword in words]] for name, words in clusters or []]
+    })
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
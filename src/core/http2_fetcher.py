@@ -0,0 +1,95 @@
+import time
+import importlib.util
+from typing import Optional
+from src.core.fetch_timing import FetchTiming
+from src.core.fetcher import RawPage
+from src.utils.spans import span
+from src.config import REQUEST_TIMEOUT, USER_AGENT, HTTP2_MAX_CONNECTIONS
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+TRACED_PHASES = {'connect_tcp': 'connect_ms', 'start_tls': 'tls_ms'}
+
+def is_available() -> bool:
+    return httpx is not None and importlib.util.find_spec('h2') is not None
+
+def _require_http2():
+    if not is_available():
+        raise ImportError("HTTP/2 fetching requires httpx with h2 (pip install 'httpx[http2]')")
+
+def accept_encoding() -> str:
+    # Only advertise codecs httpx can actually decode in this environment
+    codecs = []
+    if importlib.util.find_spec('zstandard'):
+        codecs.append('zstd')
+    if importlib.util.find_spec('brotli') or importlib.util.find_spec('brotlicffi'):
+        codecs.append('br')
+    return ', '.join(codecs + ['gzip', 'deflate'])
+
+class _TimingTrace:
+    # httpcore reports connection phases through the request's trace extension. It resolves DNS
+    # inside connect_tcp, so lookups are counted as connect time here.
+    def __init__(self, timing: FetchTiming):
+        self.timing = timing
+        self.started = {}
+    
+    def __call__(self, event: str, info: dict):
+        parts = event.split('.')
+        if len(parts) != 3 or parts[1] not in TRACED_PHASES:
+            return
+        
+        _, phase, stage = parts
+        field = TRACED_PHASES[phase]
+        if stage == 'started':
+            self.started[phase] = time.perf_counter()
+        elif phase in self.started:
+            elapsed = (time.perf_counter() - self.started.pop(phase)) * 1000
+            setattr(self.timing, field, getattr(self.timing, field) + elapsed)
+
+class Http2Fetcher:
+    # One fetcher is shared by a whole batch, so every page on an origin is a stream on the same
+    # connection instead of a fresh TCP and TLS handshake per page
+    def __init__(self, timeout: float = REQUEST_TIMEOUT, max_connections: int = HTTP2_MAX_CONNECTIONS,
+                 client: Optional['httpx.Client'] = None):
+        if client is None:
+            _require_http2()
+        self.client = client or httpx.Client(
+            http2=True,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={'User-Agent': USER_AGENT, 'Accept-Encoding': accept_encoding()}
+        )
+    
+    def close(self):
+        self.client.close()
+    
+    @span('fetch')
+    def download(self, url: str) -> RawPage:
+        timing = FetchTiming()
+        
+        try:
+            started = time.perf_counter()
+            with self.client.stream('GET', url, extensions={'trace': _TimingTrace(timing)}) as response:
+                timing.ttfb_ms = (time.perf_counter() - started) * 1000
+                response.raise_for_status()
+                # iter_bytes decompresses each chunk as it arrives rather than buffering the encoded body
+                content = b''.join(response.iter_bytes())
+                timing.total_ms = (time.perf_counter() - started) * 1000
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to fetch URL: {str(e)}")
+        
+        timing.download_ms = timing.total_ms - timing.ttfb_ms
+        timing.status_code = response.status_code
+        timing.final_url = str(response.url)
+        timing.http_version = response.http_version
+        timing.transfer_bytes = response.num_bytes_downloaded
+        timing.decoded_bytes = len(content)
+        timing.compression = response.headers.get('Content-Encoding', '').lower() or None
+        timing.redirects = [{'url': str(hop.url), 'status': hop.status_code} for hop in response.history]
+        
+        html = content.decode(response.encoding or 'utf-8', errors='replace')
+        return RawPage(url, html, content, timing)
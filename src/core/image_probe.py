@@ -0,0 +1,209 @@
+import re
+import time
+import struct
+import requests
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+from src.core.fetcher import create_session
+from src.utils.concurrency import TTLCache, HostThrottle
+from src.config import (
+    IMAGE_PROBE_WORKERS, IMAGE_PROBE_TIMEOUT, IMAGE_PROBE_BYTES, IMAGE_PROBE_CACHE_TTL, IMAGE_PROBE_PER_HOST
+)
+
+CONTENT_TYPE_FORMATS = {
+    'image/jpeg': 'jpeg',
+    'image/jpg': 'jpeg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+    'image/avif': 'avif',
+    'image/svg+xml': 'svg',
+    'image/bmp': 'bmp',
+    'image/x-icon': 'ico',
+    'image/vnd.microsoft.icon': 'ico'
+}
+
+# JPEG start-of-frame markers carry the dimensions; C4, C8 and CC are other segment types
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+CONTENT_RANGE_PATTERN = re.compile(r'bytes\s+\d+-\d+/(\d+)')
+
+@dataclass
+class ImageInfo:
+    url: str
+    status_code: Optional[int]
+    ok: bool
+    bytes: Optional[int] = None
+    format: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+def sniff_format(head: bytes, content_type: str = '') -> Optional[str]:
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if head.startswith(b'\xff\xd8'):
+        return 'jpeg'
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+    if head[4:8] == b'ftyp' and head[8:12] in (b'avif', b'avis'):
+        return 'avif'
+    if head.startswith(b'BM'):
+        return 'bmp'
+    if head.startswith(b'\x00\x00\x01\x00'):
+        return 'ico'
+    if b'<svg' in head[:1024].lower():
+        return 'svg'
+    
+    return CONTENT_TYPE_FORMATS.get(content_type.split(';')[0].strip().lower())
+
+def image_dimensions(head: bytes, image_format: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    # Every supported raster format keeps its size in the first few bytes (JPEG after any EXIF
+    # block), so a range request for the start of the file is enough
+    try:
+        if image_format == 'png' and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if image_format == 'gif':
+            return struct.unpack('<HH', head[6:10])
+        if image_format == 'bmp':
+            width, height = struct.unpack('<ii', head[18:26])
+            return width, abs(height)
+        if image_format == 'jpeg':
+            return _jpeg_dimensions(head)
+        if image_format == 'webp':
+            return _webp_dimensions(head)
+        if image_format == 'avif':
+            index = head.find(b'ispe')
+            if index != -1:
+                return struct.unpack('>II', head[index + 8:index + 16])
+    except struct.error:
+        pass
+    
+    return None, None
+
+def _jpeg_dimensions(head: bytes) -> Tuple[Optional[int], Optional[int]]:
+    index = 2
+    while index + 9 <= len(head):
+        if head[index] != 0xFF:
+            return None, None
+        marker = head[index + 1]
+        if marker == 0xFF:
+            index += 1
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', head[index + 5:index + 9])
+            return width, height
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            index += 2
+            continue
+        index += 2 + struct.unpack('>H', head[index + 2:index + 4])[0]
+    
+    return None, None
+
+def _webp_dimensions(head: bytes) -> Tuple[Optional[int], Optional[int]]:
+    chunk = head[12:16]
+    if chunk == b'VP8 ' and head[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and head[20:21] == b'\x2f':
+        bits = struct.unpack('<I', head[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        width = int.from_bytes(head[24:27], 'little') + 1
+        height = int.from_bytes(head[27:30], 'little') + 1
+        return width, height
+    
+    return None, None
+
+class ImageProber:
+    # Like LinkChecker, one prober is shared by a whole run so an image used on many pages
+    # (logos, icons, hero banners) is only requested once
+    def __init__(
+        self,
+        workers: int = IMAGE_PROBE_WORKERS,
+        timeout: float = IMAGE_PROBE_TIMEOUT,
+        probe_bytes: int = IMAGE_PROBE_BYTES,
+        cache: Optional[TTLCache] = None,
+        throttle: Optional[HostThrottle] = None,
+        session: Optional[requests.Session] = None
+    ):
+        self.timeout = timeout
+        self.probe_bytes = probe_bytes
+        self.cache = cache or TTLCache(IMAGE_PROBE_CACHE_TTL)
+        self.throttle = throttle or HostThrottle(IMAGE_PROBE_PER_HOST)
+        self.session = session or create_session(workers)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image-probe')
+    
+    def close(self):
+        self._pool.shutdown(wait=True)
+        self.session.close()
+    
+    def probe(self, url: str) -> ImageInfo:
+        return self.cache.get_or_compute(url, lambda: self._probe(url))
+    
+    def probe_many(self, urls: Iterable[str]) -> Dict[str, ImageInfo]:
+        unique = list(dict.fromkeys(url for url in urls if url))
+        return dict(zip(unique, self._pool.map(self.probe, unique)))
+    
+    def _probe(self, url: str) -> ImageInfo:
+        started = time.perf_counter()
+        headers = {'Range': f'bytes=0-{self.probe_bytes - 1}'}
+        
+        try:
+            with self.throttle.slot(urlsplit(url).netloc.lower()):
+                with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                    head = self._read_head(response)
+        except requests.exceptions.RequestException as e:
+            return ImageInfo(url, None, False, error=str(e),
+                             elapsed_ms=(time.perf_counter() - started) * 1000)
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if response.status_code >= 400:
+            return ImageInfo(url, response.status_code, False, error=response.reason, elapsed_ms=elapsed_ms)
+        
+        image_format = sniff_format(head, response.headers.get('Content-Type', ''))
+        width, height = image_dimensions(head, image_format)
+        
+        return ImageInfo(
+            url=url,
+            status_code=response.status_code,
+            ok=True,
+            bytes=self._total_size(response, head),
+            format=image_format,
+            width=width,
+            height=height,
+            elapsed_ms=elapsed_ms
+        )
+    
+    def _read_head(self, response: requests.Response) -> bytes:
+        # Servers that ignore Range send the whole file, so stop reading once the header bytes are in
+        head = bytearray()
+        if response.status_code < 400:
+            for chunk in response.iter_content(chunk_size=8192):
+                head += chunk
+                if len(head) >= self.probe_bytes:
+                    break
+        return bytes(head[:self.probe_bytes])
+    
+    def _total_size(self, response: requests.Response, head: bytes) -> Optional[int]:
+        if response.status_code == 206:
+            match = CONTENT_RANGE_PATTERN.match(response.headers.get('Content-Range', ''))
+            if match:
+                return int(match.group(1))
+        
+        length = response.headers.get('Content-Length')
+        if response.status_code == 200 and length and 'Content-Encoding' not in response.headers:
+            try:
+                return int(length)
+            except ValueError:
+                # A malformed or repeated header ('abc', '123, 123') counts as missing
+                pass
+        
+        # Small files fit entirely inside the probe
+        if len(head) < self.probe_bytes:
+            return len(head)
+        return None
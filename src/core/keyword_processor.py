@@ -1,6 +1,8 @@
-from typing import List, Dict
+from typing import List, Dict, Union
 from dataclasses import dataclass
+from functools import cached_property
 from src.utils.text_utils import normalize_text, tokenize, remove_stop_words, stem_words, stem_word
+from src.utils.spans import span
 
 @dataclass
 class KeywordVariation:
@@ -33,11 +35,23 @@ def process_keyword(keyword: str) -> KeywordVariation:
         stop_words_removed=stop_words_removed
     )
 
-def match_keyword_in_text(keyword_variation: KeywordVariation, text: str) -> bool:
-    if not text:
+class PreparedText:
+    # Normalized and stemmed forms of a page field, so many keywords can be matched against it
+    # without re-tokenizing and re-stemming the same text each time
+    def __init__(self, text: str):
+        self.text = text or ''
+        self.normalized = normalize_text(self.text)
+    
+    @cached_property
+    def stemmed(self) -> str:
+        return ' '.join(stem_words(tokenize(self.normalized)))
+
+def match_keyword_in_text(keyword_variation: KeywordVariation, text: Union[str, PreparedText]) -> bool:
+    prepared = text if isinstance(text, PreparedText) else PreparedText(text)
+    if not prepared.text:
         return False
     
-    text_normalized = normalize_text(text)
+    text_normalized = prepared.normalized
     
     if keyword_variation.original.lower() in text_normalized:
         return True
@@ -45,14 +59,11 @@ def match_keyword_in_text(keyword_variation: KeywordVariation, text: str) -> boo
     if keyword_variation.stop_words_removed and keyword_variation.stop_words_removed in text_normalized:
         return True
     
-    text_words = tokenize(text_normalized)
-    text_stemmed_words = stem_words(text_words)
-    text_stemmed = ' '.join(text_stemmed_words)
-    
-    if keyword_variation.stemmed and keyword_variation.stemmed in text_stemmed:
+    if keyword_variation.stemmed and keyword_variation.stemmed in prepared.stemmed:
         return True
     
     return False
 
+@span('keywords')
 def process_keywords(keywords: List[str]) -> List[KeywordVariation]:
     return [process_keyword(kw) for kw in keywords]
@@ -0,0 +1,106 @@
+import time
+import requests
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlsplit
+from src.core.fetcher import create_session
+from src.utils.concurrency import TTLCache, HostThrottle
+from src.config import (
+    LINK_CHECK_WORKERS, LINK_CHECK_TIMEOUT, LINK_CHECK_CACHE_TTL, LINK_CHECK_PER_HOST,
+    LINK_CHECK_HOST_INTERVAL, LINK_CHECK_MAX_REDIRECTS
+)
+
+@dataclass
+class LinkStatus:
+    url: str
+    status_code: Optional[int]
+    ok: bool
+    final_url: str
+    redirects: List[Dict] = field(default_factory=list)
+    method: str = 'HEAD'
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+class LinkChecker:
+    # One checker is shared by every page in a run so repeated nav and footer links are only
+    # requested once, and per-host limits apply across pages
+    def __init__(
+        self,
+        workers: int = LINK_CHECK_WORKERS,
+        timeout: float = LINK_CHECK_TIMEOUT,
+        cache: Optional[TTLCache] = None,
+        throttle: Optional[HostThrottle] = None,
+        max_redirects: int = LINK_CHECK_MAX_REDIRECTS,
+        session: Optional[requests.Session] = None
+    ):
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.cache = cache or TTLCache(LINK_CHECK_CACHE_TTL)
+        self.throttle = throttle or HostThrottle(LINK_CHECK_PER_HOST, LINK_CHECK_HOST_INTERVAL)
+        self.session = session or create_session(workers)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='link-check')
+    
+    def close(self):
+        self._pool.shutdown(wait=True)
+        self.session.close()
+    
+    def check(self, url: str) -> LinkStatus:
+        return self.cache.get_or_compute(url, lambda: self._check(url))
+    
+    def check_many(self, urls: Iterable[str]) -> Dict[str, LinkStatus]:
+        unique = list(dict.fromkeys(url for url in urls if url))
+        return dict(zip(unique, self._pool.map(self.check, unique)))
+    
+    def _check(self, url: str) -> LinkStatus:
+        started = time.perf_counter()
+        redirects = []
+        current = url
+        method = 'HEAD'
+        
+        try:
+            for _ in range(self.max_redirects + 1):
+                response = self._request(method, current)
+                if method == 'HEAD' and response.status_code >= 400:
+                    # Plenty of servers reject or mishandle HEAD, so confirm failures with GET
+                    method = 'GET'
+                    response = self._request(method, current)
+                
+                location = response.headers.get('Location')
+                if response.is_redirect and location:
+                    redirects.append({'url': current, 'status': response.status_code})
+                    current = urljoin(current, location)
+                    continue
+                
+                return LinkStatus(
+                    url=url,
+                    status_code=response.status_code,
+                    ok=response.status_code < 400,
+                    final_url=current,
+                    redirects=redirects,
+                    method=method,
+                    elapsed_ms=(time.perf_counter() - started) * 1000
+                )
+            
+            error = f'More than {self.max_redirects} redirects'
+        except requests.exceptions.RequestException as e:
+            error = str(e)
+        
+        return LinkStatus(
+            url=url,
+            status_code=None,
+            ok=False,
+            final_url=current,
+            redirects=redirects,
+            method=method,
+            error=error,
+            elapsed_ms=(time.perf_counter() - started) * 1000
+        )
+    
+    def _request(self, method: str, url: str) -> requests.Response:
+        with self.throttle.slot(urlsplit(url).netloc.lower()):
+            response = self.session.request(method, url, allow_redirects=False, timeout=self.timeout,
+                                            stream=method == 'GET')
+            # Only the status line and headers matter, never download the body
+            response.close()
+            return response
@@ -0,0 +1,208 @@
+import threading
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+from src.utils.url_utils import normalize_url
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-6
+PAGERANK_MAX_ITERATIONS = 100
+
+@dataclass
+class PageLinkStats:
+    url: str
+    crawled: bool
+    in_links: int
+    out_links: int
+    depth: Optional[int]
+    pagerank: float
+    orphan: bool
+
+class LinkGraph:
+    # Internal link graph for one site. URLs are mapped to integer ids and edges kept in flat
+    # arrays, then compacted into CSR (offsets + targets) for traversal and PageRank.
+    def __init__(self, root_url: Optional[str] = None):
+        self.root_url = normalize_url(root_url) if root_url else None
+        self.urls: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._crawled = set()
+        self._sources = array('I')
+        self._targets = array('I')
+        self._lock = threading.Lock()
+        self._csr = None
+    
+    def __len__(self) -> int:
+        return len(self.urls)
+    
+    @property
+    def edge_count(self) -> int:
+        return len(self._sources)
+    
+    def add_page(self, url: str, links: Iterable[Dict]):
+        # Accepts WebContent.links; only resolved internal links become edges
+        url = normalize_url(url)
+        targets = {normalize_url(link['url']) for link in links if link.get('is_internal') and link.get('url')}
+        
+        with self._lock:
+            if self.root_url is None:
+                parts = urlsplit(url)
+                self.root_url = urlunsplit((parts.scheme, parts.netloc, '/', '', ''))
+            
+            source = self._node(url)
+            if source in self._crawled:
+                return
+            self._crawled.add(source)
+            
+            for target in targets:
+                target_id = self._node(target)
+                if target_id != source:
+                    self._sources.append(source)
+                    self._targets.append(target_id)
+            self._csr = None
+    
+    def _node(self, url: str) -> int:
+        node = self._ids.get(url)
+        if node is None:
+            node = len(self.urls)
+            self._ids[url] = node
+            self.urls.append(url)
+        return node
+    
+    def csr(self):
+        # Counting sort of the edge list by source: O(V + E), no per-node Python lists
+        if self._csr is not None:
+            return self._csr
+        
+        nodes = len(self.urls)
+        offsets = array('Q', bytes(8 * (nodes + 1)))
+        for source in self._sources:
+            offsets[source + 1] += 1
+        for i in range(nodes):
+            offsets[i + 1] += offsets[i]
+        
+        targets = array('I', bytes(4 * len(self._targets)))
+        cursor = array('Q', offsets[:-1])
+        for source, target in zip(self._sources, self._targets):
+            targets[cursor[source]] = target
+            cursor[source] += 1
+        
+        self._csr = (offsets, targets)
+        return self._csr
+    
+    def in_degrees(self) -> array:
+        degrees = array('I', bytes(4 * len(self.urls)))
+        for target in self._targets:
+            degrees[target] += 1
+        return degrees
+    
+    def out_degrees(self) -> array:
+        offsets, _ = self.csr()
+        return array('I', (offsets[i + 1] - offsets[i] for i in range(len(self.urls))))
+    
+    def orphan_pages(self) -> List[str]:
+        # Crawled pages that no other crawled page links to (the homepage is never an orphan)
+        in_degrees = self.in_degrees()
+        root = self._ids.get(self.root_url)
+        return [self.urls[node] for node in sorted(self._crawled) if in_degrees[node] == 0 and node != root]
+    
+    def click_depths(self) -> array:
+        # BFS from the homepage; -1 marks pages that cannot be reached by following links
+        depths = array('i', [-1]) * len(self.urls)
+        root = self._ids.get(self.root_url)
+        if root is None:
+            return depths
+        
+        offsets, targets = self.csr()
+        depths[root] = 0
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            next_depth = depths[node] + 1
+            for i in range(offsets[node], offsets[node + 1]):
+                target = targets[i]
+                if depths[target] < 0:
+                    depths[target] = next_depth
+                    queue.append(target)
+        return depths
+    
+    def pagerank(self, damping: float = PAGERANK_DAMPING, tolerance: float = PAGERANK_TOLERANCE,
+                 max_iterations: int = PAGERANK_MAX_ITERATIONS) -> array:
+        nodes = len(self.urls)
+        if nodes == 0:
+            return array('d')
+        if np is not None:
+            return array('d', self._pagerank_numpy(damping, tolerance, max_iterations).tobytes())
+        return self._pagerank_python(damping, tolerance, max_iterations)
+    
+    def _pagerank_numpy(self, damping, tolerance, max_iterations):
+        nodes = len(self.urls)
+        sources = np.frombuffer(self._sources, dtype=np.uint32)
+        targets = np.frombuffer(self._targets, dtype=np.uint32)
+        out_degree = np.bincount(sources, minlength=nodes).astype(np.float64)
+        dangling = out_degree == 0
+        # Each edge carries 1/outdegree of its source: the column-stochastic link matrix in COO form
+        edge_weights = 1.0 / out_degree[sources] if len(sources) else np.zeros(0)
+        
+        ranks = np.full(nodes, 1.0 / nodes)
+        for _ in range(max_iterations):
+            dangling_share = ranks[dangling].sum() / nodes
+            spread = np.bincount(targets, weights=ranks[sources] * edge_weights, minlength=nodes)
+            updated = (1 - damping) / nodes + damping * (spread + dangling_share)
+            delta = np.abs(updated - ranks).sum()
+            ranks = updated
+            if delta < tolerance:
+                break
+        return ranks
+    
+    def _pagerank_python(self, damping, tolerance, max_iterations):
+        nodes = len(self.urls)
+        offsets, targets = self.csr()
+        ranks = [1.0 / nodes] * nodes
+        
+        for _ in range(max_iterations):
+            spread = [0.0] * nodes
+            dangling_total = 0.0
+            for node in range(nodes):
+                start, end = offsets[node], offsets[node + 1]
+                if start == end:
+                    dangling_total += ranks[node]
+                    continue
+                share = ranks[node] / (end - start)
+                for i in range(start, end):
+                    spread[targets[i]] += share
+            
+            base = (1 - damping) / nodes + damping * dangling_total / nodes
+            updated = [base + damping * value for value in spread]
+            delta = sum(abs(a - b) for a, b in zip(updated, ranks))
+            ranks = updated
+            if delta < tolerance:
+                break
+        return array('d', ranks)
+    
+    def page_stats(self) -> List[PageLinkStats]:
+        in_degrees = self.in_degrees()
+        out_degrees = self.out_degrees()
+        depths = self.click_depths()
+        ranks = self.pagerank()
+        orphans = set(self.orphan_pages())
+        
+        return [
+            PageLinkStats(
+                url=url,
+                crawled=node in self._crawled,
+                in_links=in_degrees[node],
+                out_links=out_degrees[node],
+                depth=depths[node] if depths[node] >= 0 else None,
+                pagerank=ranks[node],
+                orphan=url in orphans
+            )
+            for node, url in enumerate(self.urls)
+        ]
+
@@ -0,0 +1,118 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Optional
+from src.config import LLM_CACHE_DIR, LLM_CACHE_TTL, LLM_CACHE_MAX_BYTES
+
+def normalize_prompt(prompt: str) -> str:
+    return ' '.join(prompt.split())
+
+class LLMResponseCache:
+    def __init__(self, directory: str = LLM_CACHE_DIR, ttl: int = LLM_CACHE_TTL, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    def make_key(self, provider: str, model: str, system_instruction: str, prompt: str, **params) -> str:
+        payload = json.dumps({
+            'provider': provider,
+            'model': model,
+            'system': normalize_prompt(system_instruction),
+            'prompt': normalize_prompt(prompt),
+            'params': params
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.stats['misses'] += 1
+            return None
+        
+        if time.time() - entry.get('created_at', 0) > self.ttl:
+            self._remove(path)
+            self.stats['misses'] += 1
+            return None
+        
+        self.stats['hits'] += 1
+        
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        
+        return entry.get('value')
+    
+    def set(self, key: str, value: Dict):
+        path = self._path(key)
+        data = json.dumps({'created_at': time.time(), 'value': value}, ensure_ascii=False).encode('utf-8')
+        
+        with self._lock:
+            total = self._current_size()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            
+            self._total_bytes = total + len(data) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+    
+    def clear(self):
+        with self._lock:
+            for path, _, _ in self._entries():
+                self._remove(path)
+            self._total_bytes = 0
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f'{key}.json')
+    
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+    
+    def _current_size(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, _, size in self._entries())
+        return self._total_bytes
+    
+    def _evict(self):
+        # Drop least recently used entries until the cache is back under 90% of its budget
+        target = int(self.max_bytes * 0.9)
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        for path, _, size in sorted(entries, key=lambda e: e[1]):
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+        self._total_bytes = total
+    
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,280 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+from src.core.llm_cache import normalize_prompt
+
+# Note: the newest Gemini model series is "gemini-2.5-flash" or "gemini-2.5-pro"
+# Note: the newest OpenAI model is "gpt-5" which was released August 7, 2025
+# do not change these unless explicitly requested by the user
+GEMINI_MODEL = 'gemini-2.5-flash'
+OPENAI_MODEL = 'gpt-5'
+LOCAL_BASE_URL = 'http://localhost:8000/v1'
+LOCAL_MODEL = 'local-model'
+
+PROVIDER_NAMES = ('gemini', 'openai', 'local', 'replay')
+
+@dataclass
+class LLMResponse:
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: float = 0.0
+
+class LLMProvider(ABC):
+    name: str = ''
+    model: str = ''
+    
+    @abstractmethod
+    def generate(self, prompt: str, system_instruction: str, max_tokens: int, schema: Optional[str] = None) -> LLMResponse:
+        pass
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_shared_client(ai_type: str, api_key: str, max_retries: Optional[int] = None, base_url: Optional[str] = None):
+    # One client (and its connection pool) per provider, key and endpoint for the whole process
+    key = (ai_type, api_key, max_retries, base_url)
+    with _clients_lock:
+        if key not in _clients:
+            if ai_type == 'gemini':
+                from google import genai
+                _clients[key] = genai.Client(api_key=api_key)
+            else:
+                from openai import OpenAI
+                options = {} if max_retries is None else {'max_retries': max_retries}
+                if base_url:
+                    options['base_url'] = base_url
+                _clients[key] = OpenAI(api_key=api_key, **options)
+        return _clients[key]
+
+@lru_cache(maxsize=1)
+def response_schemas() -> Dict:
+    from pydantic import BaseModel
+    
+    class Recommendations(BaseModel):
+        recommendations: List[str]
+    
+    class ContentQuality(BaseModel):
+        readability: int
+        engagement: int
+        keyword_stuffing_risk: int
+        content_value: int
+        keyword_targeting: int
+        summary: str
+    
+    class GrammarAnalysis(BaseModel):
+        grammar_score: int
+        issues_found: int
+        title_improvement: str
+        meta_improvement: str
+        grammar_suggestions: List[str]
+        readability_tips: List[str]
+        seo_preserved: bool
+    
+    class SEOInsights(BaseModel):
+        recommendations: List[str]
+        optimized_title: str
+        optimized_meta_description: str
+        content_quality: ContentQuality
+        grammar_analysis: GrammarAnalysis
+    
+    return {
+        'recommendations': Recommendations,
+        'content_quality': ContentQuality,
+        'grammar_analysis': GrammarAnalysis,
+        'seo_insights': SEOInsights
+    }
+
+def _token_count(value) -> int:
+    return value if isinstance(value, int) else 0
+
+class GeminiProvider(LLMProvider):
+    name = 'gemini'
+    
+    def __init__(self, api_key: Optional[str] = None, model: str = GEMINI_MODEL, client=None):
+        self.model = model
+        self.client = client or get_shared_client('gemini', api_key)
+    
+    def generate(self, prompt: str, system_instruction: str, max_tokens: int, schema: Optional[str] = None) -> LLMResponse:
+        started = time.perf_counter()
+        
+        if schema:
+            from google.genai import types
+            config = types.GenerateContentConfig(
+                system_instruction=system_instruction,
+                response_mime_type="application/json",
+                response_schema=response_schemas()[schema],
+            )
+        else:
+            config = {'system_instruction': system_instruction}
+        
+        response = self.client.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=config
+        )
+        
+        usage = getattr(response, 'usage_metadata', None)
+        return LLMResponse(
+            text=response.text,
+            input_tokens=_token_count(getattr(usage, 'prompt_token_count', 0)),
+            output_tokens=_token_count(getattr(usage, 'candidates_token_count', 0)),
+            latency_ms=(time.perf_counter() - started) * 1000
+        )
+
+class OpenAIProvider(LLMProvider):
+    name = 'openai'
+    
+    def __init__(self, api_key: Optional[str] = None, model: str = OPENAI_MODEL, base_url: Optional[str] = None,
+                 max_retries: Optional[int] = None, client=None, name: Optional[str] = None):
+        self.model = model
+        self.base_url = base_url
+        if name:
+            self.name = name
+        self.client = client or get_shared_client('openai', api_key, max_retries, base_url)
+    
+    def generate(self, prompt: str, system_instruction: str, max_tokens: int, schema: Optional[str] = None) -> LLMResponse:
+        started = time.perf_counter()
+        
+        extra = {'response_format': {"type": "json_object"}} if schema else {}
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_instruction},
+                {"role": "user", "content": prompt}
+            ],
+            max_completion_tokens=max_tokens,
+            **extra
+        )
+        
+        usage = getattr(response, 'usage', None)
+        return LLMResponse(
+            text=response.choices[0].message.content,
+            input_tokens=_token_count(getattr(usage, 'prompt_tokens', 0)),
+            output_tokens=_token_count(getattr(usage, 'completion_tokens', 0)),
+            latency_ms=(time.perf_counter() - started) * 1000
+        )
+
+def recording_key(prompt: str, system_instruction: str, max_tokens: int, schema: Optional[str]) -> str:
+    payload = json.dumps({
+        'system': normalize_prompt(system_instruction),
+        'prompt': normalize_prompt(prompt),
+        'max_tokens': max_tokens,
+        'schema': schema
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class RecordingProvider(LLMProvider):
+    def __init__(self, inner: LLMProvider, path: str):
+        self.inner = inner
+        self.name = inner.name
+        self.model = inner.model
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def generate(self, prompt: str, system_instruction: str, max_tokens: int, schema: Optional[str] = None) -> LLMResponse:
+        response = self.inner.generate(prompt, system_instruction, max_tokens, schema)
+        record = {
+            'key': recording_key(prompt, system_instruction, max_tokens, schema),
+            'provider': self.name,
+            'model': self.model,
+            'text': response.text,
+            'input_tokens': response.input_tokens,
+            'output_tokens': response.output_tokens,
+            'latency_ms': round(response.latency_ms, 3)
+        }
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return response
+
+class ReplayProvider(LLMProvider):
+    name = 'replay'
+    
+    def __init__(self, path: str, simulate_latency: bool = False):
+        self.path = path
+        self.simulate_latency = simulate_latency
+        self.model = 'replay'
+        self.records = {}
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                self.records[record['key']] = record
+                self.model = record.get('model', self.model)
+    
+    def generate(self, prompt: str, system_instruction: str, max_tokens: int, schema: Optional[str] = None) -> LLMResponse:
+        key = recording_key(prompt, system_instruction, max_tokens, schema)
+        record = self.records.get(key)
+        if record is None:
+            raise LookupError(f'No recorded response for this prompt in {self.path}')
+        
+        latency_ms = record.get('latency_ms', 0.0)
+        if self.simulate_latency and latency_ms:
+            time.sleep(latency_ms / 1000)
+        
+        return LLMResponse(
+            text=record['text'],
+            input_tokens=record.get('input_tokens', 0),
+            output_tokens=record.get('output_tokens', 0),
+            latency_ms=latency_ms if self.simulate_latency else 0.0
+        )
+
+def create_provider(
+    name: Optional[str] = None,
+    model: Optional[str] = None,
+    base_url: Optional[str] = None,
+    record_path: Optional[str] = None,
+    replay_path: Optional[str] = None,
+    simulate_latency: bool = False,
+    max_retries: Optional[int] = None
+) -> Optional[LLMProvider]:
+    name = name or os.environ.get('SEO_AI_PROVIDER')
+    replay_path = replay_path or os.environ.get('SEO_AI_REPLAY_FILE')
+    record_path = record_path or os.environ.get('SEO_AI_RECORD_FILE')
+    model = model or os.environ.get('SEO_AI_MODEL')
+    
+    if replay_path and name in (None, 'replay'):
+        return ReplayProvider(replay_path, simulate_latency=simulate_latency)
+    
+    gemini_key = os.environ.get('GEMINI_API_KEY')
+    openai_key = os.environ.get('OPENAI_API_KEY')
+    provider = None
+    
+    try:
+        if name == 'local':
+            provider = OpenAIProvider(
+                api_key=openai_key or 'local',
+                model=model or LOCAL_MODEL,
+                base_url=base_url or os.environ.get('SEO_AI_BASE_URL') or LOCAL_BASE_URL,
+                max_retries=max_retries,
+                name='local'
+            )
+        elif name == 'gemini' or (name is None and gemini_key):
+            if gemini_key:
+                provider = GeminiProvider(gemini_key, model or GEMINI_MODEL)
+        elif name == 'openai' or name is None:
+            if openai_key:
+                provider = OpenAIProvider(openai_key, model or OPENAI_MODEL, base_url=base_url, max_retries=max_retries)
+    except ImportError:
+        provider = None
+    
+    if provider is None and name is None and gemini_key and openai_key:
+        # Gemini SDK unavailable, fall back to OpenAI like before
+        try:
+            provider = OpenAIProvider(openai_key, model or OPENAI_MODEL, base_url=base_url, max_retries=max_retries)
+        except ImportError:
+            provider = None
+    
+    if provider is not None and record_path:
+        provider = RecordingProvider(provider, record_path)
+    
+    return provider
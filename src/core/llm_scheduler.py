@@ -0,0 +1,156 @@
+import time
+import heapq
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional
+from src.config import LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_MAX_RETRIES, LLM_WORKERS
+
+WINDOW_SECONDS = 60.0
+DEFAULT_BACKOFF = 1.0
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    status = getattr(error, 'status_code', None) or getattr(error, 'code', None)
+    if status != 429:
+        return None
+    
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    
+    retry_after = headers.get('retry-after')
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    
+    return DEFAULT_BACKOFF
+
+class LLMScheduler:
+    def __init__(
+        self,
+        requests_per_minute: int = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = LLM_TOKENS_PER_MINUTE,
+        max_retries: int = LLM_MAX_RETRIES,
+        workers: int = LLM_WORKERS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.workers = workers
+        self.clock = clock
+        self.sleep = sleep
+        self.stats = {'requests': 0, 'tokens': 0, 'rate_limited': 0, 'retries': 0, 'failed': 0}
+        
+        self._window = deque()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        
+        self._queue = []
+        self._sequence = itertools.count()
+        self._queue_ready = threading.Condition()
+        self._threads = []
+        self._closed = False
+    
+    def acquire(self, estimated_tokens: int) -> list:
+        while True:
+            with self._lock:
+                now = self.clock()
+                while self._window and now - self._window[0][0] >= WINDOW_SECONDS:
+                    self._window.popleft()
+                
+                wait = self._paused_until - now
+                if wait <= 0:
+                    used_tokens = sum(entry[1] for entry in self._window)
+                    within_requests = len(self._window) < self.requests_per_minute
+                    within_tokens = not self._window or used_tokens + estimated_tokens <= self.tokens_per_minute
+                    if within_requests and within_tokens:
+                        entry = [now, estimated_tokens]
+                        self._window.append(entry)
+                        return entry
+                    wait = WINDOW_SECONDS - (now - self._window[0][0])
+            
+            self.sleep(max(wait, 0.01))
+    
+    def call(self, fn: Callable[[], Any], estimated_tokens: int = 0,
+             usage: Optional[Callable[[Any], int]] = None) -> Any:
+        attempt = 0
+        while True:
+            entry = self.acquire(estimated_tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                delay = retry_after_seconds(e)
+                if delay is None or attempt >= self.max_retries:
+                    with self._lock:
+                        self.stats['failed'] += 1
+                    raise
+                
+                with self._lock:
+                    self.stats['rate_limited'] += 1
+                    self.stats['retries'] += 1
+                    self._paused_until = max(self._paused_until, self.clock() + delay)
+                attempt += 1
+                continue
+            
+            with self._lock:
+                if usage is not None:
+                    entry[1] = usage(result)
+                self.stats['requests'] += 1
+                self.stats['tokens'] += entry[1]
+            return result
+    
+    def submit(self, priority: float, fn: Callable[[], Any]) -> Future:
+        # Higher priority values (larger score deficits) are served first
+        future = Future()
+        with self._queue_ready:
+            if self._closed:
+                raise RuntimeError('Scheduler has been shut down')
+            heapq.heappush(self._queue, (-priority, next(self._sequence), fn, future))
+            self._start_workers()
+            self._queue_ready.notify()
+        return future
+    
+    def shutdown(self, wait: bool = True):
+        with self._queue_ready:
+            self._closed = True
+            self._queue_ready.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+    
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def _worker(self):
+        while True:
+            with self._queue_ready:
+                while not self._queue and not self._closed:
+                    self._queue_ready.wait()
+                if not self._queue:
+                    return
+                _, _, fn, future = heapq.heappop(self._queue)
+            
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
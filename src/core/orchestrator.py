@@ -1,14 +1,26 @@
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+import time
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
-from src.core.fetcher import fetch_content, WebContent
+from src.core.fetcher import download_page, parse_page, RawPage, WebContent
+from src.core.fetch_timing import FetchTiming
+from src.core.fingerprint import page_fingerprint, analysis_signature
 from src.core.keyword_processor import process_keywords, KeywordVariation
 from src.analyzers.technical_seo import TechnicalSEOAnalyzer
 from src.analyzers.content_analyzer import ContentAnalyzer, ClusterScore
 from src.analyzers.structure_analyzer import StructureAnalyzer
 from src.analyzers.link_analyzer import LinkAnalyzer
+from src.analyzers.performance_analyzer import PerformanceAnalyzer
 from src.analyzers.ai_analyzer import AIAnalyzer
+from src.core.llm_cache import LLMResponseCache
+from src.core.llm_scheduler import LLMScheduler
+from src.core.llm_providers import LLMProvider
+from src.core.link_checker import LinkChecker
+from src.core.image_probe import ImageProber
+from src.core.http2_fetcher import Http2Fetcher
 from src.core.scoring import calculate_overall_score, ModuleResult
+from src.utils.spans import span, record_spans
+from src.config import AI_PROMPT_TOKEN_BUDGET
 
 @dataclass
 class AnalysisReport:
@@ -22,45 +34,196 @@ class AnalysisReport:
     link_analysis: ModuleResult
     top_recommendations: List[str]
     ai_analysis: Optional[ModuleResult] = None
+    keyword_clusters: List[ClusterScore] = field(default_factory=list)
+    performance: Optional[ModuleResult] = None
+    # Milliseconds per timing span (fetch, parse, extract.*, analyze.*) for this page
+    timings: Dict[str, float] = field(default_factory=dict)
 
-def run_analysis(url: str, keywords: List[str], verbose: bool = False, use_ai: bool = False) -> AnalysisReport:
-    content = fetch_content(url)
+def is_primary_copy(cluster: ClusterScore, primary: ClusterScore) -> bool:
+    # build_report gives a named cluster with the primary keywords a renamed copy of the primary scores
+    return cluster.keywords == primary.keywords
+
+def distinct_clusters(report: AnalysisReport) -> List[ClusterScore]:
+    # Every scored cluster once: the named clusters, preceded by the primary unless one of them repeats it
+    clusters = list(report.keyword_clusters)
+    if not any(is_primary_copy(cluster, report.keyword_cluster) for cluster in clusters):
+        clusters.insert(0, report.keyword_cluster)
+    return clusters
+
+@dataclass
+class PageAnalysis:
+    page: RawPage
+    content: Optional[WebContent]
+    report: AnalysisReport
+    fingerprint: str
+    reused: bool = False
+    analysis_ms: float = 0.0
+    saved_ms: float = 0.0
     
+    def parsed_content(self) -> WebContent:
+        # Reused pages skip parsing until something (like the AI analyzer) actually needs the DOM
+        if self.content is None:
+            self.content = parse_page(self.page)
+            self.page.release()
+        return self.content
+
+def run_analysis(url: str, keywords: List[str], verbose: bool = False, use_ai: bool = False,
+                 ai_consolidated: bool = False, ai_cache: bool = True,
+                 ai_provider: Optional[LLMProvider] = None,
+                 ai_token_budget: int = AI_PROMPT_TOKEN_BUDGET,
+                 store=None, run_id: Optional[int] = None,
+                 clusters: Optional[List[Tuple[str, List[str]]]] = None,
+                 check_links: bool = False, audit_images: bool = False) -> AnalysisReport:
     keyword_variations = process_keywords(keywords)
+    cluster_variations = process_clusters(clusters)
+    signature = analysis_signature(keywords, clusters) if store is not None else None
+    
+    link_checker = LinkChecker() if check_links else None
+    image_prober = ImageProber() if audit_images else None
+    try:
+        analysis = analyze_page(url, keyword_variations, store, signature, cluster_variations,
+                                link_checker, image_prober)
+    finally:
+        if link_checker is not None:
+            link_checker.close()
+        if image_prober is not None:
+            image_prober.close()
+    report = analysis.report
     
-    technical_analyzer = TechnicalSEOAnalyzer(content, keyword_variations)
-    technical_result = technical_analyzer.analyze()
+    if use_ai:
+        with record_spans(report.timings):
+            report.ai_analysis = run_ai_analysis(
+                analysis.parsed_content(), keyword_variations, report,
+                consolidated=ai_consolidated,
+                cache=LLMResponseCache() if ai_cache else None,
+                provider=ai_provider,
+                token_budget=ai_token_budget
+            )
     
-    content_analyzer = ContentAnalyzer(content, keyword_variations)
-    content_result = content_analyzer.analyze()
+    if store is not None:
+        store.record(run_id if run_id is not None else store.start_run(), analysis, signature)
+        store.flush()
     
-    structure_analyzer = StructureAnalyzer(content, keyword_variations)
-    structure_result = structure_analyzer.analyze()
+    return report
+
+def process_clusters(clusters: Optional[List[Tuple[str, List[str]]]]) -> List[Tuple[str, List[KeywordVariation]]]:
+    return [(name, process_keywords(keywords)) for name, keywords in clusters or []]
+
+def analyze_page(url: str, keyword_variations: List[KeywordVariation], store=None,
+                 signature: Optional[str] = None,
+                 clusters: Optional[List[Tuple[str, List[KeywordVariation]]]] = None,
+                 link_checker: Optional[LinkChecker] = None,
+                 image_prober: Optional[ImageProber] = None,
+                 page_fetcher: Optional[Http2Fetcher] = None) -> PageAnalysis:
+    with record_spans({}) as timings:
+        analysis = _analyze_page(url, keyword_variations, store, signature, clusters, link_checker,
+                                 image_prober, page_fetcher)
+    # A reused report carries the timings of the run that stored it; these are this run's
+    analysis.report.timings = {name: round(ms, 2) for name, ms in timings.items()}
+    return analysis
+
+def _analyze_page(url, keyword_variations, store, signature, clusters, link_checker, image_prober,
+                  page_fetcher) -> PageAnalysis:
+    page = page_fetcher.download(url) if page_fetcher is not None else download_page(url)
+    with span('fingerprint'):
+        fingerprint = page_fingerprint(page.html) if store is not None else ''
     
-    link_analyzer = LinkAnalyzer(content, keyword_variations)
-    link_result = link_analyzer.analyze()
+    started = time.perf_counter()
+    # Link health and image weight depend on other URLs, so an unchanged page still needs rechecking
+    reusable = store is not None and link_checker is None and image_prober is None
+    with span('reuse'):
+        cached = store.load_page(url, fingerprint, signature) if reusable else None
+    if cached is not None:
+        report, analysis_ms = cached
+        report.analyzed_at = datetime.now().isoformat()
+        # The signature leaves out the AI provider, model and prompt settings, so stored AI output is never
+        # reused; the LLM response cache, keyed on all of them, skips the repeat request when they match
+        report.ai_analysis = None
+        if page.timing is not None:
+            apply_performance(report, page.timing)
+        reuse_ms = (time.perf_counter() - started) * 1000
+        return PageAnalysis(page, None, report, fingerprint, reused=True,
+                            analysis_ms=analysis_ms, saved_ms=max(0.0, analysis_ms - reuse_ms))
+    
+    started = time.perf_counter()
+    content = parse_page(page)
+    page.release()
+    report = build_report(content, keyword_variations, clusters, link_checker, image_prober, page.timing)
+    analysis_ms = (time.perf_counter() - started) * 1000
+    return PageAnalysis(page, content, report, fingerprint, analysis_ms=analysis_ms)
+
+def run_ai_analysis(
+    content: WebContent,
+    keyword_variations: List[KeywordVariation],
+    report: AnalysisReport,
+    consolidated: bool = False,
+    cache: Optional[LLMResponseCache] = None,
+    scheduler: Optional[LLMScheduler] = None,
+    provider: Optional[LLMProvider] = None,
+    token_budget: int = AI_PROMPT_TOKEN_BUDGET
+) -> ModuleResult:
+    current_scores = {
+        'technical': report.technical_seo.score,
+        'content': report.content_analysis.score,
+        'structure': report.structure_analysis.score,
+        'links': report.link_analysis.score
+    }
+    ai_analyzer = AIAnalyzer(
+        content, keyword_variations, current_scores,
+        consolidated=consolidated,
+        cache=cache,
+        scheduler=scheduler,
+        provider=provider,
+        keyword_cluster=report.keyword_cluster,
+        token_budget=token_budget
+    )
+    with span('analyze.ai'):
+        return ai_analyzer.analyze()
+
+def build_report(content: WebContent, keyword_variations: List[KeywordVariation],
+                 clusters: Optional[List[Tuple[str, List[KeywordVariation]]]] = None,
+                 link_checker: Optional[LinkChecker] = None,
+                 image_prober: Optional[ImageProber] = None,
+                 timing: Optional[FetchTiming] = None) -> AnalysisReport:
+    with span('analyze.technical_seo'):
+        technical_analyzer = TechnicalSEOAnalyzer(content, keyword_variations, timing.status_code if timing else 200)
+        technical_result = technical_analyzer.analyze()
+    
+    with span('analyze.content'):
+        content_analyzer = ContentAnalyzer(content, keyword_variations)
+        content_result = content_analyzer.analyze()
+    
+    with span('analyze.structure'):
+        image_info = image_prober.probe_many(image['url'] for image in content.images) if image_prober else None
+        structure_analyzer = StructureAnalyzer(content, keyword_variations, image_info)
+        structure_result = structure_analyzer.analyze()
+    
+    with span('analyze.links'):
+        link_health = link_checker.check_many(link['url'] for link in content.links) if link_checker else None
+        link_analyzer = LinkAnalyzer(content, keyword_variations, link_health)
+        link_result = link_analyzer.analyze()
+    
+    with span('analyze.performance'):
+        performance_result = PerformanceAnalyzer(content, keyword_variations, timing).analyze() if timing else None
     
     keyword_cluster = content_result.details['keyword_cluster']
+    # Extra clusters only repeat the keyword scoring, against text the content analyzer already prepared
+    with span('analyze.clusters'):
+        keyword_clusters = [
+            replace(keyword_cluster, name=name) if [kw.original for kw in variations] == keyword_cluster.keywords
+            else content_analyzer.score_cluster(variations, name)
+            for name, variations in clusters or []
+        ]
     
     overall_score = calculate_overall_score(
         keyword_score=keyword_cluster.cluster_score,
         technical_score=technical_result.score,
         content_score=content_result.score,
         structure_score=structure_result.score,
-        link_score=link_result.score
+        link_score=link_result.score,
+        performance_score=performance_result.score if performance_result else None
     )
     
-    ai_result = None
-    if use_ai:
-        current_scores = {
-            'technical': technical_result.score,
-            'content': content_result.score,
-            'structure': structure_result.score,
-            'links': link_result.score
-        }
-        ai_analyzer = AIAnalyzer(content, keyword_variations, current_scores)
-        ai_result = ai_analyzer.analyze()
-    
     module_recommendations = []
     
     kw_recs = []
@@ -81,6 +244,10 @@ def run_analysis(url: str, keywords: List[str], verbose: bool = False, use_ai: b
     link_recs = [(link_result.score, rec) for rec in link_result.recommendations[:2]]
     module_recommendations.append(('links', link_recs))
     
+    if performance_result:
+        performance_recs = [(performance_result.score, rec) for rec in performance_result.recommendations[:2]]
+        module_recommendations.append(('performance', performance_recs))
+    
     all_recommendations = []
     for module_name, recs in module_recommendations:
         for score, rec in recs:
@@ -91,7 +258,7 @@ def run_analysis(url: str, keywords: List[str], verbose: bool = False, use_ai: b
     top_recommendations = [rec[2] for rec in all_recommendations[:8]]
     
     report = AnalysisReport(
-        url=url,
+        url=content.url,
         analyzed_at=datetime.now().isoformat(),
         overall_score=overall_score,
         keyword_cluster=keyword_cluster,
@@ -100,7 +267,20 @@ def run_analysis(url: str, keywords: List[str], verbose: bool = False, use_ai: b
         structure_analysis=structure_result,
         link_analysis=link_result,
         top_recommendations=top_recommendations,
-        ai_analysis=ai_result
+        keyword_clusters=keyword_clusters,
+        performance=performance_result
     )
     
     return report
+
+def apply_performance(report: AnalysisReport, timing: FetchTiming):
+    # Timings belong to this fetch, so a reused report gets fresh performance scoring on top
+    report.performance = PerformanceAnalyzer(None, [], timing).analyze()
+    report.overall_score = calculate_overall_score(
+        keyword_score=report.keyword_cluster.cluster_score,
+        technical_score=report.technical_seo.score,
+        content_score=report.content_analysis.score,
+        structure_score=report.structure_analysis.score,
+        link_score=report.link_analysis.score,
+        performance_score=report.performance.score
+    )
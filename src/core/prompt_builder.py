@@ -0,0 +1,155 @@
+import re
+import math
+from typing import Callable, Dict, List
+from src.core.fetcher import WebContent
+from src.core.keyword_processor import KeywordVariation
+from src.utils.text_utils import tokenize, stem_words
+from src.config import AI_PROMPT_TOKEN_BUDGET
+
+PASSAGE_WORDS = 60
+EXCERPT_SEPARATOR = ' … '
+
+BOILERPLATE_PATTERN = re.compile(
+    r'\b(cookies?|consent|accept all|privacy policy|terms of (use|service)|all rights reserved|'
+    r'sign in|log in|subscribe|newsletter|skip to (main )?content)\b',
+    re.IGNORECASE
+)
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English text across GPT and Gemini tokenizers
+    return math.ceil(len(text) / 4) if text else 0
+
+def split_passages(text: str, max_words: int = PASSAGE_WORDS) -> List[str]:
+    passages = []
+    current = []
+    
+    for sentence in re.split(r'(?<=[.!?])\s+', text):
+        words = sentence.split()
+        if not words:
+            continue
+        
+        if current and len(current) + len(words) > max_words:
+            passages.append(' '.join(current))
+            current = []
+        
+        while len(words) > max_words:
+            passages.append(' '.join(words[:max_words]))
+            words = words[max_words:]
+        
+        current.extend(words)
+    
+    if current:
+        passages.append(' '.join(current))
+    
+    return passages
+
+class PromptBuilder:
+    def __init__(
+        self,
+        content: WebContent,
+        keyword_variations: List[KeywordVariation],
+        keyword_cluster=None,
+        token_budget: int = AI_PROMPT_TOKEN_BUDGET
+    ):
+        self.content = content
+        self.keyword_variations = keyword_variations
+        self.keyword_cluster = keyword_cluster
+        self.token_budget = token_budget
+        self.prompt_tokens = {}
+        self._ranked = None
+    
+    def render(self, name: str, template: Callable[[str], str], excerpt_tokens: int) -> str:
+        fixed_tokens = estimate_tokens(template(''))
+        available = max(0, min(excerpt_tokens, self.token_budget - fixed_tokens))
+        
+        prompt = template(self.excerpt(available))
+        self.prompt_tokens[name] = estimate_tokens(prompt)
+        return prompt
+    
+    def excerpt(self, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ''
+        
+        selected = []
+        used = 0
+        separator_tokens = estimate_tokens(EXCERPT_SEPARATOR)
+        
+        for index, passage, tokens in self._rank_passages():
+            cost = tokens + (separator_tokens if selected else 0)
+            if used + cost <= max_tokens:
+                selected.append((index, passage))
+                used += cost
+            elif not selected:
+                # Nothing fits whole, so trim the best passage down to the budget
+                selected.append((index, passage[:max_tokens * 4].rsplit(' ', 1)[0]))
+                break
+        
+        return EXCERPT_SEPARATOR.join(passage for _, passage in sorted(selected))
+    
+    def keyword_findings(self) -> str:
+        if not self.keyword_cluster:
+            return ''
+        
+        lines = []
+        for kw_score in self.keyword_cluster.individual_scores:
+            missing = [place for place, found in (
+                ('title', kw_score.in_title),
+                ('meta description', kw_score.in_meta),
+                ('H1', kw_score.in_h1),
+                ('first 100 words', kw_score.in_first_100_words)
+            ) if not found]
+            line = f'- {kw_score.keyword}: {kw_score.score}/100, density {kw_score.density:.1f}%'
+            if missing:
+                line += f", missing from {', '.join(missing)}"
+            lines.append(line)
+        
+        return '\n'.join(lines)
+    
+    def _rank_passages(self) -> List:
+        if self._ranked is not None:
+            return self._ranked
+        
+        passages = split_passages(self.content.body_text)
+        headings = [h.lower() for tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+                    for h in self.content.headings.get(tag, []) if len(h.split()) >= 2]
+        weights = self._keyword_weights()
+        
+        scored = []
+        previous_has_heading = False
+        for index, passage in enumerate(passages):
+            lowered = passage.lower()
+            words = tokenize(lowered)
+            stemmed = ' '.join(stem_words(words))
+            
+            hits = 0.0
+            for kw_var in self.keyword_variations:
+                count = lowered.count(kw_var.original.lower())
+                if not count and kw_var.stemmed:
+                    count = stemmed.count(kw_var.stemmed)
+                hits += count * weights.get(kw_var.original, 1.0)
+            
+            density = hits / max(len(words), 1) * 100
+            has_heading = any(h in lowered for h in headings)
+            
+            score = density
+            if has_heading:
+                score += 3.0
+            elif previous_has_heading:
+                score += 1.5
+            if BOILERPLATE_PATTERN.search(passage):
+                score -= 5.0
+            # Slight preference for earlier passages when everything else is equal
+            score -= index * 0.001
+            
+            scored.append((score, index, passage, estimate_tokens(passage)))
+            previous_has_heading = has_heading
+        
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        self._ranked = [(index, passage, tokens) for _, index, passage, tokens in scored]
+        return self._ranked
+    
+    def _keyword_weights(self) -> Dict[str, float]:
+        # Keywords the page already handles poorly get more say in which passages are shown
+        if not self.keyword_cluster:
+            return {}
+        return {ks.keyword: 1.0 + (100 - ks.score) / 100 for ks in self.keyword_cluster.individual_scores}
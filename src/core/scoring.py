@@ -1,6 +1,29 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from dataclasses import dataclass
-from src.config import SCORE_WEIGHTS, KEYWORD_SCORE_WEIGHTS
+from src.config import (
+    SCORE_WEIGHTS, KEYWORD_SCORE_WEIGHTS, OPTIMAL_KEYWORD_DENSITY_MIN, OPTIMAL_KEYWORD_DENSITY_MAX,
+    OPTIMAL_TITLE_LENGTH_MIN, OPTIMAL_TITLE_LENGTH_MAX, OPTIMAL_META_DESC_LENGTH_MIN, OPTIMAL_META_DESC_LENGTH_MAX,
+    RECOMMENDED_INTERNAL_LINKS_MIN, RECOMMENDED_INTERNAL_LINKS_MAX, MIN_WORD_COUNT,
+    PERFORMANCE_TTFB_GOOD_MS, PERFORMANCE_TTFB_POOR_MS, PERFORMANCE_LOAD_GOOD_MS, PERFORMANCE_LOAD_POOR_MS,
+    PERFORMANCE_COMPRESS_MIN_BYTES
+)
+
+DEFAULT_THRESHOLDS = {
+    'keyword_density_min': OPTIMAL_KEYWORD_DENSITY_MIN,
+    'keyword_density_max': OPTIMAL_KEYWORD_DENSITY_MAX,
+    'title_length_min': OPTIMAL_TITLE_LENGTH_MIN,
+    'title_length_max': OPTIMAL_TITLE_LENGTH_MAX,
+    'meta_length_min': OPTIMAL_META_DESC_LENGTH_MIN,
+    'meta_length_max': OPTIMAL_META_DESC_LENGTH_MAX,
+    'internal_links_min': RECOMMENDED_INTERNAL_LINKS_MIN,
+    'internal_links_max': RECOMMENDED_INTERNAL_LINKS_MAX,
+    'min_word_count': MIN_WORD_COUNT,
+    'ttfb_good_ms': PERFORMANCE_TTFB_GOOD_MS,
+    'ttfb_poor_ms': PERFORMANCE_TTFB_POOR_MS,
+    'load_good_ms': PERFORMANCE_LOAD_GOOD_MS,
+    'load_poor_ms': PERFORMANCE_LOAD_POOR_MS,
+    'compress_min_bytes': PERFORMANCE_COMPRESS_MIN_BYTES
+}
 
 @dataclass
 class ModuleResult:
@@ -15,16 +38,24 @@ def calculate_overall_score(
     technical_score: int,
     content_score: int,
     structure_score: int,
-    link_score: int
+    link_score: int,
+    weights: Optional[Dict[str, float]] = None,
+    performance_score: Optional[int] = None
 ) -> int:
+    weights = weights or SCORE_WEIGHTS
     overall = (
-        keyword_score * SCORE_WEIGHTS['keyword_analysis'] +
-        technical_score * SCORE_WEIGHTS['technical_seo'] +
-        content_score * SCORE_WEIGHTS['content_analysis'] +
-        structure_score * SCORE_WEIGHTS['structure'] +
-        link_score * SCORE_WEIGHTS['links']
+        keyword_score * weights['keyword_analysis'] +
+        technical_score * weights['technical_seo'] +
+        content_score * weights['content_analysis'] +
+        structure_score * weights['structure'] +
+        link_score * weights['links']
     )
     
+    # Without fetch timings (stored reports, old feature tables) the other modules keep their full share
+    if performance_score is not None:
+        performance_weight = weights.get('performance', 0.0)
+        overall = overall * (1 - performance_weight) + performance_score * performance_weight
+    
     return min(100, max(0, int(overall)))
 
 def calculate_keyword_score(
@@ -34,20 +65,139 @@ def calculate_keyword_score(
     in_headings: int,
     in_first_100_words: bool,
     density_score: float,
-    distribution_score: float
+    distribution_score: float,
+    weights: Optional[Dict[str, float]] = None
 ) -> int:
+    weights = weights or KEYWORD_SCORE_WEIGHTS
     score = (
-        (100 if in_title else 0) * KEYWORD_SCORE_WEIGHTS['title_match'] +
-        (100 if in_meta else 0) * KEYWORD_SCORE_WEIGHTS['meta_match'] +
-        (100 if in_h1 else 0) * KEYWORD_SCORE_WEIGHTS['h1_match'] +
-        min(100, in_headings * 50) * KEYWORD_SCORE_WEIGHTS['headings_match'] +
-        (100 if in_first_100_words else 0) * KEYWORD_SCORE_WEIGHTS['first_100_words'] +
-        density_score * KEYWORD_SCORE_WEIGHTS['density_score'] +
-        distribution_score * KEYWORD_SCORE_WEIGHTS['distribution_score']
+        (100 if in_title else 0) * weights['title_match'] +
+        (100 if in_meta else 0) * weights['meta_match'] +
+        (100 if in_h1 else 0) * weights['h1_match'] +
+        min(100, in_headings * 50) * weights['headings_match'] +
+        (100 if in_first_100_words else 0) * weights['first_100_words'] +
+        density_score * weights['density_score'] +
+        distribution_score * weights['distribution_score']
     )
     
     return min(100, max(0, int(score)))
 
+def calculate_density_score(density: float, thresholds: Optional[Dict] = None) -> float:
+    t = thresholds or DEFAULT_THRESHOLDS
+    if t['keyword_density_min'] <= density <= t['keyword_density_max']:
+        return 100
+    elif density < t['keyword_density_min']:
+        return (density / t['keyword_density_min']) * 100
+    else:
+        return max(0, 100 - (density - t['keyword_density_max']) * 20)
+
+def calculate_title_score(present: bool, length: int, thresholds: Optional[Dict] = None) -> int:
+    t = thresholds or DEFAULT_THRESHOLDS
+    if not present:
+        return 0
+    return 15 + (15 if t['title_length_min'] <= length <= t['title_length_max'] else 0)
+
+def calculate_meta_description_score(present: bool, length: int, thresholds: Optional[Dict] = None) -> int:
+    t = thresholds or DEFAULT_THRESHOLDS
+    if not present:
+        return 0
+    return 12 + (13 if t['meta_length_min'] <= length <= t['meta_length_max'] else 0)
+
+def calculate_open_graph_score(present: bool, complete: bool) -> int:
+    return 15 if complete else (7 if present else 0)
+
+def calculate_technical_score(
+    title_present: bool,
+    title_length: int,
+    meta_present: bool,
+    meta_length: int,
+    has_canonical: bool,
+    og_present: bool,
+    og_complete: bool,
+    thresholds: Optional[Dict] = None
+) -> int:
+    score = (
+        calculate_title_score(title_present, title_length, thresholds) +
+        calculate_meta_description_score(meta_present, meta_length, thresholds) +
+        (10 if has_canonical else 0) +
+        calculate_open_graph_score(og_present, og_complete) +
+        10
+    )
+    return min(100, score)
+
+def calculate_content_score(word_count: int, avg_density: float, thresholds: Optional[Dict] = None) -> int:
+    t = thresholds or DEFAULT_THRESHOLDS
+    
+    if word_count >= t['min_word_count']:
+        word_count_score = 50
+    else:
+        word_count_score = (word_count / t['min_word_count']) * 50
+    
+    if t['keyword_density_min'] <= avg_density <= t['keyword_density_max']:
+        density_health_score = 50
+    elif avg_density < t['keyword_density_min']:
+        density_health_score = (avg_density / t['keyword_density_min']) * 50
+    else:
+        density_health_score = max(0, 50 - (avg_density - t['keyword_density_max']) * 10)
+    
+    return int(word_count_score + density_health_score)
+
+def calculate_h1_score(h1_count: int) -> int:
+    if h1_count == 0:
+        return 0
+    return 30 if h1_count == 1 else 15
+
+def calculate_image_alt_score(images_without_alt: int) -> int:
+    return max(0, 15 - (images_without_alt * 3))
+
+def calculate_structure_score(h1_count: int, images_without_alt: int) -> int:
+    return min(100, calculate_h1_score(h1_count) + 25 + calculate_image_alt_score(images_without_alt) + 35)
+
+def calculate_internal_link_score(internal_count: int, thresholds: Optional[Dict] = None) -> int:
+    t = thresholds or DEFAULT_THRESHOLDS
+    if internal_count < t['internal_links_min']:
+        return int((internal_count / t['internal_links_min']) * 35)
+    return 35
+
+def calculate_link_health_score(checked: int = 0, broken: int = 0, redirected: int = 0) -> int:
+    # Without a link check every link is assumed to work and point straight at its target
+    if not checked:
+        return 25 + 15
+    return 25 * (checked - broken) // checked + 15 * (checked - redirected) // checked
+
+def calculate_link_score(internal_count: int, external_count: int, thresholds: Optional[Dict] = None,
+                         checked: int = 0, broken: int = 0, redirected: int = 0) -> int:
+    score = (
+        calculate_internal_link_score(internal_count, thresholds) +
+        (25 if external_count > 0 else 0) +
+        calculate_link_health_score(checked, broken, redirected)
+    )
+    return min(100, score)
+
+def calculate_timing_score(value_ms: int, good_ms: int, poor_ms: int, points: int) -> int:
+    if value_ms <= good_ms:
+        return points
+    if value_ms >= poor_ms:
+        return 0
+    return points * (poor_ms - value_ms) // (poor_ms - good_ms)
+
+def calculate_redirect_score(redirect_count: int) -> int:
+    if redirect_count == 0:
+        return 15
+    return 8 if redirect_count == 1 else 0
+
+def calculate_performance_score(ttfb_ms: int, total_ms: int, decoded_bytes: int, compressed: bool,
+                                redirect_count: int, thresholds: Optional[Dict] = None) -> int:
+    t = thresholds or DEFAULT_THRESHOLDS
+    # Tiny documents gain nothing from compression, so they are not penalized for skipping it
+    compression_ok = compressed or decoded_bytes < t['compress_min_bytes']
+    score = (
+        calculate_timing_score(ttfb_ms, t['ttfb_good_ms'], t['ttfb_poor_ms'], 40) +
+        calculate_timing_score(total_ms, t['load_good_ms'], t['load_poor_ms'], 25) +
+        (20 if compression_ok else 0) +
+        calculate_redirect_score(redirect_count)
+    )
+    return min(100, score)
+
 def get_status(score: int) -> str:
     if score >= 80:
         return 'passed'
@@ -0,0 +1,239 @@
+from array import array
+from typing import Dict, Optional
+from src.config import SCORE_WEIGHTS, KEYWORD_SCORE_WEIGHTS
+from src.core.scoring import DEFAULT_THRESHOLDS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Each function mirrors its scalar counterpart in scoring.py operation for operation, so the
+# float64 intermediates (and therefore the truncated integer scores) are bit-for-bit the same.
+
+def is_available() -> bool:
+    return np is not None
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('Vectorized scoring requires numpy (pip install numpy)')
+
+def _to_score(values):
+    return np.clip(np.trunc(values), 0, 100).astype(np.int64)
+
+def calculate_keyword_scores(
+    in_title,
+    in_meta,
+    in_h1,
+    in_headings,
+    in_first_100_words,
+    density_score,
+    distribution_score,
+    weights: Optional[Dict[str, float]] = None
+):
+    _require_numpy()
+    weights = weights or KEYWORD_SCORE_WEIGHTS
+    score = (
+        np.where(np.asarray(in_title, dtype=bool), 100, 0) * weights['title_match'] +
+        np.where(np.asarray(in_meta, dtype=bool), 100, 0) * weights['meta_match'] +
+        np.where(np.asarray(in_h1, dtype=bool), 100, 0) * weights['h1_match'] +
+        np.minimum(100, np.asarray(in_headings, dtype=np.int64) * 50) * weights['headings_match'] +
+        np.where(np.asarray(in_first_100_words, dtype=bool), 100, 0) * weights['first_100_words'] +
+        np.asarray(density_score, dtype=np.float64) * weights['density_score'] +
+        np.asarray(distribution_score, dtype=np.float64) * weights['distribution_score']
+    )
+    
+    return _to_score(score)
+
+def calculate_overall_scores(
+    keyword_score,
+    technical_score,
+    content_score,
+    structure_score,
+    link_score,
+    weights: Optional[Dict[str, float]] = None,
+    performance_score=None,
+    has_performance=None
+):
+    _require_numpy()
+    weights = weights or SCORE_WEIGHTS
+    overall = (
+        np.asarray(keyword_score, dtype=np.int64) * weights['keyword_analysis'] +
+        np.asarray(technical_score, dtype=np.int64) * weights['technical_seo'] +
+        np.asarray(content_score, dtype=np.int64) * weights['content_analysis'] +
+        np.asarray(structure_score, dtype=np.int64) * weights['structure'] +
+        np.asarray(link_score, dtype=np.int64) * weights['links']
+    )
+    
+    if performance_score is not None:
+        performance_weight = weights.get('performance', 0.0)
+        blended = overall * (1 - performance_weight) + np.asarray(performance_score, dtype=np.int64) * performance_weight
+        overall = blended if has_performance is None else np.where(np.asarray(has_performance, dtype=bool), blended, overall)
+    
+    return _to_score(overall)
+
+def calculate_density_scores(density, thresholds: Optional[Dict] = None):
+    _require_numpy()
+    t = thresholds or DEFAULT_THRESHOLDS
+    density = np.asarray(density, dtype=np.float64)
+    low, high = t['keyword_density_min'], t['keyword_density_max']
+    
+    return np.where(
+        (low <= density) & (density <= high), 100.0,
+        np.where(density < low, (density / low) * 100, np.maximum(0, 100 - (density - high) * 20))
+    )
+
+def calculate_technical_scores(title_present, title_length, meta_present, meta_length,
+                               has_canonical, og_present, og_complete, thresholds: Optional[Dict] = None):
+    _require_numpy()
+    t = thresholds or DEFAULT_THRESHOLDS
+    title_present = np.asarray(title_present, dtype=bool)
+    meta_present = np.asarray(meta_present, dtype=bool)
+    title_length = np.asarray(title_length)
+    meta_length = np.asarray(meta_length)
+    
+    title = np.where(title_present, 15 + np.where(
+        (t['title_length_min'] <= title_length) & (title_length <= t['title_length_max']), 15, 0), 0)
+    meta = np.where(meta_present, 12 + np.where(
+        (t['meta_length_min'] <= meta_length) & (meta_length <= t['meta_length_max']), 13, 0), 0)
+    canonical = np.where(np.asarray(has_canonical, dtype=bool), 10, 0)
+    open_graph = np.where(np.asarray(og_complete, dtype=bool), 15, np.where(np.asarray(og_present, dtype=bool), 7, 0))
+    
+    return np.minimum(100, title + meta + canonical + open_graph + 10).astype(np.int64)
+
+def calculate_content_scores(word_count, avg_density, thresholds: Optional[Dict] = None):
+    _require_numpy()
+    t = thresholds or DEFAULT_THRESHOLDS
+    word_count = np.asarray(word_count, dtype=np.float64)
+    avg_density = np.asarray(avg_density, dtype=np.float64)
+    low, high = t['keyword_density_min'], t['keyword_density_max']
+    
+    word_count_score = np.where(word_count >= t['min_word_count'], 50.0, (word_count / t['min_word_count']) * 50)
+    density_health_score = np.where(
+        (low <= avg_density) & (avg_density <= high), 50.0,
+        np.where(avg_density < low, (avg_density / low) * 50, np.maximum(0, 50 - (avg_density - high) * 10))
+    )
+    
+    return np.trunc(word_count_score + density_health_score).astype(np.int64)
+
+def calculate_structure_scores(h1_count, images_without_alt):
+    _require_numpy()
+    h1_count = np.asarray(h1_count, dtype=np.int64)
+    h1 = np.where(h1_count == 0, 0, np.where(h1_count == 1, 30, 15))
+    images = np.maximum(0, 15 - np.asarray(images_without_alt, dtype=np.int64) * 3)
+    return np.minimum(100, h1 + 25 + images + 35)
+
+def calculate_link_health_scores(checked, broken, redirected):
+    _require_numpy()
+    checked = np.asarray(checked, dtype=np.int64)
+    safe_checked = np.maximum(checked, 1)
+    working = 25 * (checked - np.asarray(broken, dtype=np.int64)) // safe_checked
+    direct = 15 * (checked - np.asarray(redirected, dtype=np.int64)) // safe_checked
+    return np.where(checked > 0, working + direct, 25 + 15)
+
+def calculate_link_scores(internal_count, external_count, thresholds: Optional[Dict] = None,
+                          checked=0, broken=0, redirected=0):
+    _require_numpy()
+    t = thresholds or DEFAULT_THRESHOLDS
+    internal_count = np.asarray(internal_count, dtype=np.float64)
+    internal = np.where(
+        internal_count < t['internal_links_min'],
+        np.trunc((internal_count / t['internal_links_min']) * 35), 35
+    ).astype(np.int64)
+    external = np.where(np.asarray(external_count) > 0, 25, 0)
+    return np.minimum(100, internal + external + calculate_link_health_scores(checked, broken, redirected))
+
+def calculate_timing_scores(value_ms, good_ms: int, poor_ms: int, points: int):
+    _require_numpy()
+    value_ms = np.asarray(value_ms, dtype=np.int64)
+    partial = points * (poor_ms - value_ms) // (poor_ms - good_ms)
+    return np.where(value_ms <= good_ms, points, np.where(value_ms >= poor_ms, 0, partial))
+
+def calculate_performance_scores(ttfb_ms, total_ms, decoded_bytes, compressed, redirect_count,
+                                 thresholds: Optional[Dict] = None):
+    _require_numpy()
+    t = thresholds or DEFAULT_THRESHOLDS
+    compression_ok = np.asarray(compressed, dtype=bool) | (np.asarray(decoded_bytes) < t['compress_min_bytes'])
+    redirect_count = np.asarray(redirect_count, dtype=np.int64)
+    score = (
+        calculate_timing_scores(ttfb_ms, t['ttfb_good_ms'], t['ttfb_poor_ms'], 40) +
+        calculate_timing_scores(total_ms, t['load_good_ms'], t['load_poor_ms'], 25) +
+        np.where(compression_ok, 20, 0) +
+        np.where(redirect_count == 0, 15, np.where(redirect_count == 1, 8, 0))
+    )
+    return np.minimum(100, score)
+
+def get_statuses(scores):
+    _require_numpy()
+    scores = np.asarray(scores)
+    return np.where(scores >= 80, 'passed', np.where(scores >= 60, 'warning', 'failed'))
+
+def _column(values):
+    # Feature table columns are stdlib arrays; frombuffer views them without copying
+    if isinstance(values, array):
+        return np.frombuffer(values, dtype=np.dtype(values.typecode))
+    return np.asarray(values)
+
+def rescore_arrays(
+    pages: Dict,
+    keywords: Dict,
+    weights: Optional[Dict[str, float]] = None,
+    keyword_weights: Optional[Dict[str, float]] = None,
+    thresholds: Optional[Dict] = None
+) -> Dict:
+    _require_numpy()
+    pages = {name: _column(values) for name, values in pages.items()}
+    keywords = {name: _column(values) for name, values in keywords.items()}
+    
+    rows = len(pages['overall_score'])
+    counts = pages['keyword_count'].astype(np.int64)
+    # Keyword rows are laid out page by page, so each one belongs to the page whose run it falls in
+    owners = np.repeat(np.arange(rows), counts)
+    kw_rows = (np.repeat(pages['keyword_start'].astype(np.int64), counts) +
+               np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+    
+    density = keywords['density'][kw_rows]
+    kw_scores = calculate_keyword_scores(
+        keywords['in_title'][kw_rows],
+        keywords['in_meta'][kw_rows],
+        keywords['in_h1'][kw_rows],
+        keywords['headings_matched'][kw_rows],
+        keywords['in_first_100_words'][kw_rows],
+        calculate_density_scores(density, thresholds),
+        keywords['distribution_score'][kw_rows],
+        keyword_weights
+    )
+    
+    safe_counts = np.maximum(counts, 1)
+    keyword_totals = np.bincount(owners, weights=kw_scores, minlength=rows)
+    density_totals = np.bincount(owners, weights=density, minlength=rows)
+    keyword_score = np.where(counts > 0, np.trunc(keyword_totals / safe_counts), 0).astype(np.int64)
+    avg_density = np.where(counts > 0, density_totals / safe_counts, 0.0)
+    
+    technical = calculate_technical_scores(
+        pages['title_present'], pages['title_length'], pages['meta_present'], pages['meta_length'],
+        pages['has_canonical'], pages['og_present'], pages['og_complete'], thresholds
+    )
+    content = calculate_content_scores(pages['word_count'], avg_density, thresholds)
+    structure = calculate_structure_scores(pages['h1_count'], pages['images_without_alt'])
+    links = calculate_link_scores(
+        pages['internal_links'], pages['external_links'], thresholds,
+        pages['links_checked'], pages['links_broken'], pages['links_redirected']
+    )
+    has_timing = pages['has_timing'].astype(bool)
+    performance = np.where(has_timing, calculate_performance_scores(
+        pages['ttfb_ms'], pages['total_ms'], pages['decoded_bytes'], pages['compressed'], pages['redirect_count'],
+        thresholds
+    ), 0)
+    overall = calculate_overall_scores(keyword_score, technical, content, structure, links, weights,
+                                       performance, has_timing)
+    
+    return {
+        'keyword_analysis': keyword_score,
+        'technical_seo': technical,
+        'content_analysis': content,
+        'structure': structure,
+        'links': links,
+        'performance': performance,
+        'overall': overall
+    }
@@ -2,8 +2,13 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich import box
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from typing import List, Optional
+from rich.live import Live
+from rich.console import Group
 from src.core.orchestrator import AnalysisReport
+from src.core.batch import BatchResult, BatchTotals
+from src.core.batch_progress import BatchProgress
+from src.config import DASHBOARD_REFRESH_PER_SECOND
 
 console = Console()
 
@@ -52,6 +57,9 @@ def render_report(report: AnalysisReport, verbose: bool = False):
         
         console.print()
     
+    if report.keyword_clusters:
+        render_keyword_clusters(report.keyword_clusters)
+    
     console.print("━" * 60, style="blue")
     console.print()
     
@@ -72,6 +80,9 @@ def render_report(report: AnalysisReport, verbose: bool = False):
     if verbose and 'h1' in report.structure_analysis.details:
         h1_info = report.structure_analysis.details['h1']
         console.print(f"   └─ H1 Count: {h1_info['count']}")
+    image_weight = report.structure_analysis.details.get('images', {}).get('weight')
+    if image_weight:
+        render_image_weight(image_weight)
     console.print()
     
     console.print(f"{get_score_icon(report.link_analysis.score)} [bold]Links: {report.link_analysis.score}/100[/bold]")
@@ -80,8 +91,17 @@ def render_report(report: AnalysisReport, verbose: bool = False):
         external = report.link_analysis.details['external_links']['count']
         console.print(f"   ├─ Internal Links: {internal}")
         console.print(f"   └─ External Links: {external}")
+    health = report.link_analysis.details.get('health')
+    if health:
+        render_link_health(health)
     console.print()
     
+    if report.performance:
+        render_performance(report.performance, verbose)
+    
+    if verbose and report.timings:
+        render_timings(report.timings)
+    
     if report.ai_analysis:
         if report.ai_analysis.status == 'failed':
             console.print("━" * 60, style="blue")
@@ -162,6 +182,15 @@ def render_report(report: AnalysisReport, verbose: bool = False):
                 for i, rec in enumerate(ai_details['ai_recommendations'], 1):
                     console.print(f"   {i}. {rec}")
                 console.print()
+            
+            if verbose and 'usage' in ai_details:
+                usage = ai_details['usage']
+                console.print("[bold]⏱️  AI Usage:[/bold]")
+                console.print(f"   ├─ Mode: {usage['mode']} ({usage['calls']} call(s))")
+                console.print(f"   ├─ Input Tokens: {usage['input_tokens']}")
+                console.print(f"   ├─ Output Tokens: {usage['output_tokens']}")
+                console.print(f"   └─ Latency: {usage['total_latency_ms']:.0f} ms")
+                console.print()
     
     if report.top_recommendations:
         console.print("━" * 60, style="blue")
@@ -177,6 +206,304 @@ def render_report(report: AnalysisReport, verbose: bool = False):
     console.print("━" * 60, style="blue")
     console.print()
 
+def render_keyword_clusters(clusters):
+    console.print("[bold]🧩 Keyword Clusters:[/bold]")
+    
+    table = Table(box=box.SIMPLE)
+    table.add_column("Cluster")
+    table.add_column("Score", justify="right")
+    table.add_column("Weakest Keyword")
+    
+    for cluster in sorted(clusters, key=lambda c: c.cluster_score):
+        color = get_score_color(cluster.cluster_score)
+        weakest = min(cluster.individual_scores, key=lambda ks: ks.score, default=None)
+        table.add_row(
+            cluster.name or ', '.join(cluster.keywords),
+            f"[{color}]{cluster.cluster_score}/100[/{color}]",
+            f'"{weakest.keyword}" ({weakest.score})' if weakest else '-'
+        )
+    
+    console.print(table)
+    console.print()
+
+def render_link_health(health: dict):
+    console.print(f"   Checked {health['checked']} link(s): "
+                  f"{len(health['broken'])} broken, {len(health['redirects'])} redirected")
+    for link in health['broken']:
+        reason = link['status'] if link['status'] is not None else link['error']
+        console.print(f"   ├─ [red]✗ {link['url']}[/red] ({reason})")
+    for link in health['redirects']:
+        chain = ' → '.join(str(status) for status in link['chain'])
+        console.print(f"   ├─ [yellow]↪ {link['url']}[/yellow] ({chain}) → {link['final_url']}")
+
+def render_performance(performance, verbose: bool = False):
+    timing = performance.details
+    console.print(f"{get_score_icon(performance.score)} [bold]Performance: {performance.score}/100[/bold]")
+    console.print(f"   ├─ Time to First Byte: {timing['ttfb_ms']} ms")
+    console.print(f"   ├─ Total Download: {timing['total_ms']} ms")
+    if verbose:
+        console.print(f"   ├─ DNS / Connect / TLS: {timing['dns_ms']} / {timing['connect_ms']} / {timing['tls_ms']} ms")
+        console.print(f"   ├─ Protocol: {timing['http_version'] or 'unknown'}")
+    compression = timing['compression'] or "none"
+    console.print(f"   ├─ Size: {format_bytes(timing['transfer_bytes'])} transferred, "
+                  f"{format_bytes(timing['decoded_bytes'])} decoded (compression: {compression})")
+    redirects = ' → '.join(str(hop['status']) for hop in timing['redirects']) or "none"
+    console.print(f"   └─ Redirects: {redirects}")
+    console.print()
+
+def render_timings(timings: dict):
+    console.print("[bold]⏱️  Analysis Timings:[/bold]")
+    entries = list(timings.items())
+    for i, (name, ms) in enumerate(entries):
+        branch = "└─" if i == len(entries) - 1 else "├─"
+        console.print(f"   {branch} {name}: {ms:.1f} ms")
+    console.print()
+
+def render_span_totals(totals, elapsed: float):
+    # Per-stage totals for a --profile run; stages nest (extract.* inside extract), so shares can add up past 100%
+    table = Table(box=box.SIMPLE, title=f"Stage Timings ({elapsed:.1f}s wall clock)")
+    table.add_column("Stage")
+    for column in ("Calls", "Total", "Mean", "Share"):
+        table.add_column(column, justify="right")
+    for name, count, total_ms in totals.items():
+        share = total_ms / (elapsed * 1000) if elapsed > 0 else 0.0
+        table.add_row(name, str(count), f"{total_ms / 1000:.2f} s", f"{total_ms / count:.1f} ms", f"{share:.0%}")
+    console.print(table)
+
+def render_memory_profile(peak: int, stages, allocators):
+    console.print(f"[bold]🧠 Memory Profile[/bold] (peak traced: {format_bytes(peak)})")
+    table = Table(box=box.SIMPLE, title="Peak Memory per Stage")
+    table.add_column("Stage")
+    for column in ("Calls", "Peak Added", "Left Allocated"):
+        table.add_column(column, justify="right")
+    for name, calls, stage_peak, net in stages:
+        table.add_row(name, str(calls), format_bytes(stage_peak), format_bytes(max(net, 0)))
+    console.print(table)
+    
+    table = Table(box=box.SIMPLE, title="Top Allocators (held at the end of the run)")
+    table.add_column("Location")
+    table.add_column("Size", justify="right")
+    table.add_column("Blocks", justify="right")
+    for location, size, count in allocators:
+        table.add_row(location, format_bytes(size), str(count))
+    console.print(table)
+
+def format_bytes(size) -> str:
+    if size is None:
+        return "size unknown"
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.0f} KB"
+
+def render_image_weight(weight: dict):
+    console.print(f"   Probed {weight['probed']} image(s), {format_bytes(weight['total_bytes'])} total: "
+                  f"{len(weight['oversized'])} oversized, {len(weight['legacy_format'])} legacy format")
+    for image in weight['oversized']:
+        dimensions = f", {image['width']}×{image['height']}" if image['width'] else ""
+        console.print(f"   ├─ [red]⚖ {image['url']}[/red] ({format_bytes(image['bytes'])}{dimensions})")
+    for image in weight['legacy_format']:
+        console.print(f"   ├─ [yellow]{image['format'].upper()} {image['url']}[/yellow] ({format_bytes(image['bytes'])})")
+    for image in weight['failed']:
+        reason = image['status'] if image['status'] is not None else image['error']
+        console.print(f"   ├─ [red]✗ {image['url']}[/red] ({reason})")
+
+def render_batch_result(result: BatchResult):
+    if result.report is None:
+        console.print(f"❌ [red]{result.url}[/red] - {result.error}")
+        return
+    
+    score = result.report.overall_score
+    score_color = get_score_color(score)
+    reused = " [dim](unchanged, reused)[/dim]" if result.reused else ""
+    console.print(f"{get_score_icon(score)} [{score_color}]{score:>3}/100[/{score_color}] {result.url}{reused}")
+    if result.error:
+        console.print(f"   [yellow]⚠️  {result.error}[/yellow]")
+    health = result.report.link_analysis.details.get('health')
+    if health and (health['broken'] or health['redirects']):
+        render_link_health(health)
+    image_weight = result.report.structure_analysis.details.get('images', {}).get('weight')
+    if image_weight and (image_weight['oversized'] or image_weight['failed']):
+        render_image_weight(image_weight)
+
+def render_batch_summary(totals: BatchTotals):
+    console.print()
+    console.print("━" * 60, style="blue")
+    console.print("[bold blue]📊 BATCH SUMMARY[/bold blue]", justify="center")
+    console.print("━" * 60, style="blue")
+    console.print(f"   ├─ Pages Analyzed: {totals.analyzed}")
+    console.print(f"   ├─ Failed: {totals.failed}")
+    if totals.reused:
+        ratio = totals.reused / totals.analyzed * 100
+        saved = totals.saved_ms / 1000
+        console.print(f"   ├─ Reused (unchanged): {totals.reused} ({ratio:.0f}%), {saved:.1f}s analysis time saved")
+    if totals.analyzed:
+        average = totals.score_total / totals.analyzed
+        console.print(f"   └─ Average Score: [{get_score_color(int(average))}]{average:.1f}/100[/{get_score_color(int(average))}]")
+    console.print()
+    if totals.analyzed:
+        render_batch_stats(totals.stats)
+
+def render_batch_stats(stats):
+    table = Table(box=box.SIMPLE, title="Score Distribution")
+    table.add_column("Module")
+    for column in ("Pages", "Mean", "p50", "p90", "p99"):
+        table.add_column(column, justify="right")
+    for name, row in stats.module_quantiles().items():
+        table.add_row(name.replace('_', ' ').title().replace('Seo', 'SEO'), str(row['pages']), f"{row['mean']:.1f}",
+                      *(f"[{get_score_color(row[p])}]{row[p]}[/{get_score_color(row[p])}]" for p in ('p50', 'p90', 'p99')))
+    console.print(table)
+    
+    for name, row in stats.timing_quantiles().items():
+        label = "Time to First Byte" if name == 'ttfb_ms' else "Total Download"
+        console.print(f"   {label}: p50 {row['p50']} ms, p90 {row['p90']} ms, p99 {row['p99']} ms")
+    
+    coverage = stats.keyword_coverage()
+    if coverage:
+        table = Table(box=box.SIMPLE, title="Keyword Coverage (share of pages)")
+        table.add_column("Keyword")
+        for column in ("Title", "Meta", "H1", "Headings", "First 100 Words"):
+            table.add_column(column, justify="right")
+        for keyword, rates in coverage.items():
+            table.add_row(keyword, *(f"{rate:.0%}" for rate in rates.values()))
+        console.print(table)
+    
+    recommendations = stats.frequent_recommendations()
+    if recommendations:
+        console.print("[bold]💡 Most Frequent Recommendations:[/bold]")
+        for entry in recommendations:
+            console.print(f"   {entry['count']:>6} × {entry['recommendation']}")
+        console.print()
+    
+    console.print("[bold]⚠️  Lowest-Scoring Pages:[/bold]")
+    for score, url in stats.worst_pages.items():
+        console.print(f"   [{get_score_color(score)}]{score:>3}/100[/{get_score_color(score)}] {url}")
+    console.print()
+
+def render_rescore_summary(urls: List[str], previous, scores, elapsed: float, top: int = 10):
+    new = scores['overall']
+    count = len(new)
+    
+    console.print()
+    console.print("━" * 60, style="blue")
+    console.print("[bold blue]📊 RESCORE SUMMARY[/bold blue]", justify="center")
+    console.print("━" * 60, style="blue")
+    console.print(f"   ├─ Pages Rescored: {count} in {elapsed:.2f}s")
+    if not count:
+        console.print()
+        return
+    
+    changed = sum(1 for before, after in zip(previous, new) if before != after)
+    console.print(f"   ├─ Scores Changed: {changed}")
+    console.print(f"   └─ Average Score: {sum(previous) / count:.1f} → {sum(new) / count:.1f}")
+    
+    movers = sorted(range(count), key=lambda i: abs(new[i] - previous[i]), reverse=True)[:top]
+    movers = [i for i in movers if new[i] != previous[i]]
+    if movers:
+        table = Table(box=box.SIMPLE)
+        table.add_column("URL")
+        table.add_column("Before", justify="right")
+        table.add_column("After", justify="right")
+        for i in movers:
+            color = get_score_color(new[i])
+            table.add_row(urls[i], str(previous[i]), f"[{color}]{new[i]}[/{color}]")
+        console.print(table)
+    console.print()
+
+def render_link_graph_summary(graph, stats, top: int = 10):
+    crawled = [s for s in stats if s.crawled]
+    orphans = [s for s in crawled if s.orphan]
+    unreachable = [s for s in crawled if s.depth is None]
+    depths = [s.depth for s in crawled if s.depth is not None]
+    
+    console.print()
+    console.print("━" * 60, style="blue")
+    console.print("[bold blue]🕸️  INTERNAL LINK GRAPH[/bold blue]", justify="center")
+    console.print("━" * 60, style="blue")
+    console.print(f"   ├─ Pages: {len(crawled)} crawled, {len(stats) - len(crawled)} discovered")
+    console.print(f"   ├─ Internal Links: {graph.edge_count}")
+    if depths:
+        console.print(f"   ├─ Click Depth: max {max(depths)}, avg {sum(depths) / len(depths):.1f} from {graph.root_url}")
+    console.print(f"   ├─ Unreachable From Homepage: {len(unreachable)}")
+    console.print(f"   └─ Orphan Pages: {len(orphans)}")
+    for page in orphans[:top]:
+        console.print(f"      ⚠️  {page.url}", style="yellow")
+    
+    table = Table(box=box.SIMPLE, title="Top Link Equity")
+    table.add_column("URL")
+    table.add_column("PageRank", justify="right")
+    table.add_column("In", justify="right")
+    table.add_column("Depth", justify="right")
+    for page in sorted(stats, key=lambda s: s.pagerank, reverse=True)[:top]:
+        table.add_row(page.url, f"{page.pagerank:.4f}", str(page.in_links),
+                      '-' if page.depth is None else str(page.depth))
+    console.print(table)
+    console.print()
+
+def render_dashboard(snapshot: dict):
+    total = snapshot['total']
+    done = snapshot['completed'] + snapshot['failed']
+    header = Table.grid(padding=(0, 3))
+    for _ in range(4):
+        header.add_column()
+    header.add_row(
+        f"[bold]Pages[/bold] {done}" + (f"/{total}" if total else ""),
+        f"[bold]Rate[/bold] {snapshot['recent_pages_per_second']:.1f}/s "
+        f"[dim](avg {snapshot['pages_per_second']:.1f}/s)[/dim]",
+        f"[bold]Queued[/bold] {snapshot['queued']}  [bold]In flight[/bold] {snapshot['in_flight']}",
+        f"[bold]Elapsed[/bold] {snapshot['elapsed']:.0f}s"
+    )
+    header.add_row(
+        f"[bold]Errors[/bold] [{'red' if snapshot['failed'] else 'green'}]{snapshot['failed']}[/]",
+        f"[bold]Retries[/bold] {snapshot['retries']} [dim]({snapshot['rate_limited']} rate limited)[/dim]",
+        f"[bold]AI queued[/bold] {snapshot['ai_queued']}  [bold]AI in flight[/bold] {snapshot['ai_in_flight']}",
+        f"[bold]Reused[/bold] {snapshot['reused']}"
+    )
+    
+    latency = Table(box=box.SIMPLE, title="Stage Latency (ms)")
+    latency.add_column("Stage")
+    for column in ("p50", "p90", "p99"):
+        latency.add_column(column, justify="right")
+    for stage, row in snapshot['latency'].items():
+        latency.add_row(stage, *(f"{row[p]:.0f}" for p in ("p50", "p90", "p99")))
+    
+    counts = snapshot['score_counts']
+    buckets = [sum(counts[low:low + 10]) + (counts[100] if low == 90 else 0) for low in range(0, 100, 10)]
+    widest = max(buckets) or 1
+    histogram = Table(box=box.SIMPLE, title="Scores")
+    histogram.add_column("Range")
+    histogram.add_column("Pages", justify="right")
+    histogram.add_column("")
+    for index, count in enumerate(buckets):
+        low = index * 10
+        color = get_score_color(low)
+        histogram.add_row(f"{low}-{low + 9 if low < 90 else 100}", str(count),
+                          f"[{color}]{'█' * round(count / widest * 30)}[/{color}]")
+    
+    panels = Table.grid(padding=(0, 2))
+    panels.add_row(latency, histogram)
+    return Panel(Group(header, panels), title="📈 Batch Progress", border_style="blue")
+
+class BatchDashboard:
+    # Live view of a running batch. Rich redraws it from its own thread at a fixed rate, reading a
+    # snapshot each time, so workers never wait on the terminal. Off when stdout is not a terminal.
+    def __init__(self, progress: BatchProgress, refresh_per_second: float = DASHBOARD_REFRESH_PER_SECOND,
+                 enabled: Optional[bool] = None):
+        self.progress = progress
+        self.enabled = console.is_terminal if enabled is None else enabled
+        self._live = Live(
+            get_renderable=lambda: render_dashboard(progress.snapshot()),
+            console=console, refresh_per_second=refresh_per_second, transient=True
+        ) if self.enabled else None
+    
+    def __enter__(self):
+        if self._live is not None:
+            self._live.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        if self._live is not None:
+            self._live.stop()
+
 def get_score_color(score: int) -> str:
     if score >= 80:
         return "green"
@@ -195,11 +522,3 @@ def get_score_icon(score: int) -> str:
 
 def format_bool(value: bool) -> str:
     return "[green]✓ Yes[/green]" if value else "[red]✗ No[/red]"
-
-def show_progress(message: str):
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
-        progress.add_task(description=message, total=None)
@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+from array import array
+from typing import Dict, Tuple
+from src.core.features import PAGE_FEATURES, KEYWORD_FEATURES, extract_features
+
+SCHEMA_FILE = 'schema.json'
+URLS_FILE = 'urls.txt'
+SCHEMA_VERSION = 1
+
+def _column_path(directory: str, table: str, column: str) -> str:
+    return os.path.join(directory, f'{table}.{column}.bin')
+
+class FeatureTableWriter:
+    def __init__(self, directory: str, buffer_rows: int = 10000):
+        self.directory = directory
+        self.buffer_rows = buffer_rows
+        os.makedirs(directory, exist_ok=True)
+        
+        self.page_rows = 0
+        self.keyword_rows = 0
+        self._pages = {column: array(code) for column, code in PAGE_FEATURES.items()}
+        self._keywords = {column: array(code) for column, code in KEYWORD_FEATURES.items()}
+        self._urls = []
+        
+        # Start a fresh table; columns are appended to as buffers fill up
+        for table, columns in (('pages', PAGE_FEATURES), ('keywords', KEYWORD_FEATURES)):
+            for column in columns:
+                open(_column_path(directory, table, column), 'wb').close()
+        open(os.path.join(directory, URLS_FILE), 'w').close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def add_report(self, report):
+        page, keywords = extract_features(report)
+        page['keyword_start'] = self.keyword_rows
+        page['keyword_count'] = len(keywords)
+        
+        for column, value in page.items():
+            self._pages[column].append(value)
+        for keyword in keywords:
+            for column, value in keyword.items():
+                self._keywords[column].append(value)
+        
+        self._urls.append(report.url)
+        self.page_rows += 1
+        self.keyword_rows += len(keywords)
+        
+        if len(self._urls) >= self.buffer_rows:
+            self.flush()
+    
+    def flush(self):
+        for table, buffers in (('pages', self._pages), ('keywords', self._keywords)):
+            for column, values in buffers.items():
+                with open(_column_path(self.directory, table, column), 'ab') as f:
+                    values.tofile(f)
+                del values[:]
+        
+        with open(os.path.join(self.directory, URLS_FILE), 'a', encoding='utf-8') as f:
+            f.writelines(url + '\n' for url in self._urls)
+        self._urls = []
+    
+    def close(self):
+        self.flush()
+        schema = {
+            'version': SCHEMA_VERSION,
+            'byteorder': sys.byteorder,
+            'pages': {'rows': self.page_rows, 'columns': PAGE_FEATURES},
+            'keywords': {'rows': self.keyword_rows, 'columns': KEYWORD_FEATURES}
+        }
+        with open(os.path.join(self.directory, SCHEMA_FILE), 'w', encoding='utf-8') as f:
+            json.dump(schema, f, indent=2)
+
+def load_feature_table(directory: str) -> Tuple[Dict[str, array], Dict[str, array], list]:
+    schema_path = os.path.join(directory, SCHEMA_FILE)
+    if not os.path.exists(schema_path):
+        raise ValueError(f'No feature table found in {directory}')
+    
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    
+    if schema.get('version') != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported feature table version: {schema.get('version')}")
+    
+    tables = {}
+    for table in ('pages', 'keywords'):
+        rows = schema[table]['rows']
+        columns = {}
+        stored = schema[table]['columns']
+        for column, code in stored.items():
+            values = array(code)
+            with open(_column_path(directory, table, column), 'rb') as f:
+                values.fromfile(f, rows)
+            if schema['byteorder'] != sys.byteorder:
+                values.byteswap()
+            columns[column] = values
+        
+        # Columns added after a table was written load as zeros, which score like the old behaviour
+        for column, code in (PAGE_FEATURES if table == 'pages' else KEYWORD_FEATURES).items():
+            if column not in columns:
+                columns[column] = array(code, bytes(array(code).itemsize * rows))
+        tables[table] = columns
+    
+    with open(os.path.join(directory, URLS_FILE), 'r', encoding='utf-8') as f:
+        urls = f.read().splitlines()
+    
+    return tables['pages'], tables['keywords'], urls
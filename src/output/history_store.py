@@ -0,0 +1,265 @@
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.core.orchestrator import AnalysisReport
+from src.output.report_codec import dumps_report, loads_report
+from src.config import STORE_BATCH_SIZE
+
+MODULES = ('technical_seo', 'content_analysis', 'structure_analysis', 'link_analysis', 'performance', 'ai_analysis')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    id INTEGER PRIMARY KEY,
+    keyword TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS modules (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS page_results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    url_id INTEGER NOT NULL REFERENCES urls(id),
+    analyzed_at TEXT NOT NULL,
+    overall_score INTEGER NOT NULL,
+    cluster_score INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_page_results_url_run ON page_results(url_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_page_results_run ON page_results(run_id, overall_score);
+CREATE TABLE IF NOT EXISTS module_scores (
+    result_id INTEGER NOT NULL REFERENCES page_results(id),
+    module_id INTEGER NOT NULL REFERENCES modules(id),
+    score INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (result_id, module_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_module_scores_module ON module_scores(module_id, score);
+CREATE TABLE IF NOT EXISTS keyword_scores (
+    result_id INTEGER NOT NULL REFERENCES page_results(id),
+    keyword_id INTEGER NOT NULL REFERENCES keywords(id),
+    score INTEGER NOT NULL,
+    in_title INTEGER NOT NULL,
+    in_meta INTEGER NOT NULL,
+    in_h1 INTEGER NOT NULL,
+    in_first_100_words INTEGER NOT NULL,
+    density REAL NOT NULL,
+    PRIMARY KEY (result_id, keyword_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_keyword_scores_keyword ON keyword_scores(keyword_id, score);
+CREATE TABLE IF NOT EXISTS page_cache (
+    url_id INTEGER PRIMARY KEY REFERENCES urls(id),
+    fingerprint TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    analysis_ms REAL NOT NULL,
+    report BLOB NOT NULL
+);
+"""
+
+# SQLite's default limit on bound parameters is 999
+_LOOKUP_CHUNK = 900
+
+class ResultsStore:
+    def __init__(self, path: str, batch_size: int = STORE_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        self.conn.executescript(SCHEMA)
+        self._pending = []
+        self._pending_pages = []
+        self._ids = {'urls': {}, 'keywords': {}, 'modules': {}}
+        self._lock = threading.RLock()
+        self.stats = {'analyzed': 0, 'reused': 0, 'saved_ms': 0.0}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        self.flush()
+        self.conn.close()
+    
+    def start_run(self, label: Optional[str] = None) -> int:
+        with self._lock:
+            cursor = self.conn.execute(
+                'INSERT INTO runs (started_at, label) VALUES (?, ?)',
+                (datetime.now().isoformat(), label)
+            )
+            return cursor.lastrowid
+    
+    def add_report(self, run_id: int, report: AnalysisReport):
+        with self._lock:
+            self._pending.append((run_id, report))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+    
+    def record(self, run_id: int, analysis, signature: str):
+        # Stores a PageAnalysis from the orchestrator along with the fingerprint it can be reused under
+        with self._lock:
+            if analysis.reused:
+                self.stats['reused'] += 1
+                self.stats['saved_ms'] += analysis.saved_ms
+            else:
+                self.stats['analyzed'] += 1
+            self._pending_pages.append((analysis.report.url, analysis.fingerprint, signature,
+                                        analysis.analysis_ms, analysis.report))
+            self.add_report(run_id, analysis.report)
+    
+    def load_page(self, url: str, fingerprint: str, signature: str) -> Optional[Tuple[AnalysisReport, float]]:
+        with self._lock:
+            row = self.conn.execute(
+                """
+                SELECT c.report, c.analysis_ms
+                FROM page_cache c JOIN urls u ON u.id = c.url_id
+                WHERE u.url = ? AND c.fingerprint = ? AND c.signature = ?
+                """,
+                (url, fingerprint, signature)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return loads_report(row[0]), row[1]
+        except ValueError:
+            # Written by an older encoding (or an older pickle-based cache): analyze the page again
+            return None
+    
+    def add_reports(self, run_id: int, reports: Iterable[AnalysisReport]):
+        for report in reports:
+            self.add_report(run_id, report)
+        self.flush()
+    
+    def flush(self):
+        with self._lock:
+            if self._pending or self._pending_pages:
+                self._write_pending()
+    
+    def _write_pending(self):
+        pending, self._pending = self._pending, []
+        pages, self._pending_pages = self._pending_pages, []
+        
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            url_ids = self._lookup_ids('urls', 'url', {report.url for _, report in pending} | {page[0] for page in pages})
+            keyword_ids = self._lookup_ids('keywords', 'keyword', {
+                ks.keyword for _, report in pending for ks in report.keyword_cluster.individual_scores
+            })
+            module_ids = self._lookup_ids('modules', 'name', set(MODULES))
+            
+            # Result ids are assigned here so child rows can be bulk inserted without per-row round trips
+            next_id = self.conn.execute('SELECT COALESCE(MAX(id), 0) FROM page_results').fetchone()[0] + 1
+            
+            result_rows, module_rows, keyword_rows = [], [], []
+            for offset, (run_id, report) in enumerate(pending):
+                result_id = next_id + offset
+                result_rows.append((
+                    result_id, run_id, url_ids[report.url], report.analyzed_at,
+                    report.overall_score, report.keyword_cluster.cluster_score
+                ))
+                
+                for module in MODULES:
+                    result = getattr(report, module)
+                    if result is not None:
+                        module_rows.append((result_id, module_ids[module], result.score, result.status))
+                
+                for ks in report.keyword_cluster.individual_scores:
+                    keyword_rows.append((
+                        result_id, keyword_ids[ks.keyword], ks.score, int(ks.in_title), int(ks.in_meta),
+                        int(ks.in_h1), int(ks.in_first_100_words), ks.density
+                    ))
+            
+            self.conn.executemany('INSERT INTO page_results VALUES (?, ?, ?, ?, ?, ?)', result_rows)
+            self.conn.executemany('INSERT INTO module_scores VALUES (?, ?, ?, ?)', module_rows)
+            self.conn.executemany('INSERT OR REPLACE INTO keyword_scores VALUES (?, ?, ?, ?, ?, ?, ?, ?)', keyword_rows)
+            self.conn.executemany('INSERT OR REPLACE INTO page_cache VALUES (?, ?, ?, ?, ?)', [
+                (url_ids[url], fingerprint, signature, analysis_ms, dumps_report(report))
+                for url, fingerprint, signature, analysis_ms, report in pages
+            ])
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+    
+    def score_trend(self, url: str, module: Optional[str] = None) -> List[Tuple[int, str, int]]:
+        if module is None:
+            query = """
+                SELECT r.run_id, r.analyzed_at, r.overall_score
+                FROM page_results r JOIN urls u ON u.id = r.url_id
+                WHERE u.url = ?
+                ORDER BY r.run_id, r.id
+            """
+            params = (url,)
+        else:
+            query = """
+                SELECT r.run_id, r.analyzed_at, m.score
+                FROM page_results r
+                JOIN urls u ON u.id = r.url_id
+                JOIN module_scores m ON m.result_id = r.id
+                JOIN modules mo ON mo.id = m.module_id
+                WHERE u.url = ? AND mo.name = ?
+                ORDER BY r.run_id, r.id
+            """
+            params = (url, module)
+        with self._lock:
+            return [tuple(row) for row in self.conn.execute(query, params)]
+    
+    def score_drops(self, module: str, previous_run: Optional[int] = None, current_run: Optional[int] = None,
+                    min_drop: int = 1) -> List[Tuple[str, int, int]]:
+        with self._lock:
+            return self._score_drops(module, previous_run, current_run, min_drop)
+    
+    def _score_drops(self, module, previous_run, current_run, min_drop):
+        if previous_run is None or current_run is None:
+            runs = [row[0] for row in self.conn.execute('SELECT id FROM runs ORDER BY id DESC LIMIT 2')]
+            if len(runs) < 2:
+                return []
+            current_run, previous_run = runs
+        
+        query = """
+            SELECT u.url, before.score, after.score
+            FROM page_results cur
+            JOIN page_results prev ON prev.url_id = cur.url_id AND prev.run_id = ?
+            JOIN module_scores after ON after.result_id = cur.id AND after.module_id = ?
+            JOIN module_scores before ON before.result_id = prev.id AND before.module_id = ?
+            JOIN urls u ON u.id = cur.url_id
+            WHERE cur.run_id = ? AND before.score - after.score >= ?
+            ORDER BY before.score - after.score DESC
+        """
+        module_id = self._lookup_ids('modules', 'name', {module}).get(module)
+        rows = self.conn.execute(query, (previous_run, module_id, module_id, current_run, min_drop))
+        return [tuple(row) for row in rows]
+    
+    def _lookup_ids(self, table: str, column: str, values: set) -> Dict[str, int]:
+        cache = self._ids[table]
+        missing = [v for v in values if v not in cache]
+        
+        if missing:
+            self.conn.executemany(f'INSERT OR IGNORE INTO {table} ({column}) VALUES (?)', [(v,) for v in missing])
+            for start in range(0, len(missing), _LOOKUP_CHUNK):
+                chunk = missing[start:start + _LOOKUP_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                for row_id, value in self.conn.execute(
+                    f'SELECT id, {column} FROM {table} WHERE {column} IN ({placeholders})', chunk
+                ):
+                    cache[value] = row_id
+        
+        if table == 'urls' and len(cache) > 200000:
+            # Keep the url id cache from growing without bound on very large crawls
+            retained = {v: cache[v] for v in values}
+            cache.clear()
+            cache.update(retained)
+        
+        return {v: cache[v] for v in values}
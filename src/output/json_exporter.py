@@ -1,8 +1,25 @@
 import json
 from dataclasses import asdict
+from typing import List
 from src.core.orchestrator import AnalysisReport
+from src.output.report_codec import encode_report, CODEC_VERSION
+from src.utils.spans import span
 
-def export_to_json(report: AnalysisReport, filepath: str):
+def cluster_to_dict(cluster) -> dict:
+    return {
+        'cluster_score': cluster.cluster_score,
+        'individual_keywords': [
+            {
+                'keyword': ks.keyword,
+                'score': ks.score,
+                'findings': ks.findings,
+                'recommendations': ks.recommendations
+            }
+            for ks in cluster.individual_scores
+        ]
+    }
+
+def report_to_dict(report: AnalysisReport) -> dict:
     report_dict = {
         'meta': {
             'url': report.url,
@@ -10,18 +27,7 @@ def export_to_json(report: AnalysisReport, filepath: str):
             'keywords_analyzed': report.keyword_cluster.keywords
         },
         'overall_score': report.overall_score,
-        'keyword_analysis': {
-            'cluster_score': report.keyword_cluster.cluster_score,
-            'individual_keywords': [
-                {
-                    'keyword': ks.keyword,
-                    'score': ks.score,
-                    'findings': ks.findings,
-                    'recommendations': ks.recommendations
-                }
-                for ks in report.keyword_cluster.individual_scores
-            ]
-        },
+        'keyword_analysis': cluster_to_dict(report.keyword_cluster),
         'technical_seo': {
             'score': report.technical_seo.score,
             'status': report.technical_seo.status,
@@ -33,7 +39,8 @@ def export_to_json(report: AnalysisReport, filepath: str):
             'status': report.content_analysis.status,
             'details': {
                 'word_count': report.content_analysis.details['word_count'],
-                'adequate_length': report.content_analysis.details['adequate_length']
+                'adequate_length': report.content_analysis.details['adequate_length'],
+                'avg_keyword_density': report.content_analysis.details.get('avg_keyword_density')
             },
             'recommendations': report.content_analysis.recommendations
         },
@@ -52,5 +59,80 @@ def export_to_json(report: AnalysisReport, filepath: str):
         'top_recommendations': report.top_recommendations
     }
     
+    if report.performance:
+        report_dict['performance'] = {
+            'score': report.performance.score,
+            'status': report.performance.status,
+            'details': report.performance.details,
+            'recommendations': report.performance.recommendations
+        }
+    
+    if report.ai_analysis:
+        report_dict['ai_analysis'] = {
+            'score': report.ai_analysis.score,
+            'status': report.ai_analysis.status,
+            'details': report.ai_analysis.details,
+            'recommendations': report.ai_analysis.recommendations
+        }
+    
+    if report.keyword_clusters:
+        report_dict['keyword_clusters'] = [
+            {'name': cluster.name, 'keywords': cluster.keywords, **cluster_to_dict(cluster)}
+            for cluster in report.keyword_clusters
+        ]
+    
+    if report.timings:
+        report_dict['timings_ms'] = report.timings
+    
+    return report_dict
+
+def batch_result_to_dict(result) -> dict:
+    # Full report encoding, so report_codec.load_reports can turn each line back into a report
+    if result.report is None:
+        return {'version': CODEC_VERSION, 'url': result.url, 'error': result.error}
+    
+    result_dict = encode_report(result.report)
+    if result.error:
+        result_dict['error'] = result.error
+    if result.reused:
+        result_dict['reused'] = True
+    return result_dict
+
+@span('export.json')
+def export_to_json(report: AnalysisReport, filepath: str):
+    report_dict = report_to_dict(report)
+    
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(report_dict, f, indent=2, ensure_ascii=False)
+
+@span('export.json')
+def export_batch_to_json(reports: List[AnalysisReport], filepath: str):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump([report_to_dict(report) for report in reports], f, indent=2, ensure_ascii=False)
+
+def export_batch_stats_to_json(stats, filepath: str):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(stats.to_dict(), f, indent=2, ensure_ascii=False)
+
+def export_rescore_to_json(urls: List[str], previous, scores, filepath: str):
+    rows = [
+        {
+            'url': url,
+            'previous_score': previous[i],
+            'overall_score': scores['overall'][i],
+            'module_scores': {name: values[i] for name, values in scores.items() if name != 'overall'}
+        }
+        for i, url in enumerate(urls)
+    ]
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(rows, f, indent=2, ensure_ascii=False)
+
+def export_link_graph_to_json(graph, stats, filepath: str):
+    graph_dict = {
+        'root_url': graph.root_url,
+        'pages': len(stats),
+        'edges': graph.edge_count,
+        'nodes': [asdict(page) for page in stats]
+    }
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(graph_dict, f, indent=2, ensure_ascii=False)
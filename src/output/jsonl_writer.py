@@ -0,0 +1,102 @@
+import os
+import gzip
+import json
+from typing import Dict, Iterator, List, Optional
+from src.utils.spans import span
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_line(record: Dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+def loads_line(line: bytes) -> Dict:
+    # orjson.JSONDecodeError subclasses ValueError, like json's, so callers catch one error type
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+def part_path(path: str, part: int) -> str:
+    # batch.jsonl.gz -> batch.jsonl.gz, batch.1.jsonl.gz, batch.2.jsonl.gz, ...
+    if part == 0:
+        return path
+    compressed = path.endswith('.gz')
+    stem, ext = os.path.splitext(path[:-3] if compressed else path)
+    return f"{stem}.{part}{ext}" + ('.gz' if compressed else '')
+
+class JsonLinesWriter:
+    # Every record is flushed as soon as it is written, so a crash loses at most the record being
+    # written and memory use does not depend on how many records the run produces
+    def __init__(self, path: str, max_bytes: Optional[int] = None, compress: Optional[bool] = None,
+                 fsync: bool = False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress = path.endswith('.gz') if compress is None else compress
+        self.fsync = fsync
+        self.paths: List[str] = []
+        self.records = 0
+        self._raw = None
+        self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    @span('export.jsonl')
+    def write(self, record: Dict):
+        if self._file is None:
+            self._open(len(self.paths))
+        
+        self._file.write(dumps_line(record))
+        # For gzip this is a sync flush: everything written so far can be decompressed from disk
+        self._file.flush()
+        if self._file is not self._raw:
+            self._raw.flush()
+        if self.fsync:
+            os.fsync(self._raw.fileno())
+        self.records += 1
+        
+        if self.max_bytes and self._raw.tell() >= self.max_bytes:
+            # The next part is opened lazily, so rotation never leaves an empty trailing file
+            self._close_part()
+    
+    def close(self):
+        self._close_part()
+    
+    def _open(self, part: int):
+        path = part_path(self.path, part)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._raw = open(path, 'wb')
+        self._file = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=6) if self.compress else self._raw
+        self.paths.append(path)
+    
+    def _close_part(self):
+        if self._file is None:
+            return
+        if self._file is not self._raw:
+            self._file.close()
+        self._raw.close()
+        self._file = None
+        self._raw = None
+
+def read_json_lines(path: str) -> Iterator[Dict]:
+    # A run that crashed mid-write can leave a truncated last line (or gzip stream); stop there
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        try:
+            for line in f:
+                try:
+                    yield loads_line(line)
+                except ValueError:
+                    return
+        except EOFError:
+            return
@@ -0,0 +1,115 @@
+import json
+from typing import Dict, Iterator
+from src.analyzers.content_analyzer import ClusterScore, KeywordScore
+from src.core.orchestrator import AnalysisReport
+from src.core.scoring import ModuleResult
+from src.output.jsonl_writer import read_json_lines
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bump when the encoded layout changes; decode_report refuses versions it does not know
+CODEC_VERSION = 1
+
+# Module fields of AnalysisReport that may be None
+OPTIONAL_MODULES = ('ai_analysis', 'performance')
+
+def _encode_module(result: ModuleResult) -> Dict:
+    return {
+        'module_name': result.module_name,
+        'score': result.score,
+        'status': result.status,
+        'details': result.details,
+        'recommendations': result.recommendations
+    }
+
+def _decode_module(data: Dict) -> ModuleResult:
+    return ModuleResult(data['module_name'], data['score'], data['status'], data['details'], data['recommendations'])
+
+def _encode_cluster(cluster: ClusterScore) -> Dict:
+    # Field by field rather than dataclasses.asdict, which deep-copies every nested value
+    return {
+        'keywords': cluster.keywords,
+        'cluster_score': cluster.cluster_score,
+        'name': cluster.name,
+        'individual_scores': [
+            # Positional, in KeywordScore field order: keyword rows dominate large exports
+            [ks.keyword, ks.score, ks.in_title, ks.in_meta, ks.in_h1, ks.in_headings, ks.in_first_100_words,
+             ks.density, ks.distribution_score, ks.findings, ks.recommendations]
+            for ks in cluster.individual_scores
+        ]
+    }
+
+def _decode_cluster(data: Dict) -> ClusterScore:
+    return ClusterScore(
+        data['keywords'], data['cluster_score'], [KeywordScore(*fields) for fields in data['individual_scores']],
+        data['name']
+    )
+
+def encode_report(report: AnalysisReport) -> Dict:
+    # The content analyzer's details hold the report's own keyword cluster; it is stored once and
+    # put back on decode
+    content_details = {k: v for k, v in report.content_analysis.details.items() if k != 'keyword_cluster'}
+    content = _encode_module(report.content_analysis)
+    content['details'] = content_details
+    
+    data = {
+        'version': CODEC_VERSION,
+        'url': report.url,
+        'analyzed_at': report.analyzed_at,
+        'overall_score': report.overall_score,
+        'keyword_cluster': _encode_cluster(report.keyword_cluster),
+        'technical_seo': _encode_module(report.technical_seo),
+        'content_analysis': content,
+        'structure_analysis': _encode_module(report.structure_analysis),
+        'link_analysis': _encode_module(report.link_analysis),
+        'top_recommendations': report.top_recommendations,
+        'keyword_clusters': [_encode_cluster(cluster) for cluster in report.keyword_clusters],
+        'timings': report.timings
+    }
+    for name in OPTIONAL_MODULES:
+        result = getattr(report, name)
+        data[name] = _encode_module(result) if result else None
+    return data
+
+def decode_report(data: Dict) -> AnalysisReport:
+    version = data.get('version')
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported report encoding version: {version} (expected {CODEC_VERSION})")
+    
+    keyword_cluster = _decode_cluster(data['keyword_cluster'])
+    content = _decode_module(data['content_analysis'])
+    content.details['keyword_cluster'] = keyword_cluster
+    
+    optional = {name: _decode_module(data[name]) if data.get(name) else None for name in OPTIONAL_MODULES}
+    return AnalysisReport(
+        url=data['url'],
+        analyzed_at=data['analyzed_at'],
+        overall_score=data['overall_score'],
+        keyword_cluster=keyword_cluster,
+        technical_seo=_decode_module(data['technical_seo']),
+        content_analysis=content,
+        structure_analysis=_decode_module(data['structure_analysis']),
+        link_analysis=_decode_module(data['link_analysis']),
+        top_recommendations=data['top_recommendations'],
+        keyword_clusters=[_decode_cluster(cluster) for cluster in data['keyword_clusters']],
+        timings=data.get('timings', {}),
+        **optional
+    )
+
+def dumps_report(report: AnalysisReport) -> bytes:
+    data = encode_report(report)
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def loads_report(raw: bytes) -> AnalysisReport:
+    return decode_report(orjson.loads(raw) if orjson is not None else json.loads(raw))
+
+def load_reports(path: str) -> Iterator[AnalysisReport]:
+    # Reads the reports back out of a --jsonl batch export; lines for failed pages are skipped
+    for record in read_json_lines(path):
+        if 'keyword_cluster' in record:
+            yield decode_report(record)
@@ -0,0 +1,182 @@
+import os
+import csv
+from typing import Dict, List
+from src.core.features import PAGE_FEATURES, KEYWORD_FEATURES, extract_features
+from src.core.orchestrator import distinct_clusters
+from src.core.scoring import get_status
+from src.utils.spans import span
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+FORMATS = ('csv', 'parquet')
+
+# Score/status column prefix -> AnalysisReport attribute (None when the module did not run)
+MODULE_RESULTS = {
+    'technical_seo': 'technical_seo',
+    'content_analysis': 'content_analysis',
+    'structure': 'structure_analysis',
+    'links': 'link_analysis',
+    'performance': 'performance',
+    'ai': 'ai_analysis'
+}
+
+# Column name -> array typecode as in PAGE_FEATURES, with 's' for text
+PAGE_COLUMNS = {
+    'url': 's',
+    'analyzed_at': 's',
+    'overall_score': 'B',
+    'overall_status': 's',
+    'keyword_analysis_score': 'B',
+    'keyword_analysis_status': 's',
+    **{f'{name}_{field}': code for name in MODULE_RESULTS for field, code in (('score', 'B'), ('status', 's'))},
+    **{name: code for name, code in PAGE_FEATURES.items() if name not in ('overall_score', 'keyword_start')},
+    'recommendation_count': 'H',
+    'top_recommendation': 's'
+}
+
+KEYWORD_COLUMNS = {
+    'url': 's',
+    'cluster': 's',
+    'keyword': 's',
+    'score': 'B',
+    'status': 's',
+    **KEYWORD_FEATURES
+}
+
+def is_available(fmt: str) -> bool:
+    return fmt == 'csv' or pyarrow is not None
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+
+def _arrow_schema(columns: Dict[str, str]):
+    types = {
+        's': pyarrow.string(), 'B': pyarrow.uint8(), 'H': pyarrow.uint16(), 'I': pyarrow.uint32(),
+        'Q': pyarrow.uint64(), 'd': pyarrow.float64()
+    }
+    return pyarrow.schema([(name, types[code]) for name, code in columns.items()])
+
+def page_row(report) -> tuple:
+    page, _ = extract_features(report)
+    row = {
+        'url': report.url,
+        'analyzed_at': report.analyzed_at,
+        'overall_score': report.overall_score,
+        'overall_status': get_status(report.overall_score),
+        'keyword_analysis_score': report.keyword_cluster.cluster_score,
+        'keyword_analysis_status': get_status(report.keyword_cluster.cluster_score),
+        'keyword_count': len(report.keyword_cluster.individual_scores),
+        'recommendation_count': len(report.top_recommendations),
+        'top_recommendation': report.top_recommendations[0] if report.top_recommendations else None
+    }
+    for name, attribute in MODULE_RESULTS.items():
+        result = getattr(report, attribute)
+        row[f'{name}_score'] = result.score if result else None
+        row[f'{name}_status'] = result.status if result else None
+    row.update((name, value) for name, value in page.items() if name in PAGE_COLUMNS)
+    return tuple(row[name] for name in PAGE_COLUMNS)
+
+def keyword_rows(report) -> List[tuple]:
+    rows = []
+    for cluster in distinct_clusters(report):
+        for ks in cluster.individual_scores:
+            row = {
+                'url': report.url,
+                'cluster': cluster.name,
+                'keyword': ks.keyword,
+                'score': ks.score,
+                'status': get_status(ks.score),
+                'in_title': int(ks.in_title),
+                'in_meta': int(ks.in_meta),
+                'in_h1': int(ks.in_h1),
+                'headings_matched': len(ks.in_headings),
+                'in_first_100_words': int(ks.in_first_100_words),
+                'density': ks.density,
+                'distribution_score': ks.distribution_score
+            }
+            rows.append(tuple(row[name] for name in KEYWORD_COLUMNS))
+    return rows
+
+class _CsvTable:
+    def __init__(self, path: str, columns: Dict[str, str]):
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+    
+    def write(self, rows: List[tuple]):
+        self._writer.writerows(rows)
+        self._file.flush()
+    
+    def close(self):
+        self._file.close()
+
+class _ParquetTable:
+    # Each flushed chunk becomes one row group, so readers can also stream the file back in chunks
+    def __init__(self, path: str, columns: Dict[str, str]):
+        self._schema = _arrow_schema(columns)
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+    
+    def write(self, rows: List[tuple]):
+        arrays = [
+            pyarrow.array(values, type=field.type)
+            for values, field in zip(zip(*rows), self._schema)
+        ]
+        self._writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self._schema))
+    
+    def close(self):
+        self._writer.close()
+
+class TableExporter:
+    # Writes pages.<fmt> (one row per page) and keywords.<fmt> (one row per page x keyword) in
+    # chunks of chunk_rows, so memory stays the same for a thousand rows or a million
+    def __init__(self, directory: str, fmt: str = 'csv', chunk_rows: int = 10000):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown table format: {fmt} (expected one of {', '.join(FORMATS)})")
+        if fmt == 'parquet':
+            _require_pyarrow()
+        
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.page_rows = 0
+        self.keyword_rows = 0
+        os.makedirs(directory, exist_ok=True)
+        
+        table_class = _ParquetTable if fmt == 'parquet' else _CsvTable
+        self.paths = [os.path.join(directory, f'{table}.{fmt}') for table in ('pages', 'keywords')]
+        self._pages = table_class(self.paths[0], PAGE_COLUMNS)
+        self._keywords = table_class(self.paths[1], KEYWORD_COLUMNS)
+        self._page_buffer: List[tuple] = []
+        self._keyword_buffer: List[tuple] = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    @span('export.table')
+    def add_report(self, report):
+        self._page_buffer.append(page_row(report))
+        self._keyword_buffer.extend(keyword_rows(report))
+        
+        if len(self._page_buffer) >= self.chunk_rows or len(self._keyword_buffer) >= self.chunk_rows:
+            self.flush()
+    
+    def flush(self):
+        for table, buffer in ((self._pages, self._page_buffer), (self._keywords, self._keyword_buffer)):
+            if buffer:
+                table.write(buffer)
+        self.page_rows += len(self._page_buffer)
+        self.keyword_rows += len(self._keyword_buffer)
+        self._page_buffer = []
+        self._keyword_buffer = []
+    
+    def close(self):
+        self.flush()
+        self._pages.close()
+        self._keywords.close()
@@ -0,0 +1,114 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from bs4 import BeautifulSoup
+
+from src.analyzers.ai_analyzer import AIAnalyzer
+from src.core.fetcher import WebContent
+from src.core.keyword_processor import process_keywords
+from src.core.llm_cache import LLMResponseCache
+from src.core.llm_providers import OpenAIProvider
+
+
+SAMPLE_HTML = """
+<html>
+  <head><title>Python SEO Guide</title></head>
+  <body><h1>Python SEO Guide</h1><p>Learn Python SEO step by step.</p></body>
+</html>
+"""
+
+TITLE = "Python SEO Guide: Practical Steps to Rank Higher in 2026"
+META = ("Learn Python SEO with a practical, step-by-step guide covering keywords, metadata, "
+        "structure and links. Start improving your rankings today with proven tips.")
+
+INSIGHTS = {
+    "recommendations": ["Add FAQ schema", "Expand intro", "Add internal links"],
+    "optimized_title": TITLE,
+    "optimized_meta_description": META,
+    "content_quality": {
+        "readability": 7, "engagement": 6, "keyword_stuffing_risk": 2,
+        "content_value": 7, "keyword_targeting": 8, "summary": "Solid",
+    },
+    "grammar_analysis": {
+        "grammar_score": 9, "issues_found": 1, "title_improvement": "", "meta_improvement": "",
+        "grammar_suggestions": ["Fix comma"], "readability_tips": ["Shorter sentences"],
+        "seo_preserved": True,
+    },
+}
+
+
+def _completion(payload, prompt_tokens=100, completion_tokens=20):
+    text = payload if isinstance(payload, str) else json.dumps(payload)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+    )
+
+
+def _analyzer(monkeypatch, responses, consolidated, cache=None):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    soup = BeautifulSoup(SAMPLE_HTML, "lxml")
+    content = WebContent("https://example.com", SAMPLE_HTML, soup)
+    client = MagicMock()
+    client.chat.completions.create.side_effect = responses
+    return AIAnalyzer(content, process_keywords(["python seo"]), {"technical": 50},
+                      consolidated=consolidated, cache=cache, provider=OpenAIProvider(client=client))
+
+
+class TestConsolidatedMode:
+    def test_single_call(self, monkeypatch):
+        analyzer = _analyzer(monkeypatch, [_completion(INSIGHTS, 400)], consolidated=True)
+        result = analyzer.analyze()
+
+        assert result.status == "passed"
+        assert result.details["optimized_title"] == TITLE
+        assert result.details["content_quality_analysis"]["readability"] == 7
+        usage = result.details["usage"]
+        assert usage["mode"] == "consolidated"
+        assert usage["calls"] == 1
+        assert usage["input_tokens"] == 400
+        assert usage["fallback_fields"] == []
+
+    def test_invalid_field_falls_back(self, monkeypatch):
+        invalid = dict(INSIGHTS, optimized_title="Too short")
+        analyzer = _analyzer(monkeypatch, [_completion(invalid), _completion(TITLE)], consolidated=True)
+        result = analyzer.analyze()
+
+        assert result.details["optimized_title"] == TITLE
+        assert result.details["usage"]["calls"] == 2
+        assert result.details["usage"]["fallback_fields"] == ["optimized_title"]
+
+
+class TestPerFieldMode:
+    def test_five_calls(self, monkeypatch):
+        responses = [
+            _completion({"recommendations": INSIGHTS["recommendations"]}),
+            _completion(TITLE),
+            _completion(META),
+            _completion(INSIGHTS["content_quality"]),
+            _completion(INSIGHTS["grammar_analysis"]),
+        ]
+        analyzer = _analyzer(monkeypatch, responses, consolidated=False)
+        result = analyzer.analyze()
+
+        assert result.details["usage"]["mode"] == "per_field"
+        assert result.details["usage"]["calls"] == 5
+        assert result.details["usage"]["input_tokens"] == 500
+        assert result.details["optimized_meta_description"] == META
+
+
+class TestResponseCache:
+    def test_second_run_is_served_from_cache(self, monkeypatch, tmp_path):
+        cache = LLMResponseCache(str(tmp_path))
+        first = _analyzer(monkeypatch, [_completion(INSIGHTS)], consolidated=True, cache=cache).analyze()
+        assert first.details["cache"] == {"enabled": True, "hits": 0, "misses": 1}
+
+        second_analyzer = _analyzer(monkeypatch, [], consolidated=True, cache=cache)
+        second = second_analyzer.analyze()
+
+        assert second_analyzer.provider.client.chat.completions.create.call_count == 0
+        assert second.details["cache"]["hits"] == 1
+        assert second.details["usage"]["calls"] == 0
+        assert second.details["optimized_title"] == TITLE
@@ -62,3 +62,26 @@ def test_link_analyzer_returns_module_result():
     result = LinkAnalyzer(_sample_content(), _keywords()).analyze()
     assert isinstance(result, ModuleResult)
     assert 0 <= result.score <= 100
+
+
+def test_content_analyzer_scores_extra_clusters_like_separate_runs():
+    analyzer = ContentAnalyzer(_sample_content(), _keywords())
+    analyzer.analyze()
+    cluster = analyzer.score_cluster(process_keywords(["seo guide", "rankings"]), name="guides")
+
+    separate = ContentAnalyzer(_sample_content(), process_keywords(["seo guide", "rankings"])).analyze()
+    expected = separate.details["keyword_cluster"]
+    assert cluster.name == "guides"
+    assert cluster.cluster_score == expected.cluster_score
+    assert cluster.individual_scores == expected.individual_scores
+
+
+def test_build_report_includes_one_cluster_score_per_cluster():
+    from src.core.orchestrator import build_report, process_clusters
+
+    clusters = process_clusters([("primary", ["python seo", "beginners"]), ("docs", ["python docs"])])
+    report = build_report(_sample_content(), _keywords(), clusters)
+
+    assert [c.name for c in report.keyword_clusters] == ["primary", "docs"]
+    assert report.keyword_clusters[0].cluster_score == report.keyword_cluster.cluster_score
+    assert report.keyword_clusters[1].keywords == ["python docs"]
@@ -0,0 +1,92 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from unittest.mock import patch
+
+from src.core.batch import run_batch
+from src.core.fetcher import RawPage
+from src.core.orchestrator import PageAnalysis
+from src.core.scoring import ModuleResult
+
+from src.tests.test_features import _reports
+
+
+class _Tracker:
+    # Stands in for analyze_page and records how many pages were taken but not yet handed out
+    def __init__(self, report):
+        self.report = report
+        self.outstanding = 0
+        self.max_outstanding = 0
+        self.lock = threading.Lock()
+
+    def analyze_page(self, url, *args, **kwargs):
+        with self.lock:
+            self.outstanding += 1
+            self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        time.sleep(0.002)
+        return PageAnalysis(RawPage(url, "", b""), None, replace(self.report, url=url), "")
+
+    def handed_out(self):
+        with self.lock:
+            self.outstanding -= 1
+
+
+def _run(tracker, urls, **kwargs):
+    results = []
+    with patch("src.core.batch.analyze_page", tracker.analyze_page):
+        for result in run_batch(urls, ["python seo"], **kwargs):
+            results.append(result.url)
+            tracker.handed_out()
+            # A slow consumer, so workers would run ahead of it without the intake window
+            time.sleep(0.003)
+    return results
+
+
+class _SlowScheduler:
+    # Stands in for LLMScheduler under a tight rate limit: one AI request at a time, each slower than a page
+    def __init__(self):
+        self.pool = ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, priority, fn):
+        def slow():
+            time.sleep(0.01)
+            return fn()
+        return self.pool.submit(slow)
+
+
+class TestBatchIntake:
+    def test_takes_pages_in_a_bounded_window(self):
+        tracker = _Tracker(_reports()[0])
+        urls = [f"https://example.com/{i}" for i in range(100)]
+
+        with patch("src.core.batch.BATCH_QUEUE_PER_WORKER", 2):
+            results = _run(tracker, urls, workers=3)
+
+        assert sorted(results) == sorted(urls)
+        assert tracker.max_outstanding <= 6
+
+    def test_rss_ceiling_takes_one_page_at_a_time(self):
+        tracker = _Tracker(_reports()[0])
+        urls = [f"https://example.com/{i}" for i in range(20)]
+
+        with patch("src.core.batch.process_rss_bytes", return_value=2 * 1024 * 1024):
+            results = _run(tracker, urls, workers=4, max_rss_bytes=1024 * 1024)
+
+        assert sorted(results) == sorted(urls)
+        assert tracker.max_outstanding == 1
+
+    def test_pages_awaiting_ai_count_towards_the_window(self):
+        tracker = _Tracker(_reports()[0])
+        urls = [f"https://example.com/{i}" for i in range(40)]
+        scheduler = _SlowScheduler()
+        ai_result = ModuleResult("AI SEO Assistant", 70, "good", {}, [])
+
+        with patch("src.core.batch.BATCH_QUEUE_PER_WORKER", 2), \
+                patch("src.core.batch.run_ai_analysis", return_value=ai_result):
+            results = _run(tracker, urls, workers=3, use_ai=True, ai_cache=False, scheduler=scheduler,
+                           provider=object())
+        scheduler.pool.shutdown()
+
+        assert sorted(results) == sorted(urls)
+        assert tracker.max_outstanding <= 6
@@ -0,0 +1,91 @@
+import io
+from unittest.mock import patch
+
+from rich.console import Console
+
+from src.core.batch import run_batch
+from src.core.batch_progress import BatchProgress
+from src.core.fetch_timing import FetchTiming
+from src.core.fetcher import RawPage
+from src.core.orchestrator import PageAnalysis
+from src.output import cli_renderer
+from src.output.cli_renderer import BatchDashboard, render_dashboard
+
+from src.tests.test_features import _reports
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fake_analyze(reports):
+    by_url = {report.url: report for report in reports}
+
+    def analyze_page(url, *args, **kwargs):
+        if url not in by_url:
+            raise Exception("Failed to fetch URL: 404")
+        page = RawPage(url, "", b"", FetchTiming(total_ms=120.0))
+        return PageAnalysis(page, None, by_url[url], "", analysis_ms=30.0)
+
+    return analyze_page
+
+
+class TestBatchProgress:
+    def test_counts_stages_and_scores_during_run(self):
+        reports = _reports()
+        urls = [r.url for r in reports] + ["https://example.com/missing"]
+        progress = BatchProgress(total=len(urls))
+
+        with patch("src.core.batch.analyze_page", _fake_analyze(reports)):
+            results = list(run_batch(urls, ["python seo"], workers=2, progress=progress))
+
+        snapshot = progress.snapshot()
+        assert len(results) == 4
+        assert (snapshot["completed"], snapshot["failed"]) == (3, 1)
+        assert (snapshot["queued"], snapshot["in_flight"]) == (0, 0)
+        assert abs(snapshot["latency"]["fetch"]["p50"] - 120) <= 1.5
+        assert abs(snapshot["latency"]["analyze"]["p99"] - 30) <= 0.5
+        assert sum(snapshot["score_counts"]) == 3
+        assert snapshot["score_counts"][reports[0].overall_score] >= 1
+
+    def test_recent_rate_uses_snapshot_window(self):
+        clock = _Clock()
+        progress = BatchProgress(clock=clock)
+        progress.snapshot()
+        for _ in range(30):
+            progress.page_queued()
+            progress.page_started()
+            progress.page_analyzed(100.0, 10.0)
+            progress.page_finished(80)
+        clock.now = 2.0
+        snapshot = progress.snapshot()
+
+        assert snapshot["recent_pages_per_second"] == 15.0
+        assert snapshot["pages_per_second"] == 15.0
+
+
+class TestDashboard:
+    def test_renders_snapshot(self):
+        progress = BatchProgress(total=10)
+        progress.page_queued()
+        progress.page_started()
+        progress.page_analyzed(250.0, 40.0)
+        progress.page_finished(72)
+        console = Console(record=True, width=120)
+        console.print(render_dashboard(progress.snapshot()))
+        text = console.export_text()
+
+        assert "1/10" in text
+        assert "fetch" in text and "analyze" in text
+        assert "70-79" in text
+
+    def test_disabled_when_not_a_terminal(self):
+        with patch.object(cli_renderer, "console", Console(file=io.StringIO())):
+            dashboard = BatchDashboard(BatchProgress())
+        with dashboard:
+            pass
+        assert not dashboard.enabled
@@ -0,0 +1,94 @@
+import pickle
+import random
+from dataclasses import replace
+
+from src.core.batch_stats import BatchStats, recommendation_key
+from src.core.scoring import ModuleResult
+from src.utils.sketches import BottomK, HeavyHitters, LogHistogram, ScoreHistogram
+
+from src.tests.test_features import _reports
+
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[max(0, -(-int(q * 1000) * len(ordered) // 1000) - 1)]
+
+
+class TestSketches:
+    def test_score_histogram_is_exact(self):
+        rng = random.Random(3)
+        values = [rng.randint(0, 100) for _ in range(10001)]
+        histogram = ScoreHistogram()
+        for value in values:
+            histogram.add(value)
+
+        for q in (0.5, 0.9, 0.99):
+            assert histogram.quantile(q) == _exact_quantile(values, q)
+
+    def test_log_histogram_relative_error_and_merge(self):
+        rng = random.Random(4)
+        values = [rng.lognormvariate(6, 1) for _ in range(20000)]
+        left, right = LogHistogram(), LogHistogram()
+        for i, value in enumerate(values):
+            (left if i % 2 else right).add(value)
+        left.merge(right)
+
+        for q in (0.5, 0.9, 0.99):
+            exact = _exact_quantile(values, q)
+            assert abs(left.quantile(q) - exact) <= 0.011 * exact
+
+    def test_heavy_hitters_keep_frequent_items_across_merges(self):
+        rng = random.Random(5)
+        stream = ["frequent a"] * 500 + ["frequent b"] * 300 + [f"rare {i}" for i in range(2000)]
+        rng.shuffle(stream)
+        parts = [HeavyHitters(capacity=20) for _ in range(4)]
+        for i, item in enumerate(stream):
+            parts[i % 4].add(item)
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+
+        (first, first_count), (second, second_count) = merged.top(2)
+        assert (first, second) == ("frequent a", "frequent b")
+        assert 500 - len(stream) / 21 <= first_count <= 500
+        assert len(merged.counters) <= 20
+        assert merged.total == len(stream)
+
+    def test_bottom_k(self):
+        worst = BottomK(3)
+        for score, url in [(90, "a"), (12, "b"), (55, "c"), (70, "d"), (30, "e")]:
+            worst.add(score, url)
+
+        assert worst.items() == [(12, "b"), (30, "e"), (55, "c")]
+
+
+class TestBatchStats:
+    def test_rollup_and_merge_match_single_stream(self):
+        reports = _reports()
+        reports[0] = replace(reports[0], performance=ModuleResult(
+            "Performance", 90, "passed", {"ttfb_ms": 240, "total_ms": 610}, []
+        ))
+
+        single = BatchStats(worst_pages=2)
+        for report in reports:
+            single.add(report)
+        left, right = BatchStats(worst_pages=2), BatchStats(worst_pages=2)
+        left.add(reports[0])
+        for report in reports[1:]:
+            right.add(report)
+        left.merge(pickle.loads(pickle.dumps(right)))
+
+        summary = single.to_dict()
+        assert left.to_dict() == summary
+        assert summary["pages"] == 3
+        assert summary["scores"]["overall"]["p50"] == sorted(r.overall_score for r in reports)[1]
+        assert summary["scores"]["performance"]["pages"] == 1
+        assert summary["timings"]["ttfb_ms"]["p50"] in range(237, 244)
+        assert summary["keyword_coverage"]["python seo"]["in_title"] == 1.0
+        assert [page["url"] for page in summary["worst_pages"]] == [
+            r.url for r in sorted(reports, key=lambda r: r.overall_score)[:2]
+        ]
+
+    def test_recommendations_group_by_wording(self):
+        assert recommendation_key("Increase content length to at least 300 words (currently 212)") == \
+            recommendation_key("Increase content length to at least 300 words (currently 87)")
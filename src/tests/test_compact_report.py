@@ -0,0 +1,63 @@
+from bs4 import BeautifulSoup
+
+from src.core.compact_report import StringTable, compact_report, expand_report
+from src.core.fetcher import WebContent
+from src.core.keyword_processor import process_keywords
+from src.core.orchestrator import build_report, process_clusters
+
+from src.tests.test_ai_analyzer import SAMPLE_HTML
+from src.tests.test_report_codec import _full_report
+from src.tests.test_features import _reports
+
+
+class TestCompactReport:
+    def test_roundtrip_keeps_scores_keywords_and_recommendations(self):
+        report = _full_report()
+        strings = StringTable()
+        compact = compact_report(report, strings)
+        expanded = expand_report(compact, strings)
+
+        assert expanded.keyword_cluster == report.keyword_cluster
+        assert expanded.keyword_clusters == report.keyword_clusters
+        assert expanded.top_recommendations == report.top_recommendations
+        assert expanded.content_analysis.details["keyword_cluster"] is expanded.keyword_cluster
+        for name in ("technical_seo", "structure_analysis", "link_analysis", "performance", "ai_analysis"):
+            original, restored = getattr(report, name), getattr(expanded, name)
+            assert (restored.module_name, restored.score, restored.status, restored.recommendations) == (
+                original.module_name, original.score, original.status, original.recommendations
+            )
+
+    def test_roundtrip_with_clusters_file_stores_primary_once(self):
+        # As with --clusters-file and no -k: the first cluster repeats the primary keywords
+        content = WebContent("https://example.com/", SAMPLE_HTML, BeautifulSoup(SAMPLE_HTML, "lxml"))
+        clusters = process_clusters([("core", ["python seo", "tutorial"]), ("extra", ["guide"])])
+        report = build_report(content, process_keywords(["python seo", "tutorial"]), clusters)
+        strings = StringTable()
+        compact = compact_report(report, strings)
+        expanded = expand_report(compact, strings)
+
+        assert [cluster.name_id for cluster in compact.clusters] == [0, strings.intern("extra")]
+        assert expanded.keyword_cluster == report.keyword_cluster
+        assert expanded.keyword_clusters == report.keyword_clusters
+        assert [cluster.name for cluster in expanded.keyword_clusters] == ["core", "extra"]
+
+    def test_missing_modules_and_features(self):
+        report = _reports()[2]
+        compact = compact_report(report, StringTable())
+
+        assert compact.module_score("performance") is None
+        assert compact.module_score("technical_seo") == report.technical_seo.score
+        assert compact.feature("images_without_alt") == 1
+        assert list(compact.clusters[0].keyword_scores()) == [
+            ks.score for ks in report.keyword_cluster.individual_scores
+        ]
+
+    def test_strings_are_shared_across_reports(self):
+        strings = StringTable()
+        reports = _reports()
+        compacts = [compact_report(report, strings) for report in reports for _ in range(3)]
+        unique = {rec for report in reports for rec in report.top_recommendations}
+
+        assert len(strings) < sum(len(c.recommendation_ids) for c in compacts)
+        assert all(strings.intern(rec) < len(strings) for rec in unique)
+        assert strings.get(0) is None
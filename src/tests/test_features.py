@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.core.features import load_weights_profile, rescore
+from src.core.fetcher import WebContent
+from src.core.keyword_processor import process_keywords
+from src.core.orchestrator import build_report
+from src.output.feature_table import FeatureTableWriter, load_feature_table
+
+from src.tests.test_ai_analyzer import SAMPLE_HTML
+
+BARE_HTML = "<html><body><p>Short page without much on it.</p><img src='x.png'></body></html>"
+
+
+def _reports():
+    reports = []
+    for index, (html, keywords) in enumerate([
+        (SAMPLE_HTML, ["python seo"]),
+        (SAMPLE_HTML, ["python seo", "tutorial", "missing phrase"]),
+        (BARE_HTML, ["python"]),
+    ]):
+        content = WebContent(f"https://example.com/{index}", html, BeautifulSoup(html, "lxml"))
+        reports.append(build_report(content, process_keywords(keywords)))
+    return reports
+
+
+@pytest.fixture
+def table(tmp_path):
+    reports = _reports()
+    with FeatureTableWriter(str(tmp_path / "features"), buffer_rows=2) as writer:
+        for report in reports:
+            writer.add_report(report)
+    return reports, load_feature_table(str(tmp_path / "features"))
+
+
+class TestFeatureTable:
+    def test_roundtrip(self, table):
+        reports, (pages, keywords, urls) = table
+        assert urls == [r.url for r in reports]
+        assert list(pages["keyword_count"]) == [1, 3, 1]
+        assert list(pages["keyword_start"]) == [0, 1, 4]
+        assert len(keywords["density"]) == 5
+
+    def test_rescore_matches_analyzers(self, table):
+        reports, (pages, keywords, _) = table
+        scores = rescore(pages, keywords)
+
+        assert list(scores["overall"]) == [r.overall_score for r in reports]
+        assert list(scores["keyword_analysis"]) == [r.keyword_cluster.cluster_score for r in reports]
+        assert list(scores["technical_seo"]) == [r.technical_seo.score for r in reports]
+        assert list(scores["content_analysis"]) == [r.content_analysis.score for r in reports]
+        assert list(scores["structure"]) == [r.structure_analysis.score for r in reports]
+        assert list(scores["links"]) == [r.link_analysis.score for r in reports]
+
+    def test_weights_profile(self, table, tmp_path):
+        _, (pages, keywords, _) = table
+        profile = tmp_path / "profile.json"
+        profile.write_text(json.dumps({
+            "score_weights": {"keyword_analysis": 0.0, "technical_seo": 0.6},
+            "thresholds": {"min_word_count": 10},
+        }))
+
+        weights, keyword_weights, thresholds = load_weights_profile(str(profile))
+        assert weights["links"] == 0.10
+        assert thresholds["min_word_count"] == 10
+
+        default = rescore(pages, keywords)
+        changed = rescore(pages, keywords, weights, keyword_weights, thresholds)
+        assert list(changed["technical_seo"]) == list(default["technical_seo"])
+        assert list(changed["overall"]) != list(default["overall"])
+        assert changed["content_analysis"][0] >= default["content_analysis"][0]
+
+    def test_unknown_profile_keys_are_rejected(self, tmp_path):
+        profile = tmp_path / "profile.json"
+        profile.write_text(json.dumps({"score_weights": {"speed": 1.0}}))
+        with pytest.raises(ValueError):
+            load_weights_profile(str(profile))
@@ -1,8 +1,11 @@
 from unittest.mock import MagicMock, patch
 
+import pytest
 from bs4 import BeautifulSoup
 
-from src.core.fetcher import WebContent, fetch_content
+from src.core.fetcher import RawPage, WebContent, fetch_content, parse_page
+from src.core.keyword_processor import process_keywords
+from src.core.orchestrator import PageAnalysis, analyze_page
 
 
 SAMPLE_HTML = """
@@ -35,12 +38,49 @@ class TestWebContent:
         assert any(link["is_internal"] for link in content.links)
         assert any(link["is_external"] for link in content.links)
 
+    def test_extracts_head_tags_and_releases_parse_tree(self):
+        html = SAMPLE_HTML.replace(
+            "</head>",
+            '<link rel="canonical" href="https://example.com/guide"><meta property="og:title" content="Guide"></head>',
+        )
+        content = WebContent("https://example.com", html, BeautifulSoup(html, "lxml"))
+
+        assert content.canonical == "https://example.com/guide"
+        assert content.og_title == "Guide"
+        assert content.og_description is None
+        assert content.soup is None
+        assert not hasattr(content, "html")
+
+
+class TestRawPageRelease:
+    def test_analyzed_page_drops_its_body(self):
+        page = RawPage("https://example.com", SAMPLE_HTML, SAMPLE_HTML.encode("utf-8"))
+        with patch("src.core.orchestrator.download_page", return_value=page):
+            analysis = analyze_page(page.url, process_keywords(["python seo"]))
+
+        assert analysis.content.title == "Python SEO Guide"
+        assert (page.html, page.content) == (None, None)
+        with pytest.raises(ValueError):
+            parse_page(page)
+
+    def test_late_parse_of_reused_page_drops_its_body(self):
+        fresh = RawPage("https://example.com", SAMPLE_HTML, SAMPLE_HTML.encode("utf-8"))
+        with patch("src.core.orchestrator.download_page", return_value=fresh):
+            report = analyze_page(fresh.url, process_keywords(["python seo"])).report
+
+        page = RawPage("https://example.com", SAMPLE_HTML, SAMPLE_HTML.encode("utf-8"))
+        analysis = PageAnalysis(page, None, report, "", reused=True)
+
+        assert analysis.parsed_content() is analysis.parsed_content()
+        assert (page.html, page.content) == (None, None)
+
 
 class TestFetchContent:
-    @patch("src.core.fetcher.requests.get")
+    @patch("src.core.fetcher.requests.Session.get")
     def test_fetch_success(self, mock_get):
         response = MagicMock()
         response.status_code = 200
+        response.url = "https://example.com/"
         response.text = SAMPLE_HTML
         response.content = SAMPLE_HTML.encode("utf-8")
         response.raise_for_status = MagicMock()
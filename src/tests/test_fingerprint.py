@@ -0,0 +1,112 @@
+import os
+import re
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.fingerprint import ANALYSIS_SOURCES, SRC_ROOT, analysis_signature, normalize_html, page_fingerprint
+from src.core.orchestrator import run_analysis
+from src.core.scoring import ModuleResult
+from src.output.history_store import ResultsStore
+
+from src.tests.test_ai_analyzer import SAMPLE_HTML
+
+
+def _page(html, csrf="abc123", rendered="2025-01-02T10:11:12Z"):
+    return html.replace(
+        "<body>",
+        f'<body><!-- rendered {rendered} --><form><input type="hidden" name="csrf_token" value="{csrf}"></form>'
+        f'<script nonce="{csrf}"></script><time>{rendered}</time>',
+    )
+
+
+def _response(html):
+    response = MagicMock()
+    response.status_code = 200
+    response.url = "https://example.com"
+    response.headers = {"Content-Encoding": "gzip"}
+    response.history = []
+    response.text = html
+    response.content = html.encode("utf-8")
+    response.raw.tell.return_value = len(response.content) // 3
+    response.raise_for_status = MagicMock()
+    return response
+
+
+class TestFingerprint:
+    def test_ignores_volatile_markup(self):
+        first = _page(SAMPLE_HTML)
+        second = _page(SAMPLE_HTML, csrf="zzz999", rendered="2025-03-04T00:00:00+02:00")
+        assert normalize_html(first) == normalize_html(second)
+        assert page_fingerprint(first) == page_fingerprint(second)
+
+    def test_detects_content_changes(self):
+        changed = SAMPLE_HTML.replace("Python SEO", "Go SEO")
+        assert page_fingerprint(SAMPLE_HTML) != page_fingerprint(changed)
+
+    def test_signature_depends_on_keywords(self):
+        assert analysis_signature(["python seo"]) == analysis_signature([" Python SEO "])
+        assert analysis_signature(["python seo"]) != analysis_signature(["python seo", "tutorial"])
+
+    def test_hashed_sources_cover_their_utils_imports(self):
+        # Spans only time the analysis, they never change its results
+        hashed = set()
+        for relative in ANALYSIS_SOURCES:
+            path = os.path.join(SRC_ROOT, relative)
+            if os.path.isdir(path):
+                hashed.update(f"{relative}/{name}" for name in os.listdir(path) if name.endswith(".py"))
+            else:
+                hashed.add(relative)
+
+        for relative in hashed:
+            with open(os.path.join(SRC_ROOT, relative), encoding="utf-8") as f:
+                for module in re.findall(r"^from src\.utils\.(\w+) import", f.read(), re.MULTILINE):
+                    if module != "spans":
+                        assert f"utils/{module}.py" in hashed, f"{relative} imports unhashed utils/{module}.py"
+
+
+class TestIncrementalAnalysis:
+    @pytest.fixture
+    def store(self, tmp_path):
+        with ResultsStore(str(tmp_path / "history.db")) as store:
+            yield store
+
+    @patch("src.core.fetcher.requests.Session.get")
+    def test_unchanged_page_is_reused(self, mock_get, store):
+        mock_get.return_value = _response(_page(SAMPLE_HTML))
+        first = run_analysis("https://example.com", ["python seo"], store=store)
+
+        mock_get.return_value = _response(_page(SAMPLE_HTML, csrf="other", rendered="2026-01-01T00:00:00Z"))
+        with patch("src.core.orchestrator.build_report") as build_report:
+            second = run_analysis("https://example.com", ["python seo"], store=store)
+            build_report.assert_not_called()
+
+        assert second.overall_score == first.overall_score
+        assert second.technical_seo == first.technical_seo
+        assert store.stats["analyzed"] == 1
+        assert store.stats["reused"] == 1
+        assert len(store.score_trend("https://example.com")) == 2
+
+    @patch("src.core.fetcher.requests.Session.get")
+    def test_changed_page_or_keywords_are_reanalyzed(self, mock_get, store):
+        mock_get.return_value = _response(SAMPLE_HTML)
+        run_analysis("https://example.com", ["python seo"], store=store)
+        run_analysis("https://example.com", ["python tutorial"], store=store)
+
+        mock_get.return_value = _response(SAMPLE_HTML.replace("Python SEO", "Go SEO"))
+        run_analysis("https://example.com", ["python tutorial"], store=store)
+
+        assert store.stats == {"analyzed": 3, "reused": 0, "saved_ms": 0.0}
+
+    @patch("src.core.fetcher.requests.Session.get")
+    def test_reused_page_reruns_ai(self, mock_get, store):
+        # Stored AI output may come from another provider or model, so it is requested again
+        mock_get.return_value = _response(SAMPLE_HTML)
+        with patch("src.core.orchestrator.run_ai_analysis") as run_ai:
+            run_ai.side_effect = [ModuleResult("AI SEO Assistant", score, "passed", {}, []) for score in (40, 90)]
+            run_analysis("https://example.com", ["python seo"], use_ai=True, store=store)
+            second = run_analysis("https://example.com", ["python seo"], use_ai=True, store=store)
+
+        assert store.stats["reused"] == 1
+        assert run_ai.call_count == 2
+        assert second.ai_analysis.score == 90
@@ -0,0 +1,74 @@
+import dataclasses
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.core.fetcher import WebContent
+from src.core.keyword_processor import process_keywords
+from src.core.orchestrator import build_report
+from src.output.history_store import ResultsStore
+
+from src.tests.test_ai_analyzer import SAMPLE_HTML
+
+
+@pytest.fixture(scope="module")
+def report():
+    soup = BeautifulSoup(SAMPLE_HTML, "lxml")
+    content = WebContent("https://example.com/a", SAMPLE_HTML, soup)
+    return build_report(content, process_keywords(["python seo", "tutorial"]))
+
+
+def _with_technical(report, url, score):
+    technical = dataclasses.replace(report.technical_seo, score=score)
+    return dataclasses.replace(report, url=url, technical_seo=technical)
+
+
+class TestResultsStore:
+    def test_score_trend(self, tmp_path, report):
+        with ResultsStore(str(tmp_path / "history.db")) as store:
+            for score in (90, 80, 70):
+                store.add_reports(store.start_run(), [_with_technical(report, "https://example.com/a", score)])
+
+            trend = store.score_trend("https://example.com/a", "technical_seo")
+            assert [row[2] for row in trend] == [90, 80, 70]
+            assert [row[2] for row in store.score_trend("https://example.com/a")] == [report.overall_score] * 3
+            assert store.score_trend("https://example.com/missing") == []
+
+    def test_score_drops_between_latest_runs(self, tmp_path, report):
+        with ResultsStore(str(tmp_path / "history.db"), batch_size=2) as store:
+            first = store.start_run()
+            for i in range(5):
+                store.add_report(first, _with_technical(report, f"https://example.com/{i}", 80))
+            store.flush()
+
+            second = store.start_run()
+            for i in range(5):
+                store.add_report(second, _with_technical(report, f"https://example.com/{i}", 80 - i * 10))
+            store.flush()
+
+            drops = store.score_drops("technical_seo", min_drop=20)
+            assert drops == [
+                ("https://example.com/4", 80, 40),
+                ("https://example.com/3", 80, 50),
+                ("https://example.com/2", 80, 60),
+            ]
+
+    def test_keyword_rows_and_wal(self, tmp_path, report):
+        with ResultsStore(str(tmp_path / "history.db")) as store:
+            store.add_reports(store.start_run(), [report])
+
+            assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            rows = store.conn.execute(
+                "SELECT k.keyword FROM keyword_scores s JOIN keywords k ON k.id = s.keyword_id ORDER BY k.keyword"
+            ).fetchall()
+            assert [r[0] for r in rows] == ["python seo", "tutorial"]
+
+    def test_reopen_keeps_history(self, tmp_path, report):
+        path = str(tmp_path / "history.db")
+        with ResultsStore(path) as store:
+            store.add_report(store.start_run(), report)
+
+        with ResultsStore(path) as store:
+            store.add_report(store.start_run(), report)
+            store.flush()
+            assert len(store.score_trend(report.url)) == 2
@@ -0,0 +1,56 @@
+import gzip
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from src.core import http2_fetcher
+from src.core.fetcher import parse_page
+from src.core.http2_fetcher import Http2Fetcher
+
+from src.tests.test_ai_analyzer import SAMPLE_HTML
+
+BODY = (SAMPLE_HTML * 20).encode("utf-8")
+
+
+def _handler(request):
+    if request.url.path == "/old":
+        return httpx.Response(301, headers={"Location": "https://example.com/page"})
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        # A raw stream, so the bytes go through the same incremental decoding as a network response
+        return httpx.Response(200, stream=httpx.ByteStream(gzip.compress(BODY)),
+                              headers={"Content-Encoding": "gzip", "Content-Type": "text/html; charset=utf-8"})
+    return httpx.Response(200, content=BODY)
+
+
+@pytest.fixture
+def fetcher():
+    client = httpx.Client(
+        transport=httpx.MockTransport(_handler), follow_redirects=True,
+        headers={"Accept-Encoding": http2_fetcher.accept_encoding()},
+    )
+    fetcher = Http2Fetcher(client=client)
+    yield fetcher
+    fetcher.close()
+
+
+class TestHttp2Fetcher:
+    def test_download_decompresses_and_records_timing(self, fetcher):
+        page = fetcher.download("https://example.com/old")
+
+        assert page.html == SAMPLE_HTML * 20
+        assert parse_page(page).title == "Python SEO Guide"
+        assert page.timing.compression == "gzip"
+        assert page.timing.decoded_bytes == len(BODY)
+        assert 0 < page.timing.transfer_bytes < page.timing.decoded_bytes
+        assert page.timing.redirects == [{"url": "https://example.com/old", "status": 301}]
+        assert page.timing.final_url == "https://example.com/page"
+
+    def test_http_errors_raise_like_the_default_fetcher(self):
+        client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(404)))
+        with pytest.raises(Exception, match="Failed to fetch URL"):
+            Http2Fetcher(client=client).download("https://example.com/missing")
+
+    def test_accept_encoding_only_lists_available_codecs(self, monkeypatch):
+        monkeypatch.setattr(http2_fetcher.importlib.util, "find_spec", lambda name: name == "zstandard")
+        assert http2_fetcher.accept_encoding() == "zstd, gzip, deflate"
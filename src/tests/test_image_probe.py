@@ -0,0 +1,150 @@
+import struct
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.analyzers.structure_analyzer import StructureAnalyzer
+from src.core.fetcher import WebContent
+from src.core.image_probe import ImageProber, image_dimensions, sniff_format
+from src.utils.concurrency import HostThrottle
+
+
+def _png(width, height, size):
+    head = b"\x89PNG\r\n\x1a\n" + b"\x00\x00\x00\x0dIHDR" + struct.pack(">II", width, height) + b"\x08\x06\x00\x00\x00"
+    return head + b"\x00" * (size - len(head))
+
+
+def _jpeg(width, height, size):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    sof = b"\xff\xc0" + struct.pack(">HBHH", 17, 8, height, width) + b"\x00" * 10
+    head = b"\xff\xd8" + app0 + sof
+    return head + b"\x00" * (size - len(head))
+
+
+def _webp(width, height):
+    body = b"VP8X" + struct.pack("<I", 10) + b"\x00" * 4
+    body += (width - 1).to_bytes(3, "little") + (height - 1).to_bytes(3, "little")
+    return b"RIFF" + struct.pack("<I", len(body) + 4) + b"WEBP" + body
+
+
+IMAGES = {
+    "/hero.png": (_png(3000, 2000, 300 * 1024), True),
+    "/photo.jpg": (_jpeg(800, 600, 120 * 1024), False),
+    "/icon.webp": (_webp(64, 64), True),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests = Counter()
+
+    def do_GET(self):
+        self.requests[self.path] += 1
+        if self.path not in IMAGES:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        data, supports_range = IMAGES[self.path]
+        byte_range = self.headers.get("Range")
+        if supports_range and byte_range:
+            start, end = (int(part) for part in byte_range.split("=")[1].split("-"))
+            end = min(end, len(data) - 1)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+            data = data[start:end + 1]
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def prober():
+    _Handler.requests.clear()
+    prober = ImageProber(workers=4, timeout=2, probe_bytes=4096, throttle=HostThrottle(max_concurrent=4))
+    yield prober
+    prober.close()
+
+
+class TestHeaderParsing:
+    def test_formats_and_dimensions(self):
+        cases = [
+            (_png(3000, 2000, 64), "png", (3000, 2000)),
+            (_jpeg(800, 600, 64), "jpeg", (800, 600)),
+            (_webp(64, 32), "webp", (64, 32)),
+            (b"GIF89a" + struct.pack("<HH", 10, 20), "gif", (10, 20)),
+        ]
+        for head, image_format, dimensions in cases:
+            assert sniff_format(head) == image_format
+            assert image_dimensions(head, image_format) == dimensions
+
+    def test_falls_back_to_content_type(self):
+        assert sniff_format(b"", "image/avif; charset=binary") == "avif"
+        assert image_dimensions(b"\xff\xd8\xff", "jpeg") == (None, None)
+
+
+class TestImageProber:
+    def test_malformed_content_length_means_unknown_size(self, prober):
+        for length in ("abc", "123, 123"):
+            response = SimpleNamespace(status_code=200, headers={"Content-Length": length})
+            assert prober._total_size(response, b"\x00" * 4096) is None
+            # Small files still get their size from the bytes read
+            assert prober._total_size(response, b"\x00" * 100) == 100
+
+    def test_reports_size_format_and_dimensions(self, server, prober):
+        results = prober.probe_many([f"{server}/hero.png", f"{server}/photo.jpg", f"{server}/missing.png"])
+
+        hero = results[f"{server}/hero.png"]
+        assert (hero.status_code, hero.bytes, hero.format, hero.width, hero.height) == (206, 300 * 1024, "png", 3000, 2000)
+
+        # The server ignores Range, so the size comes from Content-Length and only the head is read
+        photo = results[f"{server}/photo.jpg"]
+        assert (photo.status_code, photo.bytes, photo.format, photo.width) == (200, 120 * 1024, "jpeg", 800)
+
+        assert not results[f"{server}/missing.png"].ok
+
+    def test_images_shared_across_pages_are_probed_once(self, server, prober):
+        urls = [f"{server}/icon.webp"] * 10
+        prober.probe_many(urls)
+        prober.probe_many(urls)
+
+        assert _Handler.requests["/icon.webp"] == 1
+
+
+class TestImageWeightAnalysis:
+    def test_flags_oversized_and_legacy_images(self, server, prober):
+        html = """<img src="/hero.png" alt="a"><img src="/photo.jpg" alt="b">
+                  <img src="/icon.webp" alt="c"><img src="/hero.png" alt="d"><img src="data:image/png;base64,AAAA">"""
+        content = WebContent(f"{server}/page", html, BeautifulSoup(html, "lxml"))
+
+        image_info = prober.probe_many(image["url"] for image in content.images)
+        result = StructureAnalyzer(content, [], image_info).analyze()
+        weight = result.details["images"]["weight"]
+
+        assert weight["probed"] == 3
+        assert [image["url"] for image in weight["oversized"]] == [f"{server}/hero.png"]
+        assert sorted(image["format"] for image in weight["legacy_format"]) == ["jpeg", "png"]
+        assert any("WebP or AVIF" in rec for rec in result.recommendations)
+        assert result.score == StructureAnalyzer(content, []).analyze().score
@@ -0,0 +1,100 @@
+import gzip
+import json
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+from src.core.batch import BatchResult, BatchTotals
+from src.core.fetcher import WebContent
+from src.core.keyword_processor import process_keywords
+from src.core.orchestrator import build_report
+from src.output.json_exporter import batch_result_to_dict
+from src.output.jsonl_writer import JsonLinesWriter, part_path, read_json_lines
+
+from src.tests.test_ai_analyzer import SAMPLE_HTML
+
+
+class TestJsonLinesWriter:
+    def test_lines_are_compact_and_flushed_per_record(self, tmp_path):
+        path = str(tmp_path / "batch.jsonl")
+        writer = JsonLinesWriter(path)
+        writer.write({"url": "https://example.com/a", "score": 81})
+        writer.write({"url": "https://example.com/b", "score": 64})
+
+        # Readable before close, as after a crash
+        with open(path, "rb") as f:
+            lines = f.read().splitlines()
+        assert lines[0] == b'{"url":"https://example.com/a","score":81}'
+        assert [json.loads(line)["score"] for line in lines] == [81, 64]
+        writer.close()
+
+    def test_gzip_output_is_readable_without_close(self, tmp_path):
+        path = str(tmp_path / "batch.jsonl.gz")
+        writer = JsonLinesWriter(path)
+        for i in range(5):
+            writer.write({"page": i})
+
+        assert [r["page"] for r in read_json_lines(path)] == list(range(5))
+        writer.close()
+        with gzip.open(path, "rt") as f:
+            assert len(f.readlines()) == 5
+
+    def test_rotates_by_size_without_empty_trailing_part(self, tmp_path):
+        path = str(tmp_path / "batch.jsonl")
+        with JsonLinesWriter(path, max_bytes=100) as writer:
+            for i in range(6):
+                writer.write({"page": i, "padding": "x" * 40})
+
+        assert writer.paths == [path, part_path(path, 1), part_path(path, 2)]
+        assert writer.records == 6
+        pages = [r["page"] for p in writer.paths for r in read_json_lines(p)]
+        assert pages == list(range(6))
+
+    def test_part_paths_keep_extensions(self):
+        assert part_path("out/batch.jsonl.gz", 0) == "out/batch.jsonl.gz"
+        assert part_path("out/batch.jsonl.gz", 2) == "out/batch.2.jsonl.gz"
+        assert part_path("batch.jsonl", 1) == "batch.1.jsonl"
+
+    def test_truncated_last_line_is_skipped(self, tmp_path):
+        path = tmp_path / "batch.jsonl"
+        path.write_bytes(b'{"page":0}\n{"page":1}\n{"pag')
+
+        assert [r["page"] for r in read_json_lines(str(path))] == [0, 1]
+
+    def test_stdlib_fallback_reads_the_same_records(self, tmp_path):
+        path = str(tmp_path / "batch.jsonl")
+        with JsonLinesWriter(path) as writer:
+            writer.write({"url": "https://example.com/ü", "scores": {"seo": 81}, "density": 1.25})
+
+        fast = list(read_json_lines(path))
+        with patch("src.output.jsonl_writer.orjson", None):
+            assert list(read_json_lines(path)) == fast
+        assert fast == [{"url": "https://example.com/ü", "scores": {"seo": 81}, "density": 1.25}]
+
+
+class TestBatchTotals:
+    def test_failed_results_are_counted_and_serialized(self):
+        totals = BatchTotals()
+        failed = BatchResult("https://example.com/x", None, "Failed to fetch URL: timeout")
+        totals.add(failed)
+
+        assert totals.failed == 1 and totals.analyzed == 0
+        assert batch_result_to_dict(failed) == {
+            "version": 1, "url": "https://example.com/x", "error": "Failed to fetch URL: timeout"
+        }
+
+    def test_reports_roundtrip_through_lines(self, tmp_path):
+        content = WebContent("https://example.com/", SAMPLE_HTML, BeautifulSoup(SAMPLE_HTML, "lxml"))
+        report = build_report(content, process_keywords(["python seo"]))
+        totals = BatchTotals()
+        path = str(tmp_path / "batch.jsonl.gz")
+        with JsonLinesWriter(path) as writer:
+            for result in (BatchResult(report.url, report), BatchResult("https://example.com/x", None, "boom")):
+                totals.add(result)
+                writer.write(batch_result_to_dict(result))
+
+        first, second = read_json_lines(path)
+        assert first["url"] == report.url
+        assert first["overall_score"] == report.overall_score
+        assert second["error"] == "boom"
+        assert (totals.analyzed, totals.failed, totals.score_total) == (1, 1, report.overall_score)
@@ -0,0 +1,154 @@
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.analyzers.link_analyzer import LinkAnalyzer
+from src.core.fetcher import WebContent
+from src.core.keyword_processor import process_keywords
+from src.core.link_checker import LinkChecker
+from src.core.orchestrator import build_report
+from src.utils.concurrency import HostThrottle, TTLCache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests = Counter()
+
+    def _respond(self, method):
+        self.requests[(method, self.path)] += 1
+        if self.path == "/ok":
+            self.send_response(200)
+        elif self.path == "/redirect":
+            self.send_response(301)
+            self.send_header("Location", "/hop")
+        elif self.path == "/hop":
+            self.send_response(302)
+            self.send_header("Location", "/ok")
+        elif self.path == "/loop":
+            self.send_response(302)
+            self.send_header("Location", "/loop")
+        elif self.path == "/nohead":
+            self.send_response(405 if method == "HEAD" else 200)
+        else:
+            self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._respond("HEAD")
+
+    def do_GET(self):
+        self._respond("GET")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def checker():
+    _Handler.requests.clear()
+    checker = LinkChecker(workers=4, timeout=2, throttle=HostThrottle(max_concurrent=4), max_redirects=3)
+    yield checker
+    checker.close()
+
+
+class TestLinkChecker:
+    def test_records_redirect_chain(self, server, checker):
+        status = checker.check(f"{server}/redirect")
+
+        assert status.ok and status.status_code == 200
+        assert status.final_url == f"{server}/ok"
+        assert [hop["status"] for hop in status.redirects] == [301, 302]
+
+    def test_falls_back_to_get_when_head_fails(self, server, checker):
+        status = checker.check(f"{server}/nohead")
+
+        assert status.ok and status.method == "GET"
+        assert _Handler.requests[("HEAD", "/nohead")] == 1
+
+    def test_broken_and_unreachable_links(self, server, checker):
+        results = checker.check_many([f"{server}/missing", f"{server}/loop", "http://127.0.0.1:9/"])
+
+        assert results[f"{server}/missing"].status_code == 404
+        assert "redirects" in results[f"{server}/loop"].error
+        assert results["http://127.0.0.1:9/"].error
+        assert not any(status.ok for status in results.values())
+
+    def test_repeated_links_are_requested_once(self, server, checker):
+        urls = [f"{server}/ok"] * 20
+        checker.check_many(urls)
+        checker.check_many(urls)
+
+        assert _Handler.requests[("HEAD", "/ok")] == 1
+        assert checker.cache.stats["hits"] >= 1
+
+
+class TestConcurrencyHelpers:
+    def test_ttl_cache_expires_entries(self):
+        now = [0.0]
+        cache = TTLCache(ttl=10, max_entries=2, clock=lambda: now[0])
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        now[0] = 11
+        assert cache.get("b") is None
+
+    def test_host_throttle_spaces_requests_per_host(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        throttle = HostThrottle(max_concurrent=1, min_interval=0.5, clock=lambda: now[0], sleep=sleep)
+        for host in ("a.com", "a.com", "b.com", "a.com"):
+            with throttle.slot(host):
+                pass
+
+        assert sleeps == [0.5, 0.5]
+
+
+class TestLinkHealthScoring:
+    def test_broken_and_redirected_links_cost_points(self, server, checker):
+        html = f"""<a href="{server}/ok">a</a><a href="{server}/redirect">b</a>
+                   <a href="{server}/missing">c</a><a href="https://example.org/">d</a>"""
+        content = WebContent(f"{server}/page", html, BeautifulSoup(html, "lxml"))
+        local = [link["url"] for link in content.links if link["is_internal"]]
+
+        unchecked = LinkAnalyzer(content, []).analyze()
+        checked = LinkAnalyzer(content, [], checker.check_many(local)).analyze()
+        health = checked.details["health"]
+
+        assert health["checked"] == 3
+        assert [link["url"] for link in health["broken"]] == [f"{server}/missing"]
+        assert health["redirects"][0]["chain"] == [301, 302]
+        assert checked.score < unchecked.score
+        assert any("broken link" in rec for rec in checked.recommendations)
+
+    def test_broken_footer_link_is_reported(self, server, checker):
+        # Nav and footer links repeat on every page of a site, so they must reach the checker
+        html = f"""<nav><a href="{server}/ok">Home</a></nav><main><p>Body text</p></main>
+                   <footer><a href="{server}/missing">Contact</a></footer>"""
+        content = WebContent(f"{server}/page", html, BeautifulSoup(html, "lxml"))
+        report = build_report(content, process_keywords(["body"]), link_checker=checker)
+        health = report.link_analysis.details["health"]
+
+        assert health["checked"] == 2
+        assert [link["url"] for link in health["broken"]] == [f"{server}/missing"]
+        assert _Handler.requests[("HEAD", "/missing")] == 1
@@ -0,0 +1,102 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from src.core.fetcher import WebContent
+from src.core.link_graph import LinkGraph
+from src.utils.url_utils import normalize_url, resolve_url
+
+
+def _links(*urls):
+    return [{"url": url, "is_internal": True} for url in urls]
+
+
+@pytest.fixture
+def graph():
+    site = "https://example.com"
+    graph = LinkGraph()
+    graph.add_page(f"{site}/", _links(f"{site}/a", f"{site}/b"))
+    graph.add_page(f"{site}/a", _links(f"{site}/b", f"{site}/c", f"{site}/a"))
+    graph.add_page(f"{site}/b", _links(f"{site}/"))
+    graph.add_page(f"{site}/c", [])
+    graph.add_page(f"{site}/orphan", _links(f"{site}/"))
+    return graph
+
+
+class TestUrlResolution:
+    def test_resolve_and_normalize(self):
+        assert resolve_url("https://example.com/blog/post", "../about#team") == "https://example.com/about"
+        assert resolve_url("https://example.com/", "mailto:hi@example.com") is None
+        assert normalize_url("HTTPS://Example.com:443") == "https://example.com/"
+        assert normalize_url("https://www.example.com/a#top") == normalize_url("https://example.com/a")
+        # The fetchable URL keeps its host
+        assert resolve_url("https://example.com/", "https://www.example.com/a") == "https://www.example.com/a"
+
+    def test_fetcher_classifies_links_by_host(self):
+        html = """<a href="/docs">a</a><a href="https://www.example.com/x">b</a>
+                  <a href="https://other.com/example.com">c</a><a href="tel:123">d</a>"""
+        content = WebContent("https://example.com/page", html, BeautifulSoup(html, "lxml"))
+        internal = [link["url"] for link in content.links if link["is_internal"]]
+        external = [link["url"] for link in content.links if link["is_external"]]
+
+        assert internal == ["https://example.com/docs", "https://www.example.com/x"]
+        assert external == ["https://other.com/example.com"]
+
+    def test_nav_and_footer_links_are_extracted(self):
+        html = """<nav><a href="/about">About</a></nav><main><p>Body</p><a href="/x">x</a></main>
+                  <footer><a href="/contact">Contact</a></footer>"""
+        content = WebContent("https://ex.com/", html, BeautifulSoup(html, "lxml"))
+
+        assert [link["url"] for link in content.links] == [
+            "https://ex.com/about", "https://ex.com/x", "https://ex.com/contact"
+        ]
+        assert "About" not in content.body_text and "Body" in content.body_text
+
+    def test_links_resolve_against_final_url_and_base_href(self):
+        html = '<a href="post">p</a><img src="img.png">'
+        redirected = WebContent("http://example.com/old", html, BeautifulSoup(html, "lxml"),
+                                final_url="https://shop.com/blog/")
+        based = WebContent("https://example.com/blog/", '<base href="/docs/">' + html,
+                           BeautifulSoup('<base href="/docs/">' + html, "lxml"))
+
+        assert redirected.links[0]["url"] == "https://shop.com/blog/post"
+        assert redirected.links[0]["is_internal"]
+        assert redirected.images[0]["url"] == "https://shop.com/blog/img.png"
+        assert based.links[0]["url"] == "https://example.com/docs/post"
+
+
+class TestLinkGraph:
+    def test_www_and_bare_host_are_one_node(self):
+        graph = LinkGraph()
+        graph.add_page("https://www.example.com/", _links("https://example.com/a", "https://www.example.com/a"))
+        graph.add_page("https://example.com/a", _links("https://www.example.com/"))
+
+        assert graph.urls == ["https://example.com/", "https://example.com/a"]
+        assert graph.edge_count == 2
+        assert graph.orphan_pages() == []
+
+    def test_csr_layout(self, graph):
+        offsets, targets = graph.csr()
+        a = graph.urls.index("https://example.com/a")
+        linked = {graph.urls[t] for t in targets[offsets[a]:offsets[a + 1]]}
+        assert linked == {"https://example.com/b", "https://example.com/c"}
+        assert graph.edge_count == 6
+
+    def test_orphans_and_depth(self, graph):
+        assert graph.orphan_pages() == ["https://example.com/orphan"]
+        stats = {s.url: s for s in graph.page_stats()}
+        assert stats["https://example.com/"].depth == 0
+        assert stats["https://example.com/c"].depth == 2
+        assert stats["https://example.com/orphan"].depth is None
+
+    def test_pagerank(self, graph):
+        ranks = graph.pagerank()
+        assert sum(ranks) == pytest.approx(1.0)
+        by_url = dict(zip(graph.urls, ranks))
+        assert by_url["https://example.com/"] == max(ranks)
+        assert by_url["https://example.com/orphan"] == min(ranks)
+
+    def test_numpy_and_python_pagerank_agree(self, graph):
+        pytest.importorskip("numpy")
+        numpy_ranks = graph._pagerank_numpy(0.85, 1e-10, 200)
+        python_ranks = graph._pagerank_python(0.85, 1e-10, 200)
+        assert list(numpy_ranks) == pytest.approx(list(python_ranks))
@@ -0,0 +1,40 @@
+import os
+import time
+
+from src.core.llm_cache import LLMResponseCache
+
+
+class TestLLMResponseCache:
+    def test_roundtrip(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path))
+        key = cache.make_key("openai", "gpt-5", "system", "prompt")
+        assert cache.get(key) is None
+
+        cache.set(key, {"text": "hello"})
+        assert cache.get(key) == {"text": "hello"}
+
+    def test_key_ignores_whitespace_but_not_model(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path))
+        key = cache.make_key("openai", "gpt-5", "system", "Analyze  this\npage")
+        assert key == cache.make_key("openai", "gpt-5", "system", "Analyze this page")
+        assert key != cache.make_key("openai", "gpt-4o", "system", "Analyze this page")
+        assert key != cache.make_key("gemini", "gpt-5", "system", "Analyze this page")
+
+    def test_expired_entry_is_a_miss(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path), ttl=0)
+        key = cache.make_key("openai", "gpt-5", "system", "prompt")
+        cache.set(key, {"text": "hello"})
+        time.sleep(0.01)
+        assert cache.get(key) is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path), max_bytes=600)
+        keys = [cache.make_key("openai", "gpt-5", "system", f"prompt {i}") for i in range(4)]
+        for i, key in enumerate(keys):
+            cache.set(key, {"text": "x" * 150})
+            os.utime(cache._path(key), (1000 + i, 1000 + i))
+
+        cache.set(cache.make_key("openai", "gpt-5", "system", "prompt 4"), {"text": "x" * 150})
+
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[3]) is not None
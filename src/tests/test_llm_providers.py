@@ -0,0 +1,90 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.analyzers.ai_analyzer import AIAnalyzer
+from src.core.fetcher import WebContent
+from src.core.keyword_processor import process_keywords
+from src.core.llm_providers import (
+    LLMResponse,
+    LLMProvider,
+    OpenAIProvider,
+    RecordingProvider,
+    ReplayProvider,
+    create_provider,
+)
+
+from src.tests.test_ai_analyzer import INSIGHTS, SAMPLE_HTML, TITLE
+
+
+class StaticProvider(LLMProvider):
+    name = "static"
+    model = "static-1"
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def generate(self, prompt, system_instruction, max_tokens, schema=None):
+        self.calls += 1
+        return LLMResponse(text=self.text, input_tokens=250, output_tokens=50, latency_ms=800.0)
+
+
+def _content():
+    soup = BeautifulSoup(SAMPLE_HTML, "lxml")
+    return WebContent("https://example.com", SAMPLE_HTML, soup)
+
+
+class TestRecordReplay:
+    def test_replay_serves_recorded_responses(self, tmp_path):
+        recording = tmp_path / "responses.jsonl"
+        live = StaticProvider(json.dumps(INSIGHTS))
+        keywords = process_keywords(["python seo"])
+
+        recorded = AIAnalyzer(_content(), keywords, {}, consolidated=True,
+                              provider=RecordingProvider(live, str(recording))).analyze()
+        assert live.calls == 1
+
+        replay = ReplayProvider(str(recording))
+        replayed = AIAnalyzer(_content(), keywords, {}, consolidated=True, provider=replay).analyze()
+
+        assert replayed.details["optimized_title"] == TITLE
+        assert replayed.details["ai_recommendations"] == recorded.details["ai_recommendations"]
+        assert replayed.details["usage"]["input_tokens"] == 250
+        assert replayed.details["usage"]["model_latency_ms"] == 0.0
+        assert replay.model == "static-1"
+
+    def test_unknown_prompt_raises(self, tmp_path):
+        recording = tmp_path / "responses.jsonl"
+        recording.write_text("")
+        with pytest.raises(LookupError):
+            ReplayProvider(str(recording)).generate("prompt", "system", 100)
+
+
+class TestCreateProvider:
+    def test_no_keys(self, monkeypatch):
+        for name in ("GEMINI_API_KEY", "OPENAI_API_KEY", "SEO_AI_PROVIDER", "SEO_AI_REPLAY_FILE", "SEO_AI_RECORD_FILE"):
+            monkeypatch.delenv(name, raising=False)
+        assert create_provider() is None
+
+    def test_local_server(self, monkeypatch):
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        provider = create_provider(name="local", base_url="http://127.0.0.1:9999/v1", model="llama3")
+
+        assert isinstance(provider, OpenAIProvider)
+        assert provider.name == "local"
+        assert provider.model == "llama3"
+        assert str(provider.client.base_url).startswith("http://127.0.0.1:9999/v1")
+
+    def test_openai_provider_reports_usage(self):
+        client = MagicMock()
+        client.chat.completions.create.return_value = MagicMock(
+            choices=[MagicMock(message=MagicMock(content="ok"))],
+            usage=MagicMock(prompt_tokens=12, completion_tokens=3),
+        )
+        response = OpenAIProvider(client=client).generate("prompt", "system", 10)
+
+        assert response.text == "ok"
+        assert (response.input_tokens, response.output_tokens) == (12, 3)
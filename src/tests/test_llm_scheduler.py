@@ -0,0 +1,148 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.analyzers.ai_analyzer import AIAnalyzer
+from src.core.fetcher import WebContent
+from src.core.keyword_processor import process_keywords
+from src.core.llm_providers import get_shared_client
+from src.core.llm_scheduler import LLMScheduler, retry_after_seconds
+
+from src.tests.test_ai_analyzer import INSIGHTS, TITLE, SAMPLE_HTML
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class MockProvider(BaseHTTPRequestHandler):
+    """OpenAI-compatible chat endpoint that rate limits the first request."""
+
+    requests_seen = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).requests_seen += 1
+
+        if type(self).requests_seen == 1:
+            body = json.dumps({"error": {"message": "Rate limit reached", "type": "rate_limit"}}).encode()
+            self.send_response(429)
+            self.send_header("Retry-After", "0.2")
+        else:
+            body = json.dumps({
+                "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-5",
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": json.dumps(INSIGHTS)}}],
+                "usage": {"prompt_tokens": 300, "completion_tokens": 120, "total_tokens": 420},
+            }).encode()
+            self.send_response(200)
+
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def mock_provider(monkeypatch):
+    MockProvider.requests_seen = 0
+    server = HTTPServer(("127.0.0.1", 0), MockProvider)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key-scheduler")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    yield server
+    server.shutdown()
+
+
+class TestRateLimits:
+    def test_requests_per_minute(self):
+        clock = FakeClock()
+        scheduler = LLMScheduler(requests_per_minute=2, tokens_per_minute=10_000, clock=clock, sleep=clock.sleep)
+
+        for _ in range(3):
+            scheduler.acquire(10)
+
+        assert clock.now == pytest.approx(60.0)
+
+    def test_tokens_per_minute(self):
+        clock = FakeClock()
+        scheduler = LLMScheduler(requests_per_minute=100, tokens_per_minute=1000, clock=clock, sleep=clock.sleep)
+
+        scheduler.acquire(600)
+        scheduler.acquire(600)
+
+        assert clock.now == pytest.approx(60.0)
+
+    def test_retry_after_header(self):
+        class RateLimited(Exception):
+            status_code = 429
+            response = type("Response", (), {"headers": {"retry-after": "7"}})()
+
+        assert retry_after_seconds(RateLimited()) == 7.0
+        assert retry_after_seconds(ValueError()) is None
+
+
+class TestPriority:
+    def test_largest_deficit_runs_first(self):
+        scheduler = LLMScheduler(workers=1)
+        started = threading.Event()
+        release = threading.Event()
+        order = []
+
+        def blocker():
+            started.set()
+            release.wait()
+
+        scheduler.submit(0, blocker)
+        started.wait()
+        futures = [scheduler.submit(deficit, lambda d=deficit: order.append(d)) for deficit in (10, 50, 30)]
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+        scheduler.shutdown()
+
+        assert order == [50, 30, 10]
+
+
+class TestMockProvider:
+    def test_honours_retry_after(self, mock_provider):
+        soup = BeautifulSoup(SAMPLE_HTML, "lxml")
+        content = WebContent("https://example.com", SAMPLE_HTML, soup)
+        scheduler = LLMScheduler(requests_per_minute=10)
+
+        analyzer = AIAnalyzer(content, process_keywords(["python seo"]), {}, consolidated=True, scheduler=scheduler)
+        result = analyzer.analyze()
+
+        assert MockProvider.requests_seen == 2
+        assert result.details["optimized_title"] == TITLE
+        assert result.details["usage"]["input_tokens"] == 300
+        assert scheduler.stats["rate_limited"] == 1
+        assert scheduler.stats["tokens"] == 420
+
+    def test_client_is_shared(self, mock_provider):
+        soup = BeautifulSoup(SAMPLE_HTML, "lxml")
+        content = WebContent("https://example.com", SAMPLE_HTML, soup)
+        scheduler = LLMScheduler()
+
+        first = AIAnalyzer(content, process_keywords(["seo"]), {}, scheduler=scheduler)
+        second = AIAnalyzer(content, process_keywords(["seo"]), {}, scheduler=scheduler)
+
+        assert first.provider.client is second.provider.client
+        assert first.provider.client is get_shared_client("openai", "test-key-scheduler", 0)
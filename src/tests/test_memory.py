@@ -0,0 +1,39 @@
+from src.utils.memory import MemoryProfiler, process_rss_bytes
+from src.utils.spans import span, track_span_memory
+
+
+class TestMemoryProfiler:
+    def test_credits_peaks_to_the_spans_that_allocated(self):
+        held = []
+        with MemoryProfiler() as profiler, track_span_memory(profiler):
+            with span("parse"):
+                # About 4 MB allocated and freed again inside the span
+                scratch = [bytearray(1024) for _ in range(4000)]
+                del scratch
+                with span("extract"):
+                    held.append(bytearray(512 * 1024))
+            with span("extract"):
+                pass
+
+        stages = {name: (calls, peak, net) for name, calls, peak, net in profiler.stage_peaks()}
+        assert stages["parse"][0] == 1
+        assert stages["parse"][1] >= 4000 * 1024
+        assert stages["extract"][0] == 2
+        assert 512 * 1024 <= stages["extract"][1] < 4000 * 1024
+        assert stages["parse"][2] >= 512 * 1024
+        assert profiler.peak >= stages["parse"][1]
+
+    def test_top_allocators_point_at_source_lines(self):
+        with MemoryProfiler() as profiler:
+            held = [bytes(2048) for _ in range(2000)]
+
+        location, size, count = profiler.top_allocators(1)[0]
+        assert "test_memory.py:" in location
+        assert size >= 2000 * 2048
+        assert held
+
+    def test_spans_untracked_outside_profiler(self):
+        with span("parse") as timed:
+            pass
+        assert timed.memory is None
+        assert process_rss_bytes() > 0
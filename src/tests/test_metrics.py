@@ -0,0 +1,100 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.core.batch_metrics import BatchMetrics
+from src.core.batch_progress import BatchProgress
+from src.core.llm_cache import LLMResponseCache
+from src.utils.metrics import LabeledHistogram, MetricFamily, MetricsServer, TextfileWriter, render_families
+from src.utils.spans import collect_spans, span
+
+
+def _samples(text):
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+class TestMetricsFormat:
+    def test_renders_help_type_and_labels(self):
+        family = MetricFamily("jobs_total", "counter", "Jobs done").add(3, result="ok").add(1, result='say "hi"')
+        text = render_families([family, MetricFamily("up", "gauge", "Up").add(1)])
+
+        assert text.splitlines() == [
+            "# HELP jobs_total Jobs done",
+            "# TYPE jobs_total counter",
+            'jobs_total{result="ok"} 3',
+            'jobs_total{result="say \\"hi\\""} 1',
+            "# HELP up Up",
+            "# TYPE up gauge",
+            "up 1",
+        ]
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = LabeledHistogram("stage_seconds", "Stage time", "stage", (0.1, 1))
+        for ms in (50, 100, 500, 2000):
+            histogram.add("fetch", ms)
+        samples = _samples(render_families([histogram.family()]))
+
+        assert samples['stage_seconds_bucket{stage="fetch",le="0.1"}'] == 2
+        assert samples['stage_seconds_bucket{stage="fetch",le="1.0"}'] == 3
+        assert samples['stage_seconds_bucket{stage="fetch",le="+Inf"}'] == 4
+        assert samples['stage_seconds_count{stage="fetch"}'] == 4
+        assert samples['stage_seconds_sum{stage="fetch"}'] == pytest.approx(2.65)
+
+
+class TestBatchMetrics:
+    def test_reads_progress_caches_and_spans(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm"))
+        cache.set("a", {"text": "x"})
+        cache.get("a")
+        cache.get("b")
+        progress = BatchProgress(total=3)
+        for _ in range(3):
+            progress.page_queued()
+        progress.page_started()
+        progress.page_started()
+        progress.page_analyzed(100.0, 20.0)
+        progress.page_finished(80)
+
+        metrics = BatchMetrics(progress, caches={"llm": cache.stats})
+        with collect_spans(metrics.stages):
+            with span("analyze.content"):
+                pass
+        samples = _samples(metrics.registry.render())
+
+        assert samples['seo_analyzer_pages_total{result="analyzed"}'] == 1
+        assert samples["seo_analyzer_pages_queued"] == 1
+        assert samples["seo_analyzer_fetches_in_flight"] == 1
+        assert samples['seo_analyzer_cache_requests_total{cache="llm",result="hit"}'] == 1
+        assert samples['seo_analyzer_cache_requests_total{cache="llm",result="miss"}'] == 1
+        assert samples['seo_analyzer_stage_duration_seconds_count{stage="analyze.content"}'] == 1
+        assert samples["process_resident_memory_bytes"] > 0
+
+
+class TestExposition:
+    def test_server_serves_metrics_path_only(self):
+        metrics = BatchMetrics(BatchProgress())
+        server = MetricsServer(metrics.registry, 0)
+        try:
+            with urllib.request.urlopen(server.address) as response:
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+                assert "seo_analyzer_pages_total" in response.read().decode()
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(server.address.replace("/metrics", "/other"))
+        finally:
+            server.close()
+
+    def test_textfile_written_on_close(self, tmp_path):
+        progress = BatchProgress()
+        path = tmp_path / "textfile" / "seo.prom"
+        writer = TextfileWriter(BatchMetrics(progress).registry, str(path), interval=60)
+        progress.page_queued()
+        writer.close()
+
+        assert _samples(path.read_text())["seo_analyzer_pages_queued"] == 1
+        assert [p.name for p in path.parent.iterdir()] == ["seo.prom"]
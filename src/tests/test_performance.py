@@ -0,0 +1,118 @@
+import gzip
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from src.analyzers.performance_analyzer import PerformanceAnalyzer
+from src.core.fetch_timing import FetchTiming, TimedHTTPConnection
+from src.core.fetcher import download_page
+from src.core.scoring import calculate_overall_score, calculate_performance_score
+
+from src.tests.test_ai_analyzer import SAMPLE_HTML
+
+BODY = (SAMPLE_HTML * 20).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/old":
+            self.send_response(301)
+            self.send_header("Location", "/page")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        compressed = self.path == "/page" and "gzip" in self.headers.get("Accept-Encoding", "")
+        body = gzip.compress(BODY) if compressed else BODY
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if compressed:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestFetchTiming:
+    def test_records_redirects_sizes_and_compression(self, server):
+        timing = download_page(f"{server}/old").timing
+
+        assert timing.status_code == 200
+        assert timing.final_url == f"{server}/page"
+        assert timing.redirects == [{"url": f"{server}/old", "status": 301}]
+        assert timing.compression == "gzip"
+        assert timing.decoded_bytes == len(BODY)
+        assert 0 < timing.transfer_bytes < timing.decoded_bytes
+        assert timing.connect_ms > 0 and timing.tls_ms == 0
+        assert timing.total_ms >= timing.ttfb_ms > 0
+
+    def test_uncompressed_page(self, server):
+        page = download_page(f"{server}/plain")
+
+        assert page.timing.compression is None
+        assert page.timing.transfer_bytes == page.timing.decoded_bytes == len(BODY)
+        assert page.timing.http_version == "HTTP/1.0"
+
+    def test_refused_connection_is_tried_once(self):
+        # A port with nothing listening on it
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+
+        with patch.object(TimedHTTPConnection, "_connect_any", autospec=True,
+                          side_effect=TimedHTTPConnection._connect_any) as connect_any, \
+                patch("urllib3.connection.HTTPConnection._new_conn") as plain_connect:
+            with pytest.raises(Exception, match="Failed to establish a new connection"):
+                download_page(f"http://127.0.0.1:{port}/")
+
+        assert connect_any.call_count == 1
+        plain_connect.assert_not_called()
+
+    def test_connect_timeout_is_not_retried(self):
+        with patch.object(TimedHTTPConnection, "_connect_any", side_effect=socket.timeout("timed out")) as connect_any, \
+                patch("urllib3.connection.HTTPConnection._new_conn") as plain_connect:
+            with pytest.raises(Exception, match="connect timeout="):
+                download_page("http://127.0.0.1:9/")
+
+        assert connect_any.call_count == 1
+        plain_connect.assert_not_called()
+
+
+class TestPerformanceScoring:
+    def test_slow_uncompressed_pages_are_penalized(self):
+        fast = FetchTiming(status_code=200, ttfb_ms=120.4, total_ms=300, decoded_bytes=50000, compression="br")
+        slow = FetchTiming(status_code=200, ttfb_ms=1300, total_ms=5000, decoded_bytes=50000,
+                           redirects=[{"url": "http://example.com", "status": 301}])
+
+        fast_result = PerformanceAnalyzer(None, [], fast).analyze()
+        slow_result = PerformanceAnalyzer(None, [], slow).analyze()
+
+        assert fast_result.score == 100
+        assert fast_result.details["ttfb_ms"] == 120
+        assert slow_result.score == 40 * 500 // 1000 + 0 + 0 + 8
+        assert any("compression" in rec for rec in slow_result.recommendations)
+        assert any("time to first byte" in rec for rec in slow_result.recommendations)
+
+    def test_small_pages_do_not_need_compression(self):
+        assert calculate_performance_score(100, 200, 900, False, 0) == 100
+
+    def test_overall_score_only_blends_measured_performance(self):
+        assert calculate_overall_score(80, 80, 80, 80, 80) == 80
+        assert calculate_overall_score(80, 80, 80, 80, 80, performance_score=0) == 72
+        assert calculate_overall_score(80, 80, 80, 80, 80, performance_score=100) == 82
@@ -0,0 +1,51 @@
+from bs4 import BeautifulSoup
+
+from src.core.fetcher import WebContent
+from src.core.keyword_processor import process_keywords
+from src.core.prompt_builder import PromptBuilder, estimate_tokens, split_passages
+
+
+COOKIE_BANNER = "We use cookies to improve your experience. Accept all cookies or manage consent. " * 3
+FILLER = "Our company was founded many years ago and has offices in several cities. " * 6
+KEYWORD_SECTION = ("Python SEO tools help you audit titles and meta descriptions quickly. "
+                   "With Python SEO scripts you can check hundreds of pages in minutes. ")
+
+SAMPLE_HTML = f"""
+<html>
+  <head><title>Python SEO</title></head>
+  <body>
+    <div>{COOKIE_BANNER}</div>
+    <p>{FILLER}</p>
+    <h2>Automating audits with Python</h2>
+    <p>{KEYWORD_SECTION}</p>
+  </body>
+</html>
+"""
+
+
+def _builder(token_budget=1500):
+    soup = BeautifulSoup(SAMPLE_HTML, "lxml")
+    content = WebContent("https://example.com", SAMPLE_HTML, soup)
+    return PromptBuilder(content, process_keywords(["python seo"]), token_budget=token_budget)
+
+
+class TestSplitPassages:
+    def test_long_run_without_punctuation_is_chunked(self):
+        passages = split_passages(" ".join(["word"] * 130), max_words=60)
+        assert [len(p.split()) for p in passages] == [60, 60, 10]
+
+
+class TestExcerpt:
+    def test_prefers_keyword_passages_over_boilerplate(self):
+        excerpt = _builder().excerpt(60)
+
+        assert "Python SEO tools" in excerpt
+        assert "cookies" not in excerpt
+        assert estimate_tokens(excerpt) <= 60
+
+    def test_render_respects_budget_and_records_tokens(self):
+        builder = _builder(token_budget=80)
+        prompt = builder.render("title", lambda excerpt: f"Write a title.\nPage Content: {excerpt}", excerpt_tokens=500)
+
+        assert builder.prompt_tokens["title"] == estimate_tokens(prompt)
+        assert builder.prompt_tokens["title"] <= 80
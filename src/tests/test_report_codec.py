@@ -0,0 +1,59 @@
+import json
+from dataclasses import replace
+
+import pytest
+
+from src.core.batch import BatchResult
+from src.core.scoring import ModuleResult
+from src.output.json_exporter import batch_result_to_dict
+from src.output.jsonl_writer import JsonLinesWriter
+from src.output.report_codec import decode_report, dumps_report, encode_report, load_reports, loads_report
+
+from src.tests.test_features import _reports
+
+
+def _full_report():
+    report = _reports()[1]
+    return replace(
+        report,
+        ai_analysis=ModuleResult("AI SEO Assistant", 100, "passed",
+                                 {"optimized_title": "Python SEO", "usage": {"calls": 1}}, ["Rewrite the intro"]),
+        performance=ModuleResult("Performance", 72, "warning", {"ttfb_ms": 900, "redirects": []}, []),
+        keyword_clusters=[replace(report.keyword_cluster, name="main")],
+    )
+
+
+class TestReportCodec:
+    def test_roundtrip_is_lossless(self):
+        report = _full_report()
+        loaded = loads_report(dumps_report(report))
+
+        assert loaded == report
+        # The content details point at the report's own cluster again, as they do after analysis
+        assert loaded.content_analysis.details["keyword_cluster"] is loaded.keyword_cluster
+
+    def test_encoding_is_plain_json(self):
+        report = _full_report()
+        data = encode_report(report)
+
+        assert decode_report(json.loads(json.dumps(data))) == report
+        assert "keyword_cluster" not in data["content_analysis"]["details"]
+
+    def test_unknown_version_is_rejected(self):
+        data = encode_report(_full_report())
+        data["version"] = 99
+
+        with pytest.raises(ValueError):
+            decode_report(data)
+        with pytest.raises(ValueError):
+            loads_report(b"\x80\x05not json")
+
+    def test_load_reports_from_batch_lines(self, tmp_path):
+        reports = _reports()
+        path = str(tmp_path / "batch.jsonl")
+        with JsonLinesWriter(path) as writer:
+            for report in reports:
+                writer.write(batch_result_to_dict(BatchResult(report.url, report)))
+            writer.write(batch_result_to_dict(BatchResult("https://example.com/x", None, "boom")))
+
+        assert list(load_reports(path)) == reports
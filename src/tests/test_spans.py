@@ -0,0 +1,119 @@
+import pstats
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from src.core.fetcher import RawPage
+from src.core.keyword_processor import process_keywords
+from src.core.orchestrator import analyze_page
+from src.output.report_codec import dumps_report, loads_report
+from src.utils.profiling import RunProfiler
+from src.utils.spans import SpanTotals, collect_spans, record_spans, span
+
+from src.tests.test_ai_analyzer import SAMPLE_HTML
+
+
+class TestSpans:
+    def test_records_into_current_dict_and_accumulates(self):
+        with record_spans({}) as spans:
+            for _ in range(3):
+                with span("parse"):
+                    pass
+            with span("extract"):
+                with span("extract.meta"):
+                    pass
+
+        assert set(spans) == {"parse", "extract", "extract.meta"}
+        assert spans["extract"] >= spans["extract.meta"] >= 0
+
+    def test_decorator_and_no_recording_outside_context(self):
+        @span("export.json")
+        def export(value):
+            return value * 2
+
+        assert export(2) == 4
+        with record_spans({}) as spans:
+            assert export(3) == 6
+        assert list(spans) == ["export.json"]
+
+    def test_record_spans_is_per_thread(self):
+        seen = {}
+
+        def worker():
+            with record_spans({}) as spans:
+                with span("fetch"):
+                    pass
+            seen["worker"] = spans
+
+        with record_spans({}) as spans:
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+        assert spans == {}
+        assert list(seen["worker"]) == ["fetch"]
+
+    def test_totals_collect_from_every_thread(self):
+        def worker():
+            with span("fetch"):
+                pass
+
+        with collect_spans(SpanTotals()) as totals:
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            with span("parse"):
+                pass
+
+        counts = {name: count for name, count, _ in totals.items()}
+        assert counts == {"fetch": 4, "parse": 1}
+
+    def test_analyze_page_records_stage_timings(self):
+        page = RawPage("https://example.com/", SAMPLE_HTML, SAMPLE_HTML.encode())
+        with patch("src.core.orchestrator.download_page", return_value=page):
+            report = analyze_page(page.url, process_keywords(["python seo"])).report
+
+        for name in ("parse", "extract", "extract.body_text", "analyze.technical_seo", "analyze.content",
+                     "analyze.structure", "analyze.links"):
+            assert name in report.timings
+        assert loads_report(dumps_report(report)).timings == report.timings
+
+
+class TestRunProfiler:
+    def test_writes_pstats_and_collapsed_stacks(self, tmp_path):
+        def busy():
+            total = 0
+            for i in range(200000):
+                total += i * i
+            return total
+
+        with RunProfiler(sample_interval=0.001) as profiler:
+            thread = threading.Thread(target=busy, name="worker")
+            thread.start()
+            thread.join()
+            busy()
+
+        pstats_path, collapsed_path = profiler.write(str(tmp_path / "out" / "run"))
+
+        # One call from the worker thread, one from the main thread
+        calls = {func: stat[1] for (_, _, func), stat in pstats.Stats(pstats_path).stats.items()}
+        assert calls["busy"] == 2
+        lines = open(collapsed_path, encoding="utf-8").read().splitlines()
+        assert lines
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0 and ";" in stack
+
+    def test_thread_pool_jobs_finish_under_profiler(self):
+        def square(value):
+            return value * value
+
+        with RunProfiler(sample_interval=0.001) as profiler:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(square, range(20), timeout=10))
+
+        assert results == [value * value for value in range(20)]
+        calls = {func: stat[1] for (_, _, func), stat in profiler.stats().stats.items()}
+        assert calls["square"] == 20
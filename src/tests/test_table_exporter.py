@@ -0,0 +1,76 @@
+import csv
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.core.fetcher import WebContent
+from src.core.keyword_processor import process_keywords
+from src.core.orchestrator import build_report, process_clusters
+from src.output.table_exporter import KEYWORD_COLUMNS, PAGE_COLUMNS, TableExporter
+
+from src.tests.test_ai_analyzer import SAMPLE_HTML
+from src.tests.test_features import _reports
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+class TestTableExporter:
+    def test_csv_rows_per_page_and_keyword(self, tmp_path):
+        reports = _reports()
+        with TableExporter(str(tmp_path), chunk_rows=2) as table:
+            for report in reports:
+                table.add_report(report)
+
+        pages = _read_csv(tmp_path / "pages.csv")
+        keywords = _read_csv(tmp_path / "keywords.csv")
+
+        assert (table.page_rows, table.keyword_rows) == (3, 5)
+        assert list(pages[0]) == list(PAGE_COLUMNS)
+        assert [int(p["overall_score"]) for p in pages] == [r.overall_score for r in reports]
+        assert pages[0]["technical_seo_status"] == reports[0].technical_seo.status
+        assert pages[0]["performance_score"] == ""
+        assert int(pages[2]["images_without_alt"]) == 1
+        assert [k["keyword"] for k in keywords] == [
+            ks.keyword for r in reports for ks in r.keyword_cluster.individual_scores
+        ]
+        assert keywords[1]["url"] == reports[1].url
+
+    def test_primary_cluster_rows_are_not_repeated(self, tmp_path):
+        # As with --clusters-file and no -k: the primary keywords are the first cluster's
+        content = WebContent("https://example.com/", SAMPLE_HTML, BeautifulSoup(SAMPLE_HTML, "lxml"))
+        clusters = process_clusters([("core", ["python seo", "tutorial"]), ("extra", ["guide"])])
+        report = build_report(content, process_keywords(["python seo", "tutorial"]), clusters)
+        with TableExporter(str(tmp_path)) as table:
+            table.add_report(report)
+
+        keywords = _read_csv(tmp_path / "keywords.csv")
+        assert [(k["cluster"], k["keyword"]) for k in keywords] == [
+            ("core", "python seo"), ("core", "tutorial"), ("extra", "guide")
+        ]
+
+    def test_parquet_matches_csv(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        reports = _reports()
+        for fmt in ("csv", "parquet"):
+            with TableExporter(str(tmp_path / fmt), fmt, chunk_rows=2) as table:
+                for report in reports:
+                    table.add_report(report)
+
+        pages = pq.read_table(tmp_path / "parquet" / "pages.parquet")
+        keywords = pq.read_table(tmp_path / "parquet" / "keywords.parquet")
+
+        assert pages.column_names == list(PAGE_COLUMNS)
+        assert keywords.column_names == list(KEYWORD_COLUMNS)
+        assert pq.ParquetFile(tmp_path / "parquet" / "pages.parquet").num_row_groups == 2
+        assert pages.column("overall_score").to_pylist() == [r.overall_score for r in reports]
+        assert pages.column("performance_score").null_count == 3
+        assert keywords.column("density").to_pylist() == [
+            float(k["density"]) for k in _read_csv(tmp_path / "csv" / "keywords.csv")
+        ]
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            TableExporter(str(tmp_path), "xlsx")
@@ -1,6 +1,6 @@
 import pytest
 
-from src.utils.validation import is_valid_url, validate_keywords
+from src.utils.validation import is_valid_url, validate_keywords, read_clusters_file
 
 
 class TestIsValidUrl:
@@ -44,3 +44,19 @@ class TestValidateKeywords:
     def test_only_commas_raises(self):
         with pytest.raises(ValueError):
             validate_keywords(" , , ")
+
+
+class TestReadClustersFile:
+    def test_named_and_unnamed_clusters(self, tmp_path):
+        path = tmp_path / "clusters.txt"
+        path.write_text("# comment\npricing: pm software cost, project pricing\n\nteam chat, collaboration\n")
+        assert read_clusters_file(str(path)) == [
+            ("pricing", ["pm software cost", "project pricing"]),
+            ("cluster 2", ["team chat", "collaboration"]),
+        ]
+
+    def test_duplicate_names_raise(self, tmp_path):
+        path = tmp_path / "clusters.txt"
+        path.write_text("a: one\na: two\n")
+        with pytest.raises(ValueError, match="Duplicate"):
+            read_clusters_file(str(path))
@@ -0,0 +1,100 @@
+import random
+from array import array
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.core import vector_scoring
+from src.core.features import KEYWORD_FEATURES, PAGE_FEATURES, rescore_scalar
+from src.core.scoring import (
+    calculate_density_score, calculate_keyword_score, calculate_overall_score, get_status
+)
+
+
+def _random_table(pages=500, seed=7):
+    rng = random.Random(seed)
+    page_columns = {name: array(code) for name, code in PAGE_FEATURES.items()}
+    keyword_columns = {name: array(code) for name, code in KEYWORD_FEATURES.items()}
+
+    for _ in range(pages):
+        count = rng.randint(0, 4)
+        checked = rng.choice([0, rng.randint(1, 15)])
+        row = {
+            "title_present": rng.randint(0, 1), "title_length": rng.randint(0, 90),
+            "meta_present": rng.randint(0, 1), "meta_length": rng.randint(0, 200),
+            "has_canonical": rng.randint(0, 1), "og_present": rng.randint(0, 1), "og_complete": rng.randint(0, 1),
+            "word_count": rng.randint(0, 900), "h1_count": rng.randint(0, 3),
+            "image_count": 10, "images_without_alt": rng.randint(0, 10),
+            "internal_links": rng.randint(0, 12), "external_links": rng.randint(0, 3),
+            "links_checked": checked, "links_broken": rng.randint(0, checked),
+            "links_redirected": rng.randint(0, checked),
+            # Thresholds land on exact boundaries too (800/1800 ms TTFB, 1500/4000 ms total)
+            "has_timing": rng.randint(0, 1), "ttfb_ms": rng.choice([800, 1800, rng.randint(0, 3000)]),
+            "total_ms": rng.choice([1500, 4000, rng.randint(0, 6000)]), "decoded_bytes": rng.randint(0, 4000),
+            "compressed": rng.randint(0, 1), "redirect_count": rng.randint(0, 3),
+            "overall_score": 0, "keyword_start": len(keyword_columns["density"]), "keyword_count": count,
+        }
+        for name, value in row.items():
+            page_columns[name].append(value)
+        for _ in range(count):
+            keyword = {
+                "in_title": rng.randint(0, 1), "in_meta": rng.randint(0, 1), "in_h1": rng.randint(0, 1),
+                "headings_matched": rng.randint(0, 6), "in_first_100_words": rng.randint(0, 1),
+                # Include values that land exactly on the density thresholds
+                "density": rng.choice([0.0, 1.0, 3.0, rng.uniform(0, 8)]), "distribution_score": 70,
+            }
+            for name, value in keyword.items():
+                keyword_columns[name].append(value)
+
+    return page_columns, keyword_columns
+
+
+class TestVectorScoring:
+    def test_keyword_scores_match_scalar(self):
+        rng = np.random.default_rng(1)
+        n = 5000
+        features = [rng.integers(0, 2, n), rng.integers(0, 2, n), rng.integers(0, 2, n),
+                    rng.integers(0, 7, n), rng.integers(0, 2, n)]
+        density = np.concatenate([rng.uniform(0, 10, n - 3), [1.0, 3.0, 0.0]])
+        density_scores = vector_scoring.calculate_density_scores(density)
+        distribution = rng.integers(0, 101, n)
+
+        vector = vector_scoring.calculate_keyword_scores(*features, density_scores, distribution)
+        scalar = [
+            calculate_keyword_score(
+                bool(features[0][i]), bool(features[1][i]), bool(features[2][i]), int(features[3][i]),
+                bool(features[4][i]), calculate_density_score(float(density[i])), int(distribution[i])
+            )
+            for i in range(n)
+        ]
+        assert vector.tolist() == scalar
+
+    def test_overall_scores_and_statuses_match_scalar(self):
+        rng = np.random.default_rng(2)
+        modules = [rng.integers(0, 101, 5000) for _ in range(5)]
+        performance = rng.integers(0, 101, 5000)
+        weights = {"keyword_analysis": 0.3, "technical_seo": 0.3, "content_analysis": 0.2,
+                   "structure": 0.1, "links": 0.1, "performance": 0.15}
+
+        for profile in (None, weights):
+            vector = vector_scoring.calculate_overall_scores(*modules, weights=profile)
+            scalar = [calculate_overall_score(*(int(m[i]) for m in modules), weights=profile) for i in range(5000)]
+            assert vector.tolist() == scalar
+
+            vector = vector_scoring.calculate_overall_scores(*modules, weights=profile, performance_score=performance)
+            scalar = [calculate_overall_score(*(int(m[i]) for m in modules), weights=profile,
+                                              performance_score=int(performance[i])) for i in range(5000)]
+            assert vector.tolist() == scalar
+
+        assert vector_scoring.get_statuses(modules[0]).tolist() == [get_status(int(s)) for s in modules[0]]
+
+    def test_rescore_matches_scalar_path(self):
+        pages, keywords = _random_table()
+        thresholds = {**vector_scoring.DEFAULT_THRESHOLDS, "min_word_count": 500, "internal_links_min": 3}
+
+        for profile in ({}, {"thresholds": thresholds}):
+            vector = vector_scoring.rescore_arrays(pages, keywords, **profile)
+            scalar = rescore_scalar(pages, keywords, **profile)
+            for name, values in scalar.items():
+                assert vector[name].tolist() == list(values), name
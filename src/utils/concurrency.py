@@ -0,0 +1,109 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable
+
+class TTLCache:
+    # Thread-safe LRU cache with per-entry expiry. Concurrent misses for the same key wait on a
+    # single computation instead of each doing the work.
+    def __init__(self, ttl: float, max_entries: int = 100000, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.stats = {'hits': 0, 'misses': 0}
+        self._data = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._lookup(key, default)
+    
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._store(key, value)
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        missing = object()
+        with self._lock:
+            value = self._lookup(key, missing)
+            if value is not missing:
+                return value
+            
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._pending[key] = future
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(e)
+            raise
+        
+        with self._lock:
+            self._store(key, value)
+            del self._pending[key]
+        future.set_result(value)
+        return value
+    
+    def _lookup(self, key, default):
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._data[key]
+            self.stats['misses'] += 1
+            return default
+        
+        self._data.move_to_end(key)
+        self.stats['hits'] += 1
+        return entry[1]
+    
+    def _store(self, key, value):
+        self._data[key] = (self.clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+class HostThrottle:
+    # Politeness limits per host: at most max_concurrent requests in flight and at least
+    # min_interval seconds between request starts
+    def __init__(self, max_concurrent: int = 2, min_interval: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self.clock = clock
+        self.sleep = sleep
+        self._semaphores = {}
+        self._next_start = {}
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def slot(self, host: str):
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.max_concurrent)
+        
+        semaphore.acquire()
+        try:
+            with self._lock:
+                now = self.clock()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.min_interval
+            if start > now:
+                self.sleep(start - now)
+            yield
+        finally:
+            semaphore.release()
@@ -0,0 +1,104 @@
+import os
+import sys
+import itertools
+import threading
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+def process_rss_bytes() -> Optional[int]:
+    # Current resident set size from /proc on Linux; elsewhere the peak from getrusage is the best available
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+class MemoryProfiler:
+    # tracemalloc over the whole run, plus the peak memory each timing span added on top of what was
+    # allocated when it started. tracemalloc keeps a single process-wide peak, so on every span entry
+    # and exit the peak so far is credited to all open spans before it is reset. Spans running at the
+    # same time on other threads share that credit; --workers 1 gives exact per-stage figures.
+    def __init__(self, frames: int = 1):
+        self.frames = frames
+        self.peak = 0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self._open: Dict[int, List[int]] = {}
+        self._stages: Dict[str, List[int]] = {}
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def start(self):
+        tracemalloc.start(self.frames)
+    
+    def stop(self):
+        with self._lock:
+            self._credit_peak()
+        # Drop tracemalloc's own bookkeeping from the allocator listing
+        self.snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        tracemalloc.stop()
+    
+    def _credit_peak(self) -> int:
+        current, peak = tracemalloc.get_traced_memory()
+        for frame in self._open.values():
+            if peak > frame[1]:
+                frame[1] = peak
+        if peak > self.peak:
+            self.peak = peak
+        tracemalloc.reset_peak()
+        return current
+    
+    def enter(self) -> int:
+        with self._lock:
+            current = self._credit_peak()
+            token = next(self._tokens)
+            # Traced bytes at entry, highest traced bytes seen while open
+            self._open[token] = [current, current]
+            return token
+    
+    def exit(self, name: str, token: int):
+        with self._lock:
+            current = self._credit_peak()
+            frame = self._open.pop(token, None)
+            if frame is None:
+                return
+            start, peak = frame
+            stage = self._stages.setdefault(name, [0, 0, 0])
+            stage[0] += 1
+            stage[1] = max(stage[1], peak - start)
+            stage[2] += current - start
+    
+    def stage_peaks(self) -> List[Tuple[str, int, int, int]]:
+        # (span name, calls, largest peak added by one call, bytes left allocated at exit summed over calls)
+        with self._lock:
+            stages = [(name, calls, peak, net) for name, (calls, peak, net) in self._stages.items()]
+        return sorted(stages, key=lambda stage: stage[2], reverse=True)
+    
+    def top_allocators(self, limit: int = 15) -> List[Tuple[str, int, int]]:
+        # (file:line, bytes, blocks) for the lines holding the most memory when profiling stopped
+        if self.snapshot is None:
+            return []
+        allocators = []
+        for stat in self.snapshot.statistics('lineno')[:limit]:
+            frame = stat.traceback[0]
+            allocators.append((f'{_short_path(frame.filename)}:{frame.lineno}', stat.size, stat.count))
+        return allocators
+
+def _short_path(filename: str) -> str:
+    # Relative to the longest sys.path entry containing it: src/core/fetcher.py, bs4/element.py, json/decoder.py
+    for root in sorted((os.path.abspath(entry) for entry in sys.path if entry), key=len, reverse=True):
+        if filename.startswith(root + os.sep):
+            return os.path.relpath(filename, root)
+    return filename
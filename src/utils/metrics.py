@@ -0,0 +1,155 @@
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# (sample name suffix, labels, value)
+Sample = Tuple[str, Dict[str, str], float]
+
+class MetricFamily:
+    def __init__(self, name: str, kind: str, help_text: str, samples: Optional[List[Sample]] = None):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.samples = samples if samples is not None else []
+    
+    def add(self, value: float, suffix: str = '', **labels):
+        self.samples.append((suffix, labels, value))
+        return self
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render_families(families: Iterable[MetricFamily]) -> str:
+    # Prometheus text exposition format, version 0.0.4
+    lines = []
+    for family in families:
+        lines.append(f'# HELP {family.name} {_escape(family.help_text)}')
+        lines.append(f'# TYPE {family.name} {family.kind}')
+        for suffix, labels, value in family.samples:
+            label_text = ','.join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+            name = family.name + suffix
+            lines.append(f'{name}{{{label_text}}} {_format_value(value)}' if label_text
+                         else f'{name} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+class LabeledHistogram:
+    # Fixed-bucket histograms keyed by one label, fed in milliseconds through add(name, elapsed_ms) so
+    # it can be handed straight to spans.collect_spans. Each observation is a bisect and three
+    # increments under a lock; the cumulative bucket counts are only built when scraped.
+    def __init__(self, name: str, help_text: str, label: str, buckets: Iterable[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[str, List] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, key: str, elapsed_ms: float):
+        self.observe(key, elapsed_ms / 1000)
+    
+    def observe(self, key: str, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Bucket counts (the last one is +Inf), sum
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+    
+    def family(self) -> MetricFamily:
+        with self._lock:
+            snapshot = [(key, list(counts), total) for key, (counts, total) in sorted(self._series.items())]
+        
+        family = MetricFamily(self.name, 'histogram', self.help_text)
+        for key, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                family.add(cumulative, '_bucket', **{self.label: key, 'le': _format_value(float(bound))})
+            family.add(cumulative, '_count', **{self.label: key})
+            family.add(total, '_sum', **{self.label: key})
+        return family
+
+class MetricsRegistry:
+    # Collectors are called at scrape time and return metric families, so the values they read
+    # (counters the workers already keep) cost nothing extra between scrapes
+    def __init__(self):
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+    
+    def register(self, collector: Callable[[], Iterable[MetricFamily]]):
+        self._collectors.append(collector)
+        return collector
+    
+    def collect(self) -> List[MetricFamily]:
+        return [family for collector in self._collectors for family in collector()]
+    
+    def render(self) -> str:
+        return render_families(self.collect())
+
+class MetricsServer:
+    # Serves GET /metrics from a daemon thread
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = '127.0.0.1'):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.address = f'http://{host}:{self._server.server_port}/metrics'
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics-server', daemon=True)
+        self._thread.start()
+    
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+class TextfileWriter:
+    # Rewrites a node_exporter textfile-collector file every `interval` seconds and once more on close.
+    # Each write goes to a temporary file that is renamed over the target, so the collector never
+    # reads a partial file.
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-textfile', daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+    
+    def write(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.registry.render())
+        os.replace(tmp_path, self.path)
+    
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.write()
@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from typing import List, Tuple
+
+class StackSampler:
+    # Samples every thread's Python stack at a fixed interval and counts identical stacks, which
+    # is the collapsed-stack format flamegraph.pl, speedscope and inferno read directly
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[';'.join(reversed(stack))] += 1
+    
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f'{stack} {count}\n')
+
+# From 3.12 cProfile is built on sys.monitoring, whose events fire on every thread, and only one
+# profiler may be active at a time
+PROCESS_WIDE_CPROFILE = sys.version_info >= (3, 12)
+
+class RunProfiler:
+    # Before 3.12 cProfile only sees the thread that enables it, so every thread started during the
+    # run gets its own profiler (through threading.setprofile) and the results are merged at the end.
+    # From 3.12 the main thread's profiler already covers the workers.
+    def __init__(self, sample_interval: float = 0.005):
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self.sampler = StackSampler(sample_interval)
+        self.started = 0.0
+        self.elapsed = 0.0
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def _profile_thread(self, *_):
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        profile.enable()
+    
+    def start(self):
+        self.started = time.perf_counter()
+        # The sampler starts first so it is not profiled itself
+        self.sampler.start()
+        if not PROCESS_WIDE_CPROFILE:
+            threading.setprofile(self._profile_thread)
+        main = cProfile.Profile()
+        self._profiles.append(main)
+        main.enable()
+    
+    def stop(self):
+        self._profiles[0].disable()
+        if not PROCESS_WIDE_CPROFILE:
+            threading.setprofile(None)
+        self.sampler.stop()
+        self.elapsed = time.perf_counter() - self.started
+    
+    def stats(self) -> pstats.Stats:
+        with self._lock:
+            profiles = list(self._profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            profile.create_stats()
+            if profile.stats:
+                stats.add(profile)
+        return stats
+    
+    def write(self, prefix: str) -> Tuple[str, str]:
+        # <prefix>.pstats for pstats/snakeviz, <prefix>.collapsed for flame graphs
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        pstats_path, collapsed_path = f'{prefix}.pstats', f'{prefix}.collapsed'
+        self.stats().dump_stats(pstats_path)
+        self.sampler.write(collapsed_path)
+        return pstats_path, collapsed_path
@@ -0,0 +1,126 @@
+import math
+import heapq
+from array import array
+from typing import Dict, Hashable, List, Optional, Tuple
+
+class ScoreHistogram:
+    # Exact distribution of integer scores in [0, max_value]. Scores only take max_value + 1
+    # values, so a fixed count per value is a constant-size, exactly mergeable quantile sketch.
+    def __init__(self, max_value: int = 100):
+        self.counts = array('Q', bytes(8 * (max_value + 1)))
+        self.count = 0
+        self.total = 0
+    
+    def add(self, value: int):
+        self.counts[min(max(value, 0), len(self.counts) - 1)] += 1
+        self.count += 1
+        self.total += value
+    
+    def merge(self, other: 'ScoreHistogram'):
+        for value, count in enumerate(other.counts):
+            self.counts[value] += count
+        self.count += other.count
+        self.total += other.total
+    
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+    
+    def quantile(self, q: float) -> Optional[int]:
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for value, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return value
+        return len(self.counts) - 1
+
+class LogHistogram:
+    # Relative-error quantile sketch for unbounded positive values such as timings: values are
+    # counted in logarithmic buckets, so any quantile is within relative_error of the true value
+    # and two sketches merge by adding bucket counts
+    def __init__(self, relative_error: float = 0.01):
+        self.relative_error = relative_error
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+    
+    def add(self, value: float):
+        self.count += 1
+        if value <= 1:
+            # Sub-millisecond timings are all reported as zero
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+    
+    def merge(self, other: 'LogHistogram'):
+        if other.gamma != self.gamma:
+            raise ValueError('Cannot merge sketches with different relative errors')
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+    
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = self.zeros
+        if seen >= rank:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+class HeavyHitters:
+    # Misra-Gries frequent items: at most `capacity` counters. Any item seen more than
+    # total / (capacity + 1) times is kept, and each kept count is low by at most that much.
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self.counters: Dict[Hashable, int] = {}
+        self.total = 0
+    
+    def add(self, item: Hashable, count: int = 1):
+        self.total += count
+        self.counters[item] = self.counters.get(item, 0) + count
+        if len(self.counters) > self.capacity:
+            smallest = min(self.counters.values())
+            self.counters = {key: c - smallest for key, c in self.counters.items() if c > smallest}
+    
+    def merge(self, other: 'HeavyHitters'):
+        for item, count in other.counters.items():
+            self.counters[item] = self.counters.get(item, 0) + count
+        self.total += other.total
+        if len(self.counters) > self.capacity:
+            # Subtracting the (capacity + 1)-th largest count keeps the merged error bound
+            cutoff = heapq.nlargest(self.capacity + 1, self.counters.values())[-1]
+            self.counters = {item: count - cutoff for item, count in self.counters.items() if count > cutoff}
+    
+    def top(self, n: int = 10) -> List[Tuple[Hashable, int]]:
+        return heapq.nlargest(n, self.counters.items(), key=lambda entry: entry[1])
+
+class BottomK:
+    # The k entries with the lowest key, kept in a bounded max-heap
+    def __init__(self, k: int = 10):
+        self.k = k
+        self._heap: List[Tuple] = []
+    
+    def add(self, key, item):
+        entry = (-key, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+    
+    def merge(self, other: 'BottomK'):
+        for neg_key, item in other._heap:
+            self.add(-neg_key, item)
+    
+    def items(self) -> List[Tuple]:
+        return sorted(((-neg_key, item) for neg_key, item in self._heap), key=lambda entry: entry[0])
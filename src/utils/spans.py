@@ -0,0 +1,101 @@
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+_local = threading.local()
+_sinks = ()
+_memory = None
+
+class SpanTotals:
+    # Count and total milliseconds per span name across a whole run, from every thread
+    def __init__(self):
+        self._totals: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, name: str, elapsed_ms: float):
+        with self._lock:
+            entry = self._totals.get(name)
+            if entry is None:
+                self._totals[name] = [1, elapsed_ms]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed_ms
+    
+    def items(self) -> List[Tuple[str, int, float]]:
+        with self._lock:
+            return sorted(((name, int(count), total) for name, (count, total) in self._totals.items()),
+                          key=lambda entry: entry[2], reverse=True)
+
+def current_spans() -> Optional[Dict[str, float]]:
+    return getattr(_local, 'spans', None)
+
+@contextmanager
+def record_spans(spans: Dict[str, float]):
+    # Spans closed on this thread add their milliseconds to `spans` (one dict per page)
+    previous = current_spans()
+    _local.spans = spans
+    try:
+        yield spans
+    finally:
+        _local.spans = previous
+
+@contextmanager
+def collect_spans(sink):
+    # Also hand every span from every thread to `sink` (anything with add(name, elapsed_ms), such as
+    # SpanTotals for --profile or the stage histograms behind the metrics endpoint)
+    global _sinks
+    previous = _sinks
+    _sinks = previous + (sink,)
+    try:
+        yield sink
+    finally:
+        _sinks = previous
+
+@contextmanager
+def track_span_memory(tracker):
+    # Report every span's entry and exit to `tracker` (memory.MemoryProfiler), for --memprofile
+    global _memory
+    previous = _memory
+    _memory = tracker
+    try:
+        yield tracker
+    finally:
+        _memory = previous
+
+class span:
+    # Times a block (`with span('parse'):`) or a function (`@span('export.json')`). Outside
+    # record_spans and collect_spans it only costs two perf_counter calls.
+    __slots__ = ('name', 'started', 'memory')
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.started = 0.0
+        self.memory = None
+    
+    def __enter__(self):
+        if _memory is not None:
+            self.memory = _memory.enter()
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        spans = getattr(_local, 'spans', None)
+        if spans is not None:
+            spans[self.name] = spans.get(self.name, 0.0) + elapsed_ms
+        for sink in _sinks:
+            sink.add(self.name, elapsed_ms)
+        if self.memory is not None and _memory is not None:
+            _memory.exit(self.name, self.memory)
+            self.memory = None
+    
+    def __call__(self, fn):
+        name = self.name
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
@@ -1,5 +1,5 @@
 import re
-from typing import List
+from typing import List, Optional
 import nltk
 from nltk.stem import PorterStemmer
 from nltk.corpus import stopwords
@@ -40,24 +40,25 @@ def stem_word(word: str) -> str:
 def stem_words(words: List[str]) -> List[str]:
     return [stem_word(w) for w in words]
 
-def calculate_density(keyword: str, text: str) -> float:
-    text_lower = text.lower()
+def count_keyword(keyword: str, text_lower: str) -> int:
     keyword_lower = keyword.lower()
+    keyword_words = tokenize(keyword_lower)
     
-    words = tokenize(text)
-    total_words = len(words)
+    if len(keyword_words) == 1:
+        return text_lower.count(keyword_lower)
+    
+    keyword_pattern = r'\b' + r'\s+'.join(keyword_words) + r'\b'
+    return len(re.findall(keyword_pattern, text_lower))
+
+def calculate_density(keyword: str, text: str, total_words: Optional[int] = None, text_lower: Optional[str] = None) -> float:
+    # Callers scoring many keywords against one text can pass the word count and lowercased text
+    if total_words is None:
+        total_words = len(tokenize(text))
     
     if total_words == 0:
         return 0.0
     
-    keyword_words = tokenize(keyword_lower)
-    keyword_count = 0
-    
-    if len(keyword_words) == 1:
-        keyword_count = text_lower.count(keyword_lower)
-    else:
-        keyword_pattern = r'\b' + r'\s+'.join(keyword_words) + r'\b'
-        keyword_count = len(re.findall(keyword_pattern, text_lower))
+    keyword_count = count_keyword(keyword, text_lower if text_lower is not None else text.lower())
     
     return (keyword_count / total_words) * 100
 
@@ -0,0 +1,47 @@
+from typing import Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+WEB_SCHEMES = ('http', 'https')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def site_host(url: str) -> str:
+    host = (urlsplit(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+def clean_url(url: str) -> str:
+    # Lower-cased scheme and host, no default port or fragment; still the address to request
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f'{host}:{parts.port}'
+    
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+def normalize_url(url: str) -> str:
+    # The page's identity: clean_url with www. dropped from the host, as site_host does. Not always
+    # fetchable, since a site may not answer on both hosts.
+    url = clean_url(url)
+    parts = urlsplit(url)
+    if parts.netloc.startswith('www.'):
+        url = urlunsplit(parts._replace(netloc=parts.netloc[4:]))
+    return url
+
+def resolve_url(base_url: str, href: str) -> Optional[str]:
+    # Absolute, cleaned http(s) URL for a link, or None for mailto:, tel:, javascript: and the like
+    href = href.strip()
+    if not href:
+        return None
+    
+    try:
+        resolved = urljoin(base_url, href)
+        if urlsplit(resolved).scheme.lower() not in WEB_SCHEMES:
+            return None
+        return clean_url(resolved)
+    except ValueError:
+        return None
+
+def is_same_site(url: str, other: str) -> bool:
+    return site_host(url) == site_host(other)
@@ -18,3 +18,42 @@ def validate_keywords(keywords: str) -> list:
         raise ValueError("No valid keywords provided")
     
     return keyword_list
+
+def read_urls_file(path: str) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        urls = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+    
+    invalid = [url for url in urls if not is_valid_url(url)]
+    if invalid:
+        raise ValueError(f"Invalid URL(s) in {path}: {', '.join(invalid[:5])}")
+    
+    if not urls:
+        raise ValueError(f"No URLs found in {path}")
+    
+    return list(dict.fromkeys(urls))
+
+def read_clusters_file(path: str) -> list:
+    # One cluster per line: "name: keyword one, keyword two". Unnamed lines are numbered.
+    clusters = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            name, _, keywords = line.partition(':') if ':' in line else ('', '', line)
+            name = name.strip() or f'cluster {len(clusters) + 1}'
+            try:
+                clusters.append((name, validate_keywords(keywords)))
+            except ValueError:
+                raise ValueError(f"Cluster '{name}' in {path} has no keywords")
+    
+    if not clusters:
+        raise ValueError(f"No keyword clusters found in {path}")
+    
+    names = [name for name, _ in clusters]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate cluster name(s) in {path}: {', '.join(duplicates)}")
+    
+    return clusters